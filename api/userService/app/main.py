@@ -1,20 +1,86 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from core.config import settings
-from core.database import engine
+from core.database import Base, engine
+from core.sharding import shard_router
 from infrastructure.db.models import UserModel, OTPVerificationModel
+from infrastructure.db.user_search import install_user_search_index
+from infrastructure.db.stats_summary import ensure_stats_summary
+from infrastructure.db.change_feed import ensure_change_feed
 from interfaces.api.routes import router
+from interfaces.middleware.concurrency_limiter import (
+    AdaptiveConcurrencyMiddleware, limiter as concurrency_limiter
+)
+from interfaces.middleware.metrics import MetricsMiddleware
+from interfaces.middleware.query_stats import QueryStatsMiddleware
+from interfaces.middleware.profiling import ProfilingMiddleware
+from interfaces.middleware.idempotency import IdempotencyMiddleware, store as idempotency_store
+from interfaces.middleware.session_scope import SessionScopeMiddleware
+from interfaces.middleware.loop_watchdog import LoopWatchdogMiddleware
+from infrastructure.monitoring.service_metrics import instrument_engine
+from infrastructure.monitoring.query_stats import instrument_queries
+from infrastructure.monitoring.readiness import readiness
+from infrastructure.monitoring.loop_watchdog import loop_watchdog
+from infrastructure.cache.invalidation import invalidation_bus
+from infrastructure.services.password_service import PasswordService
+from infrastructure.services.audit_service import audit_log
+from infrastructure.services.webhook_dispatcher import webhook_dispatcher
+
+logger = logging.getLogger(__name__)
 
 # Create database tables
 UserModel.metadata.create_all(bind=engine)
 OTPVerificationModel.metadata.create_all(bind=engine)
+install_user_search_index(engine)
+ensure_stats_summary(engine)
+ensure_change_feed(engine)
+
+# User shards get the full schema; the catalog tables on them are replicas of the primary's
+if shard_router is not None:
+    from infrastructure.db.sharded_repositories import sync_catalog
+
+    shard_router.create_all(Base.metadata)
+    for shard_engine in shard_router.engines:
+        install_user_search_index(shard_engine)
+        ensure_stats_summary(shard_engine)
+        ensure_change_feed(shard_engine)
+    sync_catalog(shard_router)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up before /ready reports ready: open a pooled connection and start a hashing thread
+    try:
+        await asyncio.to_thread(readiness.db_status, False)
+        await PasswordService.hash_password_async("warm-up")
+    except Exception:
+        logger.exception("Warm-up failed")
+    invalidation_bus.start()
+    audit_log.start()
+    webhook_dispatcher.start()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    readiness.mark_warmed_up()
+    try:
+        yield
+    finally:
+        await loop_watchdog.stop()
+        await webhook_dispatcher.stop()
+        await audit_log.stop()
+        invalidation_bus.stop()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     description="User management service with phone number authentication and mandatory MFA",
     version=settings.APP_VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -26,6 +92,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request-scoped database sessions for the shared repositories - innermost, next to the routes
+app.add_middleware(SessionScopeMiddleware)
+
+# On-demand profiling - idle unless a profile token or sample rate is configured
+if settings.PROFILING_TOKEN or settings.PROFILING_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.PROFILING_TOKEN,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS,
+        output_dir=settings.PROFILING_OUTPUT_DIR
+    )
+
+# Idempotency-Key replay - inside the measuring middleware so replays skip the endpoint but are still measured
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware, store=idempotency_store, paths=settings.IDEMPOTENT_PATHS)
+
+# SQL statement accounting, slow-query log and N+1 detection - on the shards too, where user queries run
+for query_engine in (engine, *(shard_router.engines if shard_router is not None else ())):
+    instrument_queries(
+        query_engine,
+        slow_query_ms=settings.SQL_SLOW_QUERY_MS,
+        detect_n_plus_one=settings.SQL_N_PLUS_ONE_DETECTION,
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD
+    )
+app.add_middleware(QueryStatsMiddleware, debug_headers=settings.SQL_DEBUG_HEADERS)
+
+# Event-loop stall attribution - outside the per-request middlewares so their blocking is reported too
+if settings.LOOP_WATCHDOG_ENABLED:
+    app.add_middleware(LoopWatchdogMiddleware, watchdog=loop_watchdog)
+
+# Request metrics - wraps the application so shed requests are not timed as served
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+
+# Load shedding - added last so it runs first and rejects before any other work
+if settings.CONCURRENCY_LIMIT_ENABLED:
+    app.add_middleware(
+        AdaptiveConcurrencyMiddleware,
+        limiter=concurrency_limiter,
+        exempt_paths=settings.CONCURRENCY_EXEMPT_PATHS,
+        retry_after=settings.CONCURRENCY_RETRY_AFTER_SECONDS,
+    )
+
 # Include routes
 app.include_router(router)
 
@@ -0,0 +1,91 @@
+from typing import List, Optional, Sequence
+
+from domain.models.user_projections import AuthPrincipal, UserProfile
+from domain.repositories.user_repository import UserRepository
+from infrastructure.cache.token_cache import Claims, TokenCache
+from infrastructure.services.auth_service import AuthService
+
+INACTIVE = {"active": False}
+
+
+class IntrospectTokensUseCase:
+    """Batched token checks for internal callers, answered from the token cache where possible"""
+
+    def __init__(self, user_repo: UserRepository, token_cache: TokenCache):
+        self.user_repo = user_repo
+        self.token_cache = token_cache
+
+    async def execute(self, tokens: Sequence[str]) -> List[dict]:
+        claims = [self._claims(token) for token in tokens]
+        phone_numbers = {entry[0] for entry in claims if entry is not None}
+        principals, missing = self.token_cache.get_principals(phone_numbers)
+        if missing:
+            # One query for every number the cache could not answer
+            generation = self.token_cache.generation
+            loaded = await self.user_repo.get_auth_principals(phone_numbers=missing)
+            principals.update((principal.phone_number, principal) for principal in loaded)
+            unknown = [phone_number for phone_number in missing if phone_number not in principals]
+            self.token_cache.put_principals(generation, loaded, unknown)
+
+        results = []
+        for entry in claims:
+            principal = principals.get(entry[0]) if entry is not None else None
+            if principal is None or not principal.is_active:
+                results.append(INACTIVE)
+                continue
+            results.append({
+                "active": True,
+                "user_id": principal.id,
+                "phone_number": principal.phone_number,
+                "roles": [list(role) for role in principal.roles],
+                "exp": entry[1]
+            })
+        return results
+
+    def _claims(self, token: str) -> Optional[Claims]:
+        claims = self.token_cache.get_claims(token)
+        if claims is not None:
+            return claims
+        try:
+            payload = AuthService.verify_token(token)
+        except ValueError:
+            return None
+        phone_number, expires = payload.get("sub"), payload.get("exp")
+        if not phone_number or expires is None:
+            return None
+        claims = (phone_number, int(expires))
+        self.token_cache.put_claims(token, claims)
+        return claims
+
+
+class LookupUsersUseCase:
+    """Profiles and active roles of a batch of users, by id, in request order (None for unknown ids)"""
+
+    def __init__(self, user_repo: UserRepository, token_cache: TokenCache):
+        self.user_repo = user_repo
+        self.token_cache = token_cache
+
+    async def execute(self, user_ids: Sequence[int]) -> List[Optional[dict]]:
+        profiles = {profile.id: profile for profile in await self.user_repo.get_profiles(list(dict.fromkeys(user_ids)))}
+        principals, missing = self.token_cache.get_principals_by_id(list(profiles))
+        if missing:
+            generation = self.token_cache.generation
+            loaded = await self.user_repo.get_auth_principals(user_ids=missing)
+            principals.update((principal.id, principal) for principal in loaded)
+            self.token_cache.put_principals(generation, loaded)
+        return [self._user(profiles.get(user_id), principals.get(user_id)) for user_id in user_ids]
+
+    @staticmethod
+    def _user(profile: Optional[UserProfile], principal: Optional[AuthPrincipal]) -> Optional[dict]:
+        if profile is None:
+            return None
+        return {
+            "id": profile.id,
+            "phone_number": profile.phone_number,
+            "full_name": profile.full_name,
+            "email": profile.email,
+            "is_active": profile.is_active,
+            "is_verified": profile.is_verified,
+            "mfa_enabled": profile.mfa_enabled,
+            "roles": [list(role) for role in principal.roles] if principal is not None else []
+        }
\ No newline at end of file
@@ -1,13 +1,16 @@
-from typing import List
+from typing import List, Optional
 
 from domain.models.user import MFASetup
+from domain.models.audit_event import MFA_SETUP, MFA_ENABLE
 from domain.repositories.user_repository import UserRepository
 from infrastructure.services.auth_service import MFAService
+from infrastructure.services.audit_service import AuditLog
 
 
 class SetupMFAUseCase:
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, audit_log: Optional[AuditLog] = None):
         self.user_repo = user_repo
+        self.audit_log = audit_log
 
     async def execute(self, user_id: int) -> MFASetup:
         user = await self.user_repo.get_by_id(user_id)
@@ -24,13 +27,16 @@ class SetupMFAUseCase:
         # Store secret temporarily (not enabled yet)
         user.mfa_secret = secret
         await self.user_repo.update(user)
+        if self.audit_log:
+            self.audit_log.record(MFA_SETUP, actor_user_id=user_id, subject_user_id=user_id)
 
         return MFASetup(secret=secret, qr_code=qr_code)
 
 
 class EnableMFAUseCase:
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, audit_log: Optional[AuditLog] = None):
         self.user_repo = user_repo
+        self.audit_log = audit_log
 
     async def execute(self, user_id: int, totp_code: str) -> List[str]:
         user = await self.user_repo.get_by_id(user_id)
@@ -39,6 +45,9 @@ class EnableMFAUseCase:
 
         # Verify the TOTP code
         if not MFAService.verify_totp(user.mfa_secret, totp_code):
+            if self.audit_log:
+                self.audit_log.record(MFA_ENABLE, "failure", actor_user_id=user_id, subject_user_id=user_id,
+                                      reason="Invalid TOTP code")
             raise ValueError("Invalid TOTP code")
 
         # Generate backup codes
@@ -48,5 +57,7 @@ class EnableMFAUseCase:
         user.mfa_enabled = True
         user.backup_codes = backup_codes
         await self.user_repo.update(user)
+        if self.audit_log:
+            self.audit_log.record(MFA_ENABLE, actor_user_id=user_id, subject_user_id=user_id)
 
         return backup_codes
\ No newline at end of file
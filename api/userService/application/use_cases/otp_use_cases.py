@@ -1,16 +1,31 @@
 from datetime import datetime, timedelta
+from typing import Optional
 
 from domain.models.user import OTPVerification
+from domain.models.audit_event import OTP_REQUEST
 from domain.repositories.user_repository import UserRepository, OTPRepository
 from infrastructure.services.auth_service import OTPService, PhoneService
+from infrastructure.services.audit_service import AuditLog
 
 
 class RequestOTPUseCase:
-    def __init__(self, user_repo: UserRepository, otp_repo: OTPRepository):
+    def __init__(self, user_repo: UserRepository, otp_repo: OTPRepository, audit_log: Optional[AuditLog] = None):
         self.user_repo = user_repo
         self.otp_repo = otp_repo
+        self.audit_log = audit_log
 
     async def execute(self, phone_number: str, purpose: str) -> str:
+        try:
+            otp_code = await self._request(phone_number, purpose)
+        except ValueError as e:
+            if self.audit_log:
+                self.audit_log.record(OTP_REQUEST, "failure", phone_number=phone_number, purpose=purpose, reason=str(e))
+            raise
+        if self.audit_log:
+            self.audit_log.record(OTP_REQUEST, phone_number=phone_number, purpose=purpose)
+        return otp_code
+
+    async def _request(self, phone_number: str, purpose: str) -> str:
         # Validate purpose
         if purpose not in ["registration", "login", "password_reset"]:
             raise ValueError("Invalid OTP purpose")
@@ -18,7 +18,7 @@ class ResetPasswordUseCase:
         if not user:
             raise ValueError("User not found")
 
-        user.hashed_password = AuthService.hash_password(new_password)
+        user.hashed_password = await AuthService.hash_password_async(new_password)
         await self.user_repo.update(user)
 
         return True
\ No newline at end of file
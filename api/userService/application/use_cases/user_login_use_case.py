@@ -1,29 +1,46 @@
 from datetime import datetime
 from typing import Optional
 
-from domain.models.user import User
+from domain.models.audit_event import LOGIN
 from domain.repositories.user_repository import UserRepository
 from infrastructure.services.auth_service import AuthService, MFAService
+from infrastructure.services.password_rehash_service import PasswordRehashService
+from infrastructure.services.audit_service import AuditLog
+from infrastructure.monitoring.service_metrics import PASSWORD_HASH_CHECKS_CURRENT, PASSWORD_HASH_CHECKS_OUTDATED
 from core.config import settings
 
 
 class UserLoginUseCase:
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, password_rehasher: Optional[PasswordRehashService] = None,
+                 audit_log: Optional[AuditLog] = None):
         self.user_repo = user_repo
+        self.password_rehasher = password_rehasher
+        self.audit_log = audit_log
 
     async def execute(self, phone_number: str, password: str, mfa_code: Optional[str] = None) -> dict:
-        # Get user
-        user = await self.user_repo.get_by_phone_number(phone_number)
-        if not user or not AuthService.verify_password(password, user.hashed_password):
+        try:
+            result = await self._login(phone_number, password, mfa_code)
+        except ValueError as e:
+            if self.audit_log:
+                self.audit_log.record(LOGIN, "failure", phone_number=phone_number, reason=str(e))
+            raise
+        if self.audit_log:
+            self.audit_log.record(LOGIN, actor_user_id=result["user"].id, subject_user_id=result["user"].id)
+        return result
+
+    async def _login(self, phone_number: str, password: str, mfa_code: Optional[str]) -> dict:
+        # Only the credential columns; the profile is read back when last_login is stamped
+        credentials = await self.user_repo.get_credentials(phone_number)
+        if not credentials or not await AuthService.verify_password_async(password, credentials.hashed_password):
             raise ValueError("Invalid phone number or password")
 
-        if not user.is_active:
+        if not credentials.is_active:
             raise ValueError("User account is deactivated")
 
         # MFA bypass check - if enabled, skip all MFA validation
         if not settings.MFA_BYPASS:
             # Mandatory MFA check (original code preserved)
-            if not user.mfa_enabled:
+            if not credentials.mfa_enabled:
                 raise ValueError("MFA must be enabled. Please setup MFA first.")
 
             if not mfa_code:
@@ -31,23 +48,28 @@ class UserLoginUseCase:
 
             # Verify MFA
             is_valid_mfa = False
-            if user.mfa_secret:
-                is_valid_mfa = MFAService.verify_totp(user.mfa_secret, mfa_code)
+            if credentials.mfa_secret:
+                is_valid_mfa = MFAService.verify_totp(credentials.mfa_secret, mfa_code)
 
             # Check backup codes if TOTP fails
-            if not is_valid_mfa and user.backup_codes:
-                if mfa_code.upper() in user.backup_codes:
-                    # Remove used backup code
-                    user.backup_codes.remove(mfa_code.upper())
-                    await self.user_repo.update(user)
-                    is_valid_mfa = True
+            if not is_valid_mfa and mfa_code.upper() in credentials.backup_codes:
+                is_valid_mfa = await self._consume_backup_code(credentials.id, mfa_code.upper())
 
             if not is_valid_mfa:
                 raise ValueError("Invalid MFA code")
 
         # Update last login
-        user.last_login = datetime.utcnow()
-        await self.user_repo.update(user)
+        user = await self.user_repo.record_login(credentials.id, datetime.utcnow())
+        if user is None:
+            raise ValueError("Invalid phone number or password")
+
+        # Upgrade hashes created under an older scheme or cost now that we hold the plain password
+        if AuthService.password_needs_update(credentials.hashed_password):
+            PASSWORD_HASH_CHECKS_OUTDATED.inc()
+            if self.password_rehasher:
+                self.password_rehasher.schedule(user.id, password, credentials.hashed_password)
+        else:
+            PASSWORD_HASH_CHECKS_CURRENT.inc()
 
         # Create access token - Use default role for now
         # TODO: Implement proper role management based on user service roles
@@ -59,4 +81,14 @@ class UserLoginUseCase:
             "access_token": access_token,
             "token_type": "bearer",
             "user": user
-        }
\ No newline at end of file
+        }
+
+    async def _consume_backup_code(self, user_id: int, code: str) -> bool:
+        # Rare path: load the full user to remove the used backup code
+        user = await self.user_repo.get_by_id(user_id)
+        if not user or not user.backup_codes or code not in user.backup_codes:
+            # Used up by a concurrent login since the credentials were read
+            return False
+        user.backup_codes.remove(code)
+        await self.user_repo.update(user)
+        return True
\ No newline at end of file
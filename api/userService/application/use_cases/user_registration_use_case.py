@@ -4,7 +4,6 @@ from typing import Optional
 from domain.models.user import User
 from domain.repositories.user_repository import UserRepository, OTPRepository
 from domain.repositories.user_service_role_repository import UserServiceRoleRepository
-from domain.models.user_service_role import UserServiceRole
 from infrastructure.services.auth_service import AuthService
 
 
@@ -26,18 +25,9 @@ class UserRegistrationUseCase:
         except Exception:
             raise ValueError("Invalid phone number format")
 
-        # Check if user already exists
-        existing_user = await self.user_repo.get_by_phone_number(formatted_phone)
-        if existing_user:
-            raise ValueError("User with this phone number already exists")
-
-        if email:
-            existing_email = await self.user_repo.get_by_email(email)
-            if existing_email:
-                raise ValueError("User with this email already exists")
-
-        # Create user first
-        hashed_password = AuthService.hash_password(password)
+        # Duplicate phone numbers and emails are rejected by the unique constraints inside the
+        # insert transaction, so there are no existence lookups up front
+        hashed_password = await AuthService.hash_password_async(password)
         user = User(
             id=None,
             phone_number=formatted_phone,
@@ -46,29 +36,9 @@ class UserRegistrationUseCase:
             hashed_password=hashed_password
         )
 
-        created_user = await self.user_repo.create(user)
-        
         # Assign role if provided (default to role_id=2 which is "user" role)
         if role_id is None:
             role_id = 2  # Default "user" role
 
-        # Create UserServiceRole for the specified service (handles unique constraint)
-        try:
-            user_service_role = UserServiceRole(
-                id=None,
-                user_id=created_user.id,
-                service_id=service_id,  # Default to userService (id=1)
-                role_id=role_id,
-                is_active=True
-            )
-            await self.user_service_role_repo.create(user_service_role)
-        except Exception as e:
-            # If there's a unique constraint violation, it means user already has a role in this service
-            # This shouldn't happen in registration, but we handle it gracefully
-            if "uq_user_service" in str(e):
-                raise ValueError(f"User already has a role assigned in service {service_id}")
-            raise e
-
-        # Get user with populated roles
-        db_user_with_roles = await self.user_repo.get_by_id_with_roles(created_user.id)
-        return self.user_repo.db_user_to_response_dict(db_user_with_roles)
\ No newline at end of file
+        # User and UserServiceRole are inserted together and the response is built from the returned rows
+        return await self.user_repo.create_with_service_role(user, service_id=service_id, role_id=role_id)
\ No newline at end of file
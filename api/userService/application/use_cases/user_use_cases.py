@@ -4,6 +4,7 @@ from .user_login_use_case import UserLoginUseCase
 from .mfa_use_cases import SetupMFAUseCase, EnableMFAUseCase
 from .otp_use_cases import RequestOTPUseCase, VerifyOTPUseCase
 from .password_reset_use_case import ResetPasswordUseCase
+from .introspection_use_cases import IntrospectTokensUseCase, LookupUsersUseCase
 
 __all__ = [
     'UserRegistrationUseCase',
@@ -12,5 +13,7 @@ __all__ = [
     'EnableMFAUseCase',
     'RequestOTPUseCase',
     'VerifyOTPUseCase',
-    'ResetPasswordUseCase'
+    'ResetPasswordUseCase',
+    'IntrospectTokensUseCase',
+    'LookupUsersUseCase'
 ]
\ No newline at end of file
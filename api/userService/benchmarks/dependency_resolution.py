@@ -0,0 +1,148 @@
+"""
+Per-request dependency resolution overhead on /users/me and /auth/login.
+
+Drives the real ``app.main:app`` in-process, one request at a time, and times
+FastAPI's ``solve_dependencies`` - the part of each request spent building and
+resolving the endpoint's ``Depends`` graph - next to the whole request. It also
+reports the shape of each route's graph: how many dependency calls it makes and
+how many of them are sync functions FastAPI dispatches to its threadpool.
+Resolution time includes the bearer token lookup on /users/me, which is a
+database query in any version. Run it on two revisions to compare:
+
+    python -m benchmarks.dependency_resolution --requests 500 --output after.json
+    git stash && python -m benchmarks.dependency_resolution --output before.json; git stash pop
+"""
+import argparse
+import asyncio
+import contextlib
+import inspect
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROUTES = ("users_me", "login")
+
+
+def graph_shape(dependant) -> dict:
+    """Dependency calls per request (FastAPI resolves each distinct callable once) and sync ones among them"""
+    seen = {}
+
+    def walk(node):
+        for sub in node.dependencies:
+            if sub.call is not None and sub.call not in seen:
+                seen[sub.call] = not (inspect.iscoroutinefunction(sub.call)
+                                      or inspect.isasyncgenfunction(sub.call)
+                                      or inspect.iscoroutinefunction(getattr(sub.call, "__call__", None)))
+            walk(sub)
+
+    walk(dependant)
+    return {
+        "dependency_calls": len(seen),
+        "threadpool_calls": sum(seen.values()),
+        "dependencies": sorted(getattr(call, "__name__", type(call).__name__) for call in seen)
+    }
+
+
+def summarize(samples) -> dict:
+    samples = sorted(samples)
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 1),
+        "mean_us": round(statistics.fmean(samples) * 1e6, 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1] * 1e6, 1),
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+    import fastapi.routing
+    from fastapi.dependencies.utils import get_dependant
+    from app.main import app
+    from interfaces.api import auth_routes, user_routes
+    from benchmarks.load_test import seed_database, _seed_phone, SEED_PASSWORD
+
+    seed_database(1)
+    phone = _seed_phone(0)
+
+    # Time every call FastAPI makes to resolve an endpoint's dependencies
+    solve_times = []
+    original_solve = fastapi.routing.solve_dependencies
+
+    async def timed_solve(*a, **kw):
+        start = time.perf_counter()
+        try:
+            return await original_solve(*a, **kw)
+        finally:
+            solve_times.append(time.perf_counter() - start)
+
+    fastapi.routing.solve_dependencies = timed_solve
+
+    results = {}
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                login_body = {"phone_number": phone, "password": SEED_PASSWORD}
+                token = (await client.post("/auth/login", json=login_body)).json()["access_token"]
+                requests = {
+                    "users_me": (("/users/me", user_routes.get_current_user_info),
+                                 lambda: client.get("/users/me", headers={"Authorization": f"Bearer {token}"})),
+                    "login": (("/auth/login", auth_routes.login), lambda: client.post("/auth/login", json=login_body)),
+                }
+                for name in args.routes:
+                    (path, endpoint), send = requests[name]
+                    for _ in range(args.warmup):
+                        (await send()).raise_for_status()
+                    solve_times.clear()
+                    totals = []
+                    for _ in range(args.requests):
+                        start = time.perf_counter()
+                        (await send()).raise_for_status()
+                        totals.append(time.perf_counter() - start)
+                    results[name] = {
+                        "graph": graph_shape(get_dependant(path=path, call=endpoint)),
+                        "solve_dependencies": summarize(solve_times),
+                        "request": summarize(totals),
+                    }
+    finally:
+        fastapi.routing.solve_dependencies = original_solve
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="Database to seed and test against (default: a temporary SQLite file)")
+    parser.add_argument("--requests", type=int, default=300, help="Timed requests per route")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per route")
+    parser.add_argument("--routes", nargs="+", choices=ROUTES, default=list(ROUTES))
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so configure the environment before importing the app
+    if not args.database_url:
+        args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='userservice-bench-'), 'bench.db')}"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("MFA_BYPASS", "True")
+    os.environ["CONCURRENCY_LIMIT_ENABLED"] = "False"
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    # Keep the development SMS prints out of the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        results = asyncio.run(run(args))
+
+    report = json.dumps({
+        "config": {"database": args.database_url.split("@")[-1], "requests": args.requests},
+        "routes": results
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
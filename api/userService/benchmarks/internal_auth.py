@@ -0,0 +1,117 @@
+"""
+Token checks per second: public /users/me against batched /internal/introspect.
+
+Drives the real ``app.main:app`` in-process, one request at a time, with tokens
+for ``--users`` seeded users. The public path checks one token per request
+through the bearer dependency and the full response model; the internal path
+checks ``--batch`` tokens per request from the token cache. Checks per second
+are measured on a single event loop, i.e. per worker:
+
+    python -m benchmarks.internal_auth --users 200 --batch 100 --output report.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+SERVICE_KEY = "benchmark-service-key"
+ENCODINGS = ("json", "msgpack")
+
+
+async def run(args) -> dict:
+    import httpx
+    from app.main import app
+    from benchmarks.load_test import seed_database, _seed_phone
+    from infrastructure.services.auth_service import AuthService
+    from interfaces.internal_encoding import msgpack
+
+    seed_database(args.users)
+    tokens = [AuthService.create_access_token({"sub": _seed_phone(n)}) for n in range(args.users)]
+    batches = [tokens[i:i + args.batch] for i in range(0, len(tokens), args.batch)]
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            async def users_me(token):
+                (await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})).raise_for_status()
+                return 1
+
+            async def introspect(batch, encoding):
+                headers = {"X-Service-Key": SERVICE_KEY}
+                if encoding == "msgpack":
+                    headers.update({"Content-Type": "application/msgpack", "Accept": "application/msgpack"})
+                    response = await client.post("/internal/introspect", content=msgpack.packb({"tokens": batch}),
+                                                 headers=headers)
+                else:
+                    response = await client.post("/internal/introspect", json={"tokens": batch}, headers=headers)
+                response.raise_for_status()
+                return len(batch)
+
+            async def measure(name, send, items):
+                for item in items[:args.warmup]:
+                    await send(item)
+                checks = requests = 0
+                start = time.perf_counter()
+                for _ in range(args.rounds):
+                    for item in items:
+                        checks += await send(item)
+                        requests += 1
+                elapsed = time.perf_counter() - start
+                results[name] = {
+                    "checks": checks,
+                    "requests": requests,
+                    "checks_per_second": round(checks / elapsed),
+                    "mean_request_ms": round(elapsed / requests * 1000, 3),
+                }
+
+            await measure("public_users_me", users_me, tokens)
+            for encoding in args.encodings:
+                if encoding == "msgpack" and msgpack is None:
+                    results["internal_introspect_msgpack"] = {"skipped": "msgpack is not installed"}
+                    continue
+                await measure(f"internal_introspect_{encoding}", lambda batch: introspect(batch, encoding), batches)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="Database to seed and test against (default: a temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=200, help="Seeded users, one token each")
+    parser.add_argument("--batch", type=int, default=100, help="Tokens per introspection request")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed passes over all tokens per path")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed requests per path")
+    parser.add_argument("--encodings", nargs="+", choices=ENCODINGS, default=list(ENCODINGS))
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so configure the environment before importing the app
+    if not args.database_url:
+        args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='userservice-bench-'), 'bench.db')}"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["INTERNAL_SERVICE_KEYS"] = SERVICE_KEY
+    os.environ["CONCURRENCY_LIMIT_ENABLED"] = "False"
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    # Keep the development SMS prints out of the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        results = asyncio.run(run(args))
+
+    report = json.dumps({
+        "config": {"database": args.database_url.split("@")[-1], "users": args.users, "batch": args.batch},
+        "paths": results
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
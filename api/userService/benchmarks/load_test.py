@@ -0,0 +1,255 @@
+"""
+In-process load test for the main API flows.
+
+Drives the real ``app.main:app`` through httpx's ASGI transport against a
+freshly seeded database and reports throughput and latency percentiles per
+scenario as JSON, so runs from different branches can be compared.
+
+    python -m benchmarks.load_test --concurrency 10 --requests 200
+    python -m benchmarks.load_test --database-url postgresql://... --output before.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+SCENARIOS = ("register", "otp", "login", "users_me", "mfa_setup", "admin_list_users")
+
+ADMIN_PHONE = "+14151000000"
+SEED_PASSWORD = "bench-password"
+
+
+def _seed_phone(n: int) -> str:
+    return f"+1415{2000000 + n:07d}"
+
+
+def _register_phone(n: int) -> str:
+    return f"+1415{3000000 + n:07d}"
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, errors: int, wall_time: float) -> dict:
+    latencies = sorted(latencies)
+    completed = len(latencies)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "wall_time_s": round(wall_time, 4),
+        "throughput_rps": round(completed / wall_time, 2) if wall_time > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / completed * 1000, 3) if completed else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if completed else 0.0
+        }
+    }
+
+
+def seed_database(seed_users: int) -> None:
+    """Insert catalog rows, an admin and a pool of regular users directly"""
+    from core.database import SessionLocal
+    from infrastructure.db.models import ServiceModel, UserRoleModel, UserModel, UserServiceRoleModel
+    from infrastructure.services.password_service import PasswordService
+
+    db = SessionLocal()
+    try:
+        if not db.query(ServiceModel).filter(ServiceModel.id == 1).first():
+            db.add_all([
+                ServiceModel(id=1, name="userService", description="User management"),
+                ServiceModel(id=2, name="tradeService", description="Trading"),
+                UserRoleModel(id=1, name="admin", description="Administrator"),
+                UserRoleModel(id=2, name="user", description="Regular user"),
+            ])
+            db.commit()
+
+        # One hash shared by every seeded account keeps seeding fast
+        hashed = PasswordService.hash_password(SEED_PASSWORD)
+        phones = [ADMIN_PHONE] + [_seed_phone(n) for n in range(seed_users)]
+        existing = {p for (p,) in db.query(UserModel.phone_number).filter(UserModel.phone_number.in_(phones))}
+        for phone in phones:
+            if phone in existing:
+                continue
+            user = UserModel(phone_number=phone, full_name=f"Bench {phone}", hashed_password=hashed,
+                             is_active=True, is_verified=True)
+            db.add(user)
+            db.flush()
+            db.add(UserServiceRoleModel(user_id=user.id, service_id=1,
+                                        role_id=1 if phone == ADMIN_PHONE else 2, is_active=True))
+        db.commit()
+    finally:
+        db.close()
+
+
+class LoadTest:
+    def __init__(self, client, concurrency: int, requests: int, seed_users: int):
+        self.client = client
+        self.concurrency = concurrency
+        self.requests = requests
+        self.seed_users = seed_users
+        self.tokens = {}
+        # Random start so repeated runs against a persistent database do not collide
+        self._register_counter = random.randrange(0, 900000)
+
+    async def _token(self, phone: str) -> str:
+        token = self.tokens.get(phone)
+        if token is None:
+            response = await self.client.post("/auth/login", json={"phone_number": phone, "password": SEED_PASSWORD})
+            response.raise_for_status()
+            token = self.tokens[phone] = response.json()["access_token"]
+        return token
+
+    async def _auth_headers(self, phone: str) -> dict:
+        return {"Authorization": f"Bearer {await self._token(phone)}"}
+
+    # Each scenario performs one timed operation for iteration ``i``
+    async def register(self, i: int):
+        self._register_counter += 1
+        return [await self.client.post("/auth/register", json={
+            "phone_number": _register_phone(self._register_counter),
+            "full_name": "Bench Register",
+            "password": SEED_PASSWORD
+        })]
+
+    async def otp(self, i: int):
+        phone = _seed_phone(i % self.seed_users)
+        requested = await self.client.post("/auth/request-otp", json={"phone_number": phone, "purpose": "login"})
+        if requested.status_code != 200:
+            return [requested]
+        verified = await self.client.post("/auth/verify-otp", json={
+            "phone_number": phone, "otp_code": requested.json()["otp"], "purpose": "login"
+        })
+        return [requested, verified]
+
+    async def login(self, i: int):
+        return [await self.client.post("/auth/login", json={
+            "phone_number": _seed_phone(i % self.seed_users), "password": SEED_PASSWORD
+        })]
+
+    async def users_me(self, i: int):
+        headers = await self._auth_headers(_seed_phone(i % self.seed_users))
+        return [await self.client.get("/users/me", headers=headers)]
+
+    async def mfa_setup(self, i: int):
+        headers = await self._auth_headers(_seed_phone(i % self.seed_users))
+        return [await self.client.post("/mfa/setup", headers=headers)]
+
+    async def admin_list_users(self, i: int):
+        headers = await self._auth_headers(ADMIN_PHONE)
+        return [await self.client.get("/admin/users", headers=headers)]
+
+    async def _prepare(self, scenario: str) -> None:
+        # Log in outside the timed section so token issuance is not measured
+        if scenario in ("users_me", "mfa_setup"):
+            for n in range(min(self.seed_users, self.requests)):
+                await self._token(_seed_phone(n))
+        elif scenario == "admin_list_users":
+            await self._token(ADMIN_PHONE)
+
+    async def run_scenario(self, scenario: str) -> dict:
+        await self._prepare(scenario)
+        operation = getattr(self, scenario)
+        latencies = []
+        errors = 0
+        next_index = 0
+
+        async def worker():
+            nonlocal errors, next_index
+            while next_index < self.requests:
+                i = next_index
+                next_index += 1
+                start = time.perf_counter()
+                try:
+                    responses = await operation(i)
+                    failed = any(r.status_code >= 400 for r in responses)
+                except Exception:
+                    failed = True
+                if failed:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run(args) -> dict:
+    import httpx
+    from app.main import app
+
+    seed_database(args.seed_users)
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            load_test = LoadTest(client, args.concurrency, args.requests, args.seed_users)
+            for scenario in args.scenarios:
+                results[scenario] = await load_test.run_scenario(scenario)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="Database to seed and test against (default: a temporary SQLite file)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight operations per scenario")
+    parser.add_argument("--requests", type=int, default=200, help="Operations per scenario")
+    parser.add_argument("--seed-users", type=int, default=100, help="Pre-seeded regular users")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--keep-load-shedding", action="store_true",
+                        help="Leave the adaptive concurrency limiter on (503s count as errors)")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so configure the environment before importing the app
+    tmp_dir = None
+    if not args.database_url:
+        tmp_dir = tempfile.mkdtemp(prefix="userservice-bench-")
+        args.database_url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("MFA_BYPASS", "True")
+    if not args.keep_load_shedding:
+        os.environ["CONCURRENCY_LIMIT_ENABLED"] = "False"
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    try:
+        # Keep the development SMS prints out of the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            results = asyncio.run(run(args))
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    report = json.dumps({
+        "config": {
+            "database": args.database_url.split("@")[-1],
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed_users": args.seed_users
+        },
+        "scenarios": results
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
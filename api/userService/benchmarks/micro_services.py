@@ -0,0 +1,210 @@
+"""
+Micro-benchmarks for the infrastructure service primitives.
+
+Each primitive is warmed up, then timed over several repeats whose loop
+count is calibrated to a minimum duration. The report gives per-operation
+timings, ops/sec and memory allocated per call, plus a bcrypt cost-factor
+calibration that recommends a rounds value for a target hashing latency on
+the current machine. Output is JSON so results can be tracked across releases.
+
+    python -m benchmarks.micro_services
+    python -m benchmarks.micro_services --filter jwt --repeats 7 --output micro.json
+    python -m benchmarks.micro_services --calibrate-only --target-ms 250
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+SAMPLE_PHONE = "+14155552671"
+SAMPLE_PASSWORD = "correct horse battery staple"
+
+
+def build_cases():
+    """Return (name, callable) pairs for every primitive under test"""
+    import phonenumbers
+    import pyotp
+    from infrastructure.services.password_service import PasswordService
+    from infrastructure.services.jwt_service import JWTService
+    from infrastructure.services.mfa_service import MFAService
+    from infrastructure.services.otp_service import OTPService
+
+    hashed = PasswordService.hash_password(SAMPLE_PASSWORD)
+    token = JWTService.create_access_token({"sub": SAMPLE_PHONE, "role": "user"})
+    secret = MFAService.generate_secret()
+    totp_code = pyotp.TOTP(secret).now()
+    otp_created_at = datetime.utcnow() - timedelta(minutes=1)
+
+    def parse_phone():
+        parsed = phonenumbers.parse(SAMPLE_PHONE, None)
+        phonenumbers.is_valid_number(parsed)
+        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+    return [
+        ("password.hash", lambda: PasswordService.hash_password(SAMPLE_PASSWORD)),
+        ("password.verify", lambda: PasswordService.verify_password(SAMPLE_PASSWORD, hashed)),
+        ("jwt.create_access_token", lambda: JWTService.create_access_token({"sub": SAMPLE_PHONE, "role": "user"})),
+        ("jwt.verify_token", lambda: JWTService.verify_token(token)),
+        ("mfa.generate_secret", MFAService.generate_secret),
+        ("mfa.verify_totp", lambda: MFAService.verify_totp(secret, totp_code)),
+        ("mfa.generate_qr_code", lambda: MFAService.generate_qr_code(SAMPLE_PHONE, secret)),
+        ("mfa.generate_backup_codes", MFAService.generate_backup_codes),
+        ("otp.generate_otp", OTPService.generate_otp),
+        ("otp.is_expired", lambda: OTPService.is_expired(otp_created_at)),
+        ("phone.parse_validate_format", parse_phone),
+    ]
+
+
+def _time_loop(func, loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - start
+
+
+def _calibrate_loops(func, min_time: float) -> int:
+    loops = 1
+    while True:
+        elapsed = _time_loop(func, loops)
+        if elapsed >= min_time or loops >= 1_000_000:
+            return loops
+        # Aim a little past the target so the next attempt usually suffices
+        loops = max(loops * 2, int(loops * min_time * 1.2 / max(elapsed, 1e-9)))
+
+
+def _allocations(func, calls: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+
+        before = tracemalloc.take_snapshot()
+        for _ in range(calls):
+            func()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained = after.compare_to(before, "filename")
+    return {
+        "peak_bytes_per_call": peak - baseline,
+        "retained_bytes_per_call": int(sum(stat.size_diff for stat in retained) / calls),
+        "retained_blocks_per_call": round(sum(stat.count_diff for stat in retained) / calls, 2)
+    }
+
+
+def bench(func, warmup: int, repeats: int, min_time: float) -> dict:
+    for _ in range(warmup):
+        func()
+    loops = _calibrate_loops(func, min_time)
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        per_op = [_time_loop(func, loops) / loops for _ in range(repeats)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    median = statistics.median(per_op)
+    return {
+        "loops": loops,
+        "repeats": repeats,
+        "min_us": round(min(per_op) * 1e6, 3),
+        "median_us": round(median * 1e6, 3),
+        "mean_us": round(statistics.fmean(per_op) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(per_op) * 1e6, 3) if repeats > 1 else 0.0,
+        "ops_per_sec": round(1.0 / median, 2) if median > 0 else None,
+        "allocations": _allocations(func, min(loops, 50))
+    }
+
+
+def calibrate_bcrypt(target_ms: float, repeats: int = 3, min_rounds: int = 4, max_rounds: int = 16) -> dict:
+    """Time bcrypt for increasing cost factors and pick the highest within target"""
+    from passlib.hash import bcrypt
+    from infrastructure.services.password_service import pwd_context
+
+    measurements = []
+    recommended = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        hasher = bcrypt.using(rounds=rounds)
+        hasher.hash(SAMPLE_PASSWORD)
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            hasher.hash(SAMPLE_PASSWORD)
+            samples.append(time.perf_counter() - start)
+        median_ms = statistics.median(samples) * 1000
+        measurements.append({"rounds": rounds, "median_ms": round(median_ms, 3)})
+        if median_ms <= target_ms:
+            recommended = rounds
+        if median_ms > target_ms * 4:
+            # Every extra round doubles the cost; nothing beyond here can fit
+            break
+
+    current_rounds = pwd_context.to_dict().get("bcrypt__default_rounds") or bcrypt.default_rounds
+    return {
+        "target_ms": target_ms,
+        "current_rounds": current_rounds,
+        "recommended_rounds": recommended,
+        "measurements": measurements
+    }
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.utcnow().isoformat() + "Z"
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", help="Only run primitives whose name contains this substring")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed calls before measuring")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repeats per primitive")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timed repeat")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="bcrypt latency target for calibration")
+    parser.add_argument("--calibrate-only", action="store_true", help="Skip primitives, only run bcrypt calibration")
+    parser.add_argument("--no-calibrate", action="store_true", help="Skip bcrypt calibration")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    results = {}
+    if not args.calibrate_only:
+        for name, func in build_cases():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = bench(func, args.warmup, args.repeats, args.min_time)
+            print(f"{name}: {results[name]['median_us']} us/op", file=sys.stderr)
+
+    report = {"environment": environment(), "primitives": results}
+    if not args.no_calibrate:
+        report["bcrypt_calibration"] = calibrate_bcrypt(args.target_ms)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Stub webhook receiver for trying out and testing change-event delivery.
+
+Accepts the dispatcher's signed batches, checks the signature against
+``--secret``, counts events (and duplicates, which at-least-once delivery
+allows) and can fail a share of requests to exercise retries. ``GET /stats``
+returns the counters. Register it with ``POST /admin/webhooks`` using the same
+secret:
+
+    python -m benchmarks.webhook_receiver --port 9100 --secret <secret> --fail-rate 0.2
+
+``WebhookReceiver`` is a plain ASGI app, so tests can also serve it in-process.
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Requests signed longer ago than this are refused as possible replays
+MAX_CLOCK_SKEW_SECONDS = 300
+
+
+class WebhookReceiver:
+    def __init__(self, secret: Optional[str] = None, fail_rate: float = 0.0, fail_status: int = 503):
+        self.secret = secret
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.batches: List[List[dict]] = []
+        self.event_ids: Dict[str, int] = {}
+        self.rejected = 0
+        self.failed = 0
+
+    def verify(self, headers: Dict[str, str], body: bytes) -> bool:
+        if self.secret is None:
+            return True
+        timestamp = headers.get("x-webhook-timestamp", "")
+        signature = headers.get("x-webhook-signature", "")
+        if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > MAX_CLOCK_SKEW_SECONDS:
+            return False
+        expected = hmac.new(self.secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(signature, f"sha256={expected}")
+
+    def stats(self) -> dict:
+        received = sum(len(batch) for batch in self.batches)
+        return {
+            "batches": len(self.batches),
+            "events": received,
+            "unique_events": len(self.event_ids),
+            "duplicates": received - len(self.event_ids),
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while (await receive())["type"] != "lifespan.shutdown":
+                await send({"type": "lifespan.startup.complete"})
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        if scope["method"] == "GET" and scope["path"] == "/stats":
+            await self._respond(send, 200, self.stats())
+            return
+        if scope["method"] != "POST":
+            await self._respond(send, 405, {"detail": "Method not allowed"})
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        if not self.verify(headers, body):
+            self.rejected += 1
+            await self._respond(send, 401, {"detail": "Bad signature"})
+            return
+        if self.fail_rate and random.random() < self.fail_rate:
+            self.failed += 1
+            await self._respond(send, self.fail_status, {"detail": "Simulated failure"})
+            return
+
+        events = json.loads(body)["events"]
+        self.batches.append(events)
+        for event in events:
+            self.event_ids[event["id"]] = self.event_ids.get(event["id"], 0) + 1
+        await self._respond(send, 200, {"received": len(events)})
+
+    @staticmethod
+    async def _respond(send, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def main(argv=None) -> int:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--secret", help="Endpoint secret; signatures are not checked without it")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of batches answered with --fail-status")
+    parser.add_argument("--fail-status", type=int, default=503)
+    args = parser.parse_args(argv)
+
+    receiver = WebhookReceiver(secret=args.secret, fail_rate=args.fail_rate, fail_status=args.fail_status)
+    uvicorn.run(receiver, host=args.host, port=args.port, log_level="warning")
+    print(json.dumps(receiver.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
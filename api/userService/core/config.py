@@ -8,6 +8,9 @@ load_dotenv()
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./users.db")
+    # Optional user shards (comma separated URLs). When set, users, their OTPs and role assignments
+    # live on the shards and DATABASE_URL keeps the catalog and the user directory. See SHARDING.md
+    SHARD_DATABASE_URLS: str = os.getenv("SHARD_DATABASE_URLS", "")
     
     # JWT Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-super-secret-key-change-this-in-production")
@@ -18,6 +21,16 @@ class Settings(BaseSettings):
     MFA_ISSUER: str = os.getenv("MFA_ISSUER", "ElectraApp")
     MFA_BYPASS: bool = os.getenv("MFA_BYPASS", "True").lower() == "true"  # Set to True to bypass MFA
     OTP_EXPIRE_MINUTES: int = 5
+
+    # Password hashing policy - the first scheme hashes new passwords, the rest are only verified
+    # and upgraded on login. "argon2" requires the optional argon2-cffi package.
+    PASSWORD_HASH_SCHEMES: list = [s.strip() for s in os.getenv("PASSWORD_HASH_SCHEMES", "bcrypt").split(",") if s.strip()]
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", "3"))
+    ARGON2_MEMORY_COST_KIB: int = int(os.getenv("ARGON2_MEMORY_COST_KIB", "65536"))
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", "4"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_POLICY_STATS_TTL_SECONDS: int = int(os.getenv("PASSWORD_POLICY_STATS_TTL_SECONDS", "300"))
     
     # Application
     APP_NAME: str = "ElectraApp User Service"
@@ -26,7 +39,81 @@ class Settings(BaseSettings):
     
     # CORS
     ALLOWED_ORIGINS: list = ["*"]  # Configure properly for production
-    
+
+    # Adaptive concurrency limiting / load shedding
+    CONCURRENCY_LIMIT_ENABLED: bool = os.getenv("CONCURRENCY_LIMIT_ENABLED", "True").lower() == "true"
+    CONCURRENCY_INITIAL_LIMIT: int = int(os.getenv("CONCURRENCY_INITIAL_LIMIT", "20"))
+    CONCURRENCY_MIN_LIMIT: int = int(os.getenv("CONCURRENCY_MIN_LIMIT", "2"))
+    CONCURRENCY_MAX_LIMIT: int = int(os.getenv("CONCURRENCY_MAX_LIMIT", "200"))
+    CONCURRENCY_LATENCY_TOLERANCE: float = float(os.getenv("CONCURRENCY_LATENCY_TOLERANCE", "2.0"))
+    CONCURRENCY_BACKOFF_RATIO: float = float(os.getenv("CONCURRENCY_BACKOFF_RATIO", "0.9"))
+    CONCURRENCY_RETRY_AFTER_SECONDS: int = int(os.getenv("CONCURRENCY_RETRY_AFTER_SECONDS", "1"))
+    CONCURRENCY_EXEMPT_PATHS: list = ["/health", "/ready", "/metrics"]
+
+    # Cross-worker cache invalidation: "auto" (postgres for PostgreSQL URLs, else local), "local",
+    # "postgres" or "memory" (in-process only)
+    INVALIDATION_BACKEND: str = os.getenv("INVALIDATION_BACKEND", "auto").lower()
+    INVALIDATION_CHANNEL: str = os.getenv("INVALIDATION_CHANNEL", "userservice_invalidation")
+    INVALIDATION_SOCKET_DIR: str = os.getenv("INVALIDATION_SOCKET_DIR", "")
+
+    # Internal service-to-service routes (/internal, /sync), off unless keys are set. Callers send one of the
+    # comma separated keys in X-Service-Key. MessagePack bodies need the optional msgpack package.
+    INTERNAL_SERVICE_KEYS: str = os.getenv("INTERNAL_SERVICE_KEYS", "")
+    INTERNAL_MAX_BATCH_SIZE: int = int(os.getenv("INTERNAL_MAX_BATCH_SIZE", "1000"))
+    TOKEN_CACHE_TTL_SECONDS: float = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+    TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "100000"))
+
+    # Idempotency-Key support for retried mutations (in-process store, per worker)
+    IDEMPOTENCY_ENABLED: bool = os.getenv("IDEMPOTENCY_ENABLED", "True").lower() == "true"
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_MAX_ENTRIES: int = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+    IDEMPOTENT_PATHS: list = ["/auth/register", "/auth/request-otp", "/auth/reset-password"]
+
+    # Audit trail: bounded in-memory queue flushed in batches by a background task.
+    # When full, "drop_newest" discards the incoming event, "drop_oldest" the oldest queued one
+    AUDIT_ENABLED: bool = os.getenv("AUDIT_ENABLED", "True").lower() == "true"
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1"))
+    AUDIT_DROP_POLICY: str = os.getenv("AUDIT_DROP_POLICY", "drop_newest").lower()
+
+    # Readiness probe (/ready)
+    READINESS_DB_CHECK_INTERVAL_SECONDS: float = float(os.getenv("READINESS_DB_CHECK_INTERVAL_SECONDS", "5"))
+    READINESS_DB_PING_TIMEOUT_SECONDS: float = float(os.getenv("READINESS_DB_PING_TIMEOUT_SECONDS", "1"))
+    READINESS_POOL_SATURATION_THRESHOLD: float = float(os.getenv("READINESS_POOL_SATURATION_THRESHOLD", "0.9"))
+    READINESS_MAX_QUEUE_DEPTH: int = int(os.getenv("READINESS_MAX_QUEUE_DEPTH", "50"))
+
+    # Webhooks: user and role change events go to an outbox in the writing transaction and are
+    # pushed to the registered endpoints (/admin/webhooks) in signed batches, with retries
+    WEBHOOKS_ENABLED: bool = os.getenv("WEBHOOKS_ENABLED", "True").lower() == "true"
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = float(os.getenv("WEBHOOK_POLL_INTERVAL_SECONDS", "1"))
+    WEBHOOK_BATCH_SIZE: int = int(os.getenv("WEBHOOK_BATCH_SIZE", "100"))
+    WEBHOOK_TIMEOUT_SECONDS: float = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "10"))
+    WEBHOOK_MAX_ATTEMPTS: int = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+    WEBHOOK_RETRY_BASE_SECONDS: float = float(os.getenv("WEBHOOK_RETRY_BASE_SECONDS", "2"))
+    WEBHOOK_RETRY_MAX_SECONDS: float = float(os.getenv("WEBHOOK_RETRY_MAX_SECONDS", "3600"))
+    WEBHOOK_RETENTION_HOURS: float = float(os.getenv("WEBHOOK_RETENTION_HOURS", "168"))
+
+    # Metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
+    # Event-loop stall watchdog: reports callbacks that hold the loop longer than the threshold
+    LOOP_WATCHDOG_ENABLED: bool = os.getenv("LOOP_WATCHDOG_ENABLED", "True").lower() == "true"
+    LOOP_WATCHDOG_THRESHOLD_MS: float = float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "100"))
+    LOOP_WATCHDOG_INTERVAL_MS: float = float(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "50"))
+
+    # SQL instrumentation (N+1 detection and debug headers default to DEBUG mode)
+    SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+    SQL_N_PLUS_ONE_DETECTION: bool = os.getenv("SQL_N_PLUS_ONE_DETECTION", os.getenv("DEBUG", "False")).lower() == "true"
+    SQL_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+    SQL_DEBUG_HEADERS: bool = os.getenv("SQL_DEBUG_HEADERS", os.getenv("DEBUG", "False")).lower() == "true"
+
+    # On-demand request profiling (disabled unless a token or sample rate is set)
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "1"))
+    PROFILING_OUTPUT_DIR: str = os.getenv("PROFILING_OUTPUT_DIR", "./profiles")
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,82 @@
+"""
+Request-scoped database sessions.
+
+Repositories and use cases are built once at start-up (``interfaces.container``)
+and look up the session of the request they are serving here. A
+``SessionScope`` opens the primary session - and the shard sessions, when
+sharding is configured - on first use only, and closes them when the request
+ends. Worker threads started with ``asyncio.to_thread`` inherit the scope.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .sharding import ShardSessions, shard_router
+
+
+class SessionScope:
+    __slots__ = ("_db", "_shards", "closed")
+
+    def __init__(self):
+        self._db: Optional[Session] = None
+        self._shards: Optional[ShardSessions] = None
+        self.closed = False
+
+    @property
+    def db(self) -> Session:
+        if self.closed:
+            raise RuntimeError("The session scope has ended; open a new one for work outside the request")
+        if self._db is None:
+            self._db = SessionLocal()
+        return self._db
+
+    @property
+    def shards(self) -> Optional[ShardSessions]:
+        """Per-shard sessions, or None when sharding is not configured"""
+        if shard_router is None:
+            return None
+        if self.closed:
+            raise RuntimeError("The session scope has ended; open a new one for work outside the request")
+        if self._shards is None:
+            self._shards = ShardSessions(shard_router)
+        return self._shards
+
+    def close(self) -> None:
+        self.closed = True
+        if self._shards is not None:
+            self._shards.close()
+        if self._db is not None:
+            self._db.close()
+
+
+_current_scope: ContextVar[Optional[SessionScope]] = ContextVar("session_scope", default=None)
+
+
+@contextmanager
+def session_scope():
+    """Bind a fresh scope to the current context (a request, a background job) and close it afterwards"""
+    scope = SessionScope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        scope.close()
+
+
+def current_scope() -> SessionScope:
+    scope = _current_scope.get()
+    if scope is None:
+        raise RuntimeError("No session scope is active; wrap the work in session_scope()")
+    return scope
+
+
+def current_session() -> Session:
+    return current_scope().db
+
+
+def current_shard_sessions() -> Optional[ShardSessions]:
+    return current_scope().shards
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Shard routing for user data.
+
+A user's shard is chosen once, at registration, from a stable hash of the
+E.164 phone number (jump consistent hashing, so adding a shard moves only
+about 1/N of new placements). The user directory on the primary database
+records the shard permanently, which keeps id and email lookups - and users
+who later change phone number - routable.
+"""
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .config import settings
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Jump consistent hash (Lamping & Veach): maps a 64-bit key to [0, buckets)"""
+    if buckets <= 0:
+        raise ValueError("buckets must be positive")
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+def phone_hash(phone_number: str) -> int:
+    """Stable 64-bit key for an E.164 number; unlike hash(), identical across processes"""
+    return int.from_bytes(hashlib.sha256(phone_number.strip().encode()).digest()[:8], "big")
+
+
+class ShardRouter:
+    def __init__(self, urls: List[str]):
+        if not urls:
+            raise ValueError("At least one shard URL is required")
+        self.urls = list(urls)
+        self.engines = [
+            create_engine(url, connect_args={"check_same_thread": False} if "sqlite" in url else {})
+            for url in self.urls
+        ]
+        self._session_factories = [
+            sessionmaker(autocommit=False, autoflush=False, bind=engine) for engine in self.engines
+        ]
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def shard_for_phone(self, phone_number: str) -> int:
+        """Placement for a new user; existing users are routed through the directory"""
+        return jump_hash(phone_hash(phone_number), len(self.engines))
+
+    def session(self, shard: int) -> Session:
+        return self._session_factories[shard]()
+
+    def create_all(self, metadata) -> None:
+        for engine in self.engines:
+            metadata.create_all(bind=engine)
+
+    def dispose(self) -> None:
+        for engine in self.engines:
+            engine.dispose()
+
+
+class ShardSessions:
+    """Sessions opened on demand, one per shard, for the lifetime of a request"""
+
+    def __init__(self, router: ShardRouter):
+        self.router = router
+        self._sessions: Dict[int, Session] = {}
+        # Per-request routing hints kept by repositories (e.g. which shard an OTP id came from)
+        self.info: Dict[str, Any] = {}
+
+    def get(self, shard: int) -> Session:
+        session = self._sessions.get(shard)
+        if session is None:
+            session = self._sessions[shard] = self.router.session(shard)
+        return session
+
+    def close(self) -> None:
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+
+_shard_urls = [url.strip() for url in settings.SHARD_DATABASE_URLS.split(",") if url.strip()]
+shard_router: Optional[ShardRouter] = ShardRouter(_shard_urls) if _shard_urls else None
@@ -1,13 +1,29 @@
 from .user import User, OTPVerification, MFASetup
+from .user_projections import AuthPrincipal, UserProfile, CredentialRecord
 from .user_role import UserRole
 from .service import Service
 from .user_service_role import UserServiceRole
+from .stats_summary import StatsSummary, AssignmentCount, SignupCount
+from .audit_event import AuditEvent
+from .webhook import WebhookEndpoint, WebhookDelivery
+from .change import Change, ChangePage
 
 __all__ = [
     "User",
     "OTPVerification", 
     "MFASetup",
+    "AuthPrincipal",
+    "UserProfile",
+    "CredentialRecord",
     "UserRole",
     "Service",
-    "UserServiceRole"
+    "UserServiceRole",
+    "StatsSummary",
+    "AssignmentCount",
+    "SignupCount",
+    "AuditEvent",
+    "WebhookEndpoint",
+    "WebhookDelivery",
+    "Change",
+    "ChangePage"
 ]
\ No newline at end of file
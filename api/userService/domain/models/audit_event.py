@@ -0,0 +1,30 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# Audited actions
+LOGIN = "auth.login"
+OTP_REQUEST = "auth.otp_request"
+MFA_SETUP = "mfa.setup"
+MFA_ENABLE = "mfa.enable"
+USER_DEACTIVATE = "admin.user_deactivate"
+ROLE_CREATE = "admin.role_create"
+ROLE_UPDATE = "admin.role_update"
+ROLE_DELETE = "admin.role_delete"
+SERVICE_ROLE_CREATE = "admin.service_role_create"
+SERVICE_ROLE_UPDATE = "admin.service_role_update"
+SERVICE_ROLE_DELETE = "admin.service_role_delete"
+WEBHOOK_CREATE = "admin.webhook_create"
+WEBHOOK_UPDATE = "admin.webhook_update"
+WEBHOOK_DELETE = "admin.webhook_delete"
+
+
+@dataclass
+class AuditEvent:
+    action: str
+    outcome: str = "success"
+    actor_user_id: Optional[int] = None
+    subject_user_id: Optional[int] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+    created_at: Optional[datetime] = None
+    id: Optional[int] = None
\ No newline at end of file
@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Change feed entities
+USER = "user"
+ASSIGNMENT = "assignment"
+
+# Operations: upsert carries the current published fields; delete is a tombstone for a row
+# that was deleted or deactivated
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+@dataclass
+class Change:
+    seq: int
+    kind: str
+    id: int
+    op: str
+    data: Optional[dict] = None
+
+
+@dataclass
+class ChangePage:
+    changes: List[Change] = field(default_factory=list)
+    cursor: List[int] = field(default_factory=list)  # last sequence number read, per database
+    has_more: bool = False
\ No newline at end of file
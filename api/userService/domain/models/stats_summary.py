@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import List, Optional
+
+
+@dataclass
+class AssignmentCount:
+    service_id: int
+    role_id: int
+    active: int = 0
+    inactive: int = 0
+
+
+@dataclass
+class SignupCount:
+    day: date
+    count: int
+
+
+@dataclass
+class StatsSummary:
+    total_users: int = 0
+    active_users: int = 0
+    verified_users: int = 0
+    mfa_enabled_users: int = 0
+    assignments: List[AssignmentCount] = field(default_factory=list)
+    signups: List[SignupCount] = field(default_factory=list)
+    updated_at: Optional[datetime] = None
+
+    @property
+    def deactivated_users(self) -> int:
+        return self.total_users - self.active_users
+
+    @property
+    def mfa_share(self) -> float:
+        return self.mfa_enabled_users / self.total_users if self.total_users else 0.0
\ No newline at end of file
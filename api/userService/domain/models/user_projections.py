@@ -0,0 +1,48 @@
+"""
+Read-only projections of a user for specific call sites.
+
+Each record carries only the columns its caller needs and is loaded with a
+narrow SELECT, so hot paths skip the secrets and JSON columns of the full
+``User``. They are frozen and slotted: cheap to build, safe to share.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class AuthPrincipal:
+    """The authenticated caller: identity, active flag and active (service_id, role_id) pairs"""
+    id: int
+    phone_number: str
+    is_active: bool
+    roles: Tuple[Tuple[int, int], ...] = ()
+
+    def has_role(self, service_id: int, role_id: int) -> bool:
+        return (service_id, role_id) in self.roles
+
+
+@dataclass(frozen=True, slots=True)
+class UserProfile:
+    """The public profile fields returned by the API"""
+    id: int
+    phone_number: str
+    full_name: str
+    email: Optional[str]
+    is_active: bool
+    is_verified: bool
+    mfa_enabled: bool
+    created_at: Optional[datetime] = None
+    last_login: Optional[datetime] = None
+
+
+@dataclass(frozen=True, slots=True)
+class CredentialRecord:
+    """What a login needs to verify a password and second factor"""
+    id: int
+    phone_number: str
+    hashed_password: str
+    is_active: bool
+    mfa_enabled: bool
+    mfa_secret: Optional[str] = None
+    backup_codes: Tuple[str, ...] = ()
\ No newline at end of file
@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+# Change events published to webhooks
+USER_CREATED = "user.created"
+USER_UPDATED = "user.updated"
+USER_DEACTIVATED = "user.deactivated"
+USER_DELETED = "user.deleted"
+ROLE_ASSIGNED = "role.assigned"
+ROLE_CHANGED = "role.changed"
+ROLE_REVOKED = "role.revoked"
+EVENT_TYPES = (
+    USER_CREATED, USER_UPDATED, USER_DEACTIVATED, USER_DELETED,
+    ROLE_ASSIGNED, ROLE_CHANGED, ROLE_REVOKED
+)
+
+# Delivery states
+PENDING = "pending"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+
+@dataclass
+class WebhookEndpoint:
+    id: Optional[int]
+    url: str
+    secret: str
+    event_types: List[str] = field(default_factory=list)  # empty = every event type
+    is_active: bool = True
+    max_concurrency: int = 1
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    def wants(self, event_type: str) -> bool:
+        return not self.event_types or event_type in self.event_types
+
+
+@dataclass
+class WebhookDelivery:
+    id: Optional[int]
+    endpoint_id: int
+    event_id: str
+    event_type: str
+    status: str = PENDING
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    occurred_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
\ No newline at end of file
@@ -2,10 +2,20 @@ from .user_repository import UserRepository
 from .user_role_repository import UserRoleRepository
 from .service_repository import ServiceRepository
 from .user_service_role_repository import UserServiceRoleRepository
+from .unit_of_work import UnitOfWork
+from .stats_repository import StatsRepository
+from .audit_repository import AuditRepository
+from .webhook_repository import WebhookRepository
+from .change_feed_repository import ChangeFeedRepository
 
 __all__ = [
     "UserRepository",
     "UserRoleRepository", 
     "ServiceRepository",
-    "UserServiceRoleRepository"
+    "UserServiceRoleRepository",
+    "UnitOfWork",
+    "StatsRepository",
+    "AuditRepository",
+    "WebhookRepository",
+    "ChangeFeedRepository"
 ]
\ No newline at end of file
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
+from domain.models.audit_event import AuditEvent
+
+
+class AuditRepository(ABC):
+    @abstractmethod
+    async def add_many(self, events: List[AuditEvent]) -> int:
+        pass
+    
+    @abstractmethod
+    async def list_events(
+        self,
+        action: Optional[str] = None,
+        actor_user_id: Optional[int] = None,
+        subject_user_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[AuditEvent], Optional[int]]:
+        pass
\ No newline at end of file
@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from domain.models.change import ChangePage
+
+
+class ChangeFeedRepository(ABC):
+    @abstractmethod
+    async def get_changes(self, since: Optional[List[int]], limit: int = 500) -> ChangePage:
+        pass
\ No newline at end of file
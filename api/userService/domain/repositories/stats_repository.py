@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from domain.models.stats_summary import StatsSummary
+
+
+class StatsRepository(ABC):
+    @abstractmethod
+    async def get_summary(self, signups_since: date) -> StatsSummary:
+        pass
+    
+    @abstractmethod
+    async def rebuild(self) -> StatsSummary:
+        pass
\ No newline at end of file
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from typing import AsyncContextManager
+
+from .user_repository import UserRepository, OTPRepository
+from .user_service_role_repository import UserServiceRoleRepository
+from .user_role_repository import UserRoleRepository
+from .service_repository import ServiceRepository
+
+
+class UnitOfWork(ABC):
+    """Groups repository writes into one transaction that is committed once.
+
+    Usage:
+        async with uow:
+            await uow.users.update(user)
+            await uow.user_service_roles.create(assignment)
+            await uow.commit()
+
+    Leaving the block without commit() - normally or through an exception - rolls back.
+    """
+    users: UserRepository
+    otps: OTPRepository
+    user_service_roles: UserServiceRoleRepository
+    user_roles: UserRoleRepository
+    services: ServiceRepository
+
+    @abstractmethod
+    async def __aenter__(self) -> "UnitOfWork":
+        pass
+
+    @abstractmethod
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
+
+    @abstractmethod
+    def savepoint(self) -> AsyncContextManager[None]:
+        """Nested transaction; an exception inside rolls back only to the savepoint"""
+        pass
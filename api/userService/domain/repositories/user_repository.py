@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Callable, Optional, List, Sequence, Tuple
 from ..models.user import User, OTPVerification
+from ..models.user_projections import AuthPrincipal, UserProfile, CredentialRecord
 
 class UserRepository(ABC):
     @abstractmethod
@@ -30,6 +32,50 @@ class UserRepository(ABC):
     @abstractmethod
     async def list_all(self) -> List[User]:
         pass
+    
+    @abstractmethod
+    async def create_with_service_role(self, user: User, service_id: int, role_id: int) -> dict:
+        pass
+    
+    @abstractmethod
+    async def get_profile_version(self, user_id: int) -> Tuple:
+        pass
+    
+    @abstractmethod
+    async def search(self, query: str, fuzzy: bool = False, limit: int = 20, offset: int = 0) -> Tuple[List[User], bool]:
+        pass
+    
+    @abstractmethod
+    async def update_password_hash(self, user_id: int, expected_hash: str, new_hash: str) -> bool:
+        pass
+    
+    @abstractmethod
+    def count_password_hashes(self, parameters: Callable[[str], str]) -> List[Tuple[str, int, str]]:
+        pass
+    
+    @abstractmethod
+    async def get_auth_principal(self, phone_number: str) -> Optional[AuthPrincipal]:
+        pass
+    
+    @abstractmethod
+    async def get_auth_principals(self, phone_numbers: Sequence[str] = (), user_ids: Sequence[int] = ()) -> List[AuthPrincipal]:
+        pass
+    
+    @abstractmethod
+    async def get_profile(self, user_id: int) -> Optional[UserProfile]:
+        pass
+    
+    @abstractmethod
+    async def get_profiles(self, user_ids: Sequence[int]) -> List[UserProfile]:
+        pass
+    
+    @abstractmethod
+    async def get_credentials(self, phone_number: str) -> Optional[CredentialRecord]:
+        pass
+    
+    @abstractmethod
+    async def record_login(self, user_id: int, last_login: datetime) -> Optional[UserProfile]:
+        pass
 
 class OTPRepository(ABC):
     @abstractmethod
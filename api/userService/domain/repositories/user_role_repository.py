@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from domain.models.user_role import UserRole
 
 
@@ -26,4 +26,8 @@ class UserRoleRepository(ABC):
     
     @abstractmethod
     async def delete(self, role_id: int) -> bool:
+        pass
+    
+    @abstractmethod
+    async def get_collection_version(self) -> Tuple:
         pass
\ No newline at end of file
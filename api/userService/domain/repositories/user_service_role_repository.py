@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from domain.models.user_service_role import UserServiceRole
 
 
@@ -46,4 +46,20 @@ class UserServiceRoleRepository(ABC):
     
     @abstractmethod
     async def deactivate_user_service_role(self, user_id: int, service_id: int) -> bool:
+        pass
+    
+    @abstractmethod
+    async def get_collection_version(self, user_id: Optional[int] = None, service_id: Optional[int] = None) -> Tuple:
+        pass
+    
+    @abstractmethod
+    async def list_assignments(
+        self,
+        service_id: Optional[int] = None,
+        role_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        user_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[dict], Optional[int]]:
         pass
\ No newline at end of file
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from domain.models.webhook import WebhookEndpoint, WebhookDelivery
+
+
+class WebhookRepository(ABC):
+    @abstractmethod
+    async def create_endpoint(self, endpoint: WebhookEndpoint) -> WebhookEndpoint:
+        pass
+    
+    @abstractmethod
+    async def get_endpoint(self, endpoint_id: int) -> Optional[WebhookEndpoint]:
+        pass
+    
+    @abstractmethod
+    async def list_endpoints(self, active_only: bool = False) -> List[WebhookEndpoint]:
+        pass
+    
+    @abstractmethod
+    async def update_endpoint(self, endpoint: WebhookEndpoint) -> WebhookEndpoint:
+        pass
+    
+    @abstractmethod
+    async def delete_endpoint(self, endpoint_id: int) -> bool:
+        pass
+    
+    @abstractmethod
+    async def list_deliveries(
+        self,
+        endpoint_id: int,
+        status: Optional[str] = None,
+        before_id: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[WebhookDelivery], Optional[int]]:
+        pass
+    
+    @abstractmethod
+    async def retry_failed(self, endpoint_id: int) -> int:
+        pass
\ No newline at end of file
@@ -0,0 +1,8 @@
+# Infrastructure cache package
+from .invalidation import InvalidationBus, InvalidationEvent, invalidation_bus
+
+__all__ = [
+    'InvalidationBus',
+    'InvalidationEvent',
+    'invalidation_bus'
+]
\ No newline at end of file
@@ -0,0 +1,313 @@
+"""
+Cross-worker cache invalidation.
+
+Repositories publish an ``InvalidationEvent`` after every committed write.
+The bus delivers it to handlers in the publishing process immediately and
+broadcasts it to every other worker, which runs the same handlers when it
+arrives. Delivery is best effort, so caches fed by the bus should still
+carry a TTL as a bound on staleness.
+
+Backends:
+    local     Unix datagram sockets in a shared directory; one socket per
+              process. For several workers on one host, and for tests.
+    postgres  LISTEN/NOTIFY on a dedicated connection. For replicas on
+              different hosts sharing a database.
+"""
+import glob
+import json
+import logging
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Entity families that can be invalidated
+USER = "user"
+SERVICE = "service"
+USER_ROLE = "user_role"
+USER_SERVICE_ROLE = "user_service_role"
+ENTITIES = (USER, SERVICE, USER_ROLE, USER_SERVICE_ROLE)
+
+
+@dataclass(frozen=True)
+class InvalidationEvent:
+    """A committed write to ``entity``. ``keys`` are the cache keys affected; empty means all of them."""
+    entity: str
+    keys: Tuple[str, ...] = ()
+    origin: str = ""
+    timestamp: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        if self.entity not in ENTITIES:
+            raise ValueError(f"Unknown invalidation entity: {self.entity}")
+
+    def affects(self, key) -> bool:
+        return not self.keys or str(key) in self.keys
+
+    def to_json(self) -> str:
+        return json.dumps({"e": self.entity, "k": list(self.keys), "o": self.origin, "t": self.timestamp},
+                          separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "InvalidationEvent":
+        data = json.loads(payload)
+        return cls(entity=data["e"], keys=tuple(data["k"]), origin=data["o"], timestamp=data["t"])
+
+
+InvalidationHandler = Callable[[InvalidationEvent], None]
+
+
+class InvalidationBus(ABC):
+    """Publishes invalidation events to every worker, including this one."""
+
+    def __init__(self):
+        # Identifies this process so it can skip its own broadcasts
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        self._handlers: List[InvalidationHandler] = []
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        self._handlers.append(handler)
+
+    def publish(self, entity: str, *keys) -> None:
+        event = InvalidationEvent(entity=entity, keys=tuple(str(k) for k in keys if k is not None),
+                                  origin=self.origin)
+        self._dispatch(event)
+        try:
+            self._broadcast(event)
+        except Exception:
+            logger.exception("Failed to broadcast invalidation for %s %s", entity, event.keys)
+
+    def _dispatch(self, event: InvalidationEvent) -> None:
+        for handler in self._handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Invalidation handler %r failed", handler)
+
+    def _receive(self, payload: str) -> None:
+        try:
+            event = InvalidationEvent.from_json(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed invalidation payload: %r", payload[:200])
+            return
+        if event.origin != self.origin:
+            self._dispatch(event)
+
+    @abstractmethod
+    def _broadcast(self, event: InvalidationEvent) -> None:
+        pass
+
+    @abstractmethod
+    def start(self) -> None:
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        pass
+
+
+class LocalInvalidationBus(InvalidationBus):
+    """Unix datagram socket per process in ``socket_dir``; without a directory, in-process only."""
+
+    def __init__(self, socket_dir: Optional[str] = None):
+        super().__init__()
+        self.socket_dir = socket_dir if hasattr(socket, "AF_UNIX") else None
+        self._path: Optional[str] = None
+        self._receiver: Optional[socket.socket] = None
+        self._sender: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        if not self.socket_dir or self._receiver is not None:
+            return
+        os.makedirs(self.socket_dir, mode=0o700, exist_ok=True)
+        # Short name: AF_UNIX paths are limited to ~108 bytes
+        self._path = os.path.join(self.socket_dir, f"{os.getpid()}-{secrets.token_hex(3)}.sock")
+        self._receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._receiver.bind(self._path)
+        self._receiver.settimeout(1.0)
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        for sock in (self._receiver, self._sender):
+            if sock is not None:
+                sock.close()
+        self._receiver = self._sender = None
+        if self._path:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+            self._path = None
+
+    def _listen(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                payload = self._receiver.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                if not self._stopping.is_set():
+                    logger.exception("Invalidation socket receive failed")
+                return
+            self._receive(payload.decode("utf-8", "replace"))
+
+    def _broadcast(self, event: InvalidationEvent) -> None:
+        if self._sender is None:
+            return
+        payload = event.to_json().encode()
+        for peer in glob.glob(os.path.join(self.socket_dir, "*.sock")):
+            if peer == self._path:
+                continue
+            try:
+                self._sender.sendto(payload, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker that owned this socket exited without cleaning up
+                try:
+                    os.unlink(peer)
+                except OSError:
+                    pass
+            except BlockingIOError:
+                logger.warning("Invalidation dropped: receive buffer of %s is full", peer)
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """LISTEN/NOTIFY backend.
+
+    Publishing only queues the notification; a sender thread drains the queue
+    and sends everything waiting in one transaction, so writers neither block
+    on nor hold a second pool connection for the broadcast.
+    """
+
+    def __init__(self, engine, channel: str = "userservice_invalidation", reconnect_delay: float = 2.0,
+                 max_pending: int = 10000, send_batch_size: int = 500):
+        super().__init__()
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.send_batch_size = send_batch_size
+        self._outgoing: "queue.Queue[str]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._sender: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen_forever, name="cache-invalidation", daemon=True)
+        self._thread.start()
+        self._sender = threading.Thread(target=self._send_forever, name="cache-invalidation-sender", daemon=True)
+        self._sender.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        for thread in (self._thread, self._sender):
+            if thread is not None:
+                thread.join(timeout=2)
+        self._thread = self._sender = None
+
+    def _broadcast(self, event: InvalidationEvent) -> None:
+        if self._sender is None:
+            return
+        try:
+            self._outgoing.put_nowait(event.to_json())
+        except queue.Full:
+            logger.warning("Invalidation dropped: %d broadcasts already waiting to be sent", self._outgoing.qsize())
+
+    def _send_forever(self) -> None:
+        # Whatever was published before stop() still goes out
+        while not self._stopping.is_set() or not self._outgoing.empty():
+            try:
+                payloads = [self._outgoing.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+            while len(payloads) < self.send_batch_size:
+                try:
+                    payloads.append(self._outgoing.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self.engine.begin() as connection:
+                    for payload in payloads:
+                        connection.execute(text("SELECT pg_notify(:channel, :payload)"),
+                                           {"channel": self.channel, "payload": payload})
+            except Exception:
+                logger.exception("Failed to broadcast %d invalidations", len(payloads))
+
+    def _listen_forever(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Invalidation listener lost its connection; reconnecting")
+                # Anything may have changed while disconnected
+                for entity in ENTITIES:
+                    self._dispatch(InvalidationEvent(entity=entity, origin="reconnect"))
+                self._stopping.wait(self.reconnect_delay)
+
+    def _listen(self) -> None:
+        import select
+        import psycopg2
+
+        # psycopg2 wants a plain libpq URL, without SQLAlchemy's "+driver" suffix
+        dsn = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = psycopg2.connect(dsn)
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while not self._stopping.is_set():
+                if select.select([connection], [], [], 1.0) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    self._receive(connection.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+
+def _default_socket_dir() -> str:
+    import hashlib
+    import tempfile
+
+    # Scope the directory to the database so unrelated deployments on one host stay apart
+    digest = hashlib.sha256(settings.DATABASE_URL.encode()).hexdigest()[:8]
+    return os.path.join(tempfile.gettempdir(), f"userservice-invalidation-{digest}")
+
+
+def build_invalidation_bus() -> InvalidationBus:
+    backend = settings.INVALIDATION_BACKEND
+    if backend == "auto":
+        backend = "postgres" if settings.DATABASE_URL.startswith("postgres") else "local"
+    if backend == "postgres":
+        from core.database import engine
+        return PostgresInvalidationBus(engine, channel=settings.INVALIDATION_CHANNEL)
+    if backend == "local":
+        return LocalInvalidationBus(settings.INVALIDATION_SOCKET_DIR or _default_socket_dir())
+    if backend == "memory":
+        return LocalInvalidationBus(None)
+    raise ValueError(f"Unknown INVALIDATION_BACKEND: {backend}")
+
+
+invalidation_bus = build_invalidation_bus()
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight call: the
+first caller (the leader) runs it, everyone arriving before it finishes
+awaits the same result. Nothing is cached afterwards - the next call after
+completion runs again - so this only collapses bursts such as parallel
+requests with one token or a thundering herd at cache expiry.
+
+Followers get a deep copy of the result so a caller mutating its domain
+object (e.g. login updating ``last_login``) cannot affect the others.
+"""
+import asyncio
+import copy
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .invalidation import USER, SERVICE, USER_ROLE, USER_SERVICE_ROLE, InvalidationEvent, invalidation_bus
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._in_flight.get(key)
+        while future is not None:
+            self.followers += 1
+            try:
+                # Shield so one follower being cancelled does not cancel the shared call
+                return copy.deepcopy(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # The leader was cancelled (e.g. client disconnect); take over or join the next flight
+            future = self._in_flight.get(key)
+
+        self.leaders += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve it so an unwaited future does not log "exception never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def forget(self, key: Hashable = None) -> None:
+        """Make later callers start a new flight instead of joining one that may predate a write"""
+        if key is None:
+            self._in_flight.clear()
+        else:
+            self._in_flight.pop(key, None)
+
+    def forget_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Like ``forget``, for every in-flight key matching ``predicate``"""
+        for key in [key for key in list(self._in_flight) if predicate(key)]:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._in_flight), "leaders": self.leaders, "followers": self.followers}
+
+
+# Shared groups for the repository read paths
+user_lookups = SingleFlight("user_lookups")
+catalog_lookups = SingleFlight("catalog_lookups")
+
+MAX_REMEMBERED_PRINCIPALS = 10000
+# Phone number -> user id of recently loaded principals. Assignment events are keyed
+# by user id, principal flights by phone number; this links the two.
+_principal_ids: "OrderedDict[str, str]" = OrderedDict()
+
+
+def remember_principal(phone_number: str, user_id: int) -> None:
+    _principal_ids[phone_number] = str(user_id)
+    _principal_ids.move_to_end(phone_number)
+    while len(_principal_ids) > MAX_REMEMBERED_PRINCIPALS:
+        _principal_ids.popitem(last=False)
+
+
+def _principal_of_users(user_ids) -> Callable[[Hashable], bool]:
+    def matches(key: Hashable) -> bool:
+        if key[0] != "principal":
+            return False
+        user_id = _principal_ids.get(key[1])
+        # A number not seen before may belong to one of these users
+        return user_id is None or user_id in user_ids
+    return matches
+
+
+def _on_invalidation(event: InvalidationEvent) -> None:
+    # Handlers may run on the bus listener thread; flights live on the event loop,
+    # but dict pops are atomic and only affect which flight later callers join
+    if event.entity == USER:
+        if event.keys:
+            for key in event.keys:
+                user_lookups.forget(("phone", key))
+                user_lookups.forget(("principal", key))
+        else:
+            user_lookups.forget()
+    elif event.entity == USER_SERVICE_ROLE:
+        # Principals carry the caller's roles; plain user lookups do not
+        if event.keys:
+            user_lookups.forget_where(_principal_of_users(frozenset(event.keys)))
+        else:
+            user_lookups.forget_where(lambda key: key[0] == "principal")
+    elif event.entity in (SERVICE, USER_ROLE):
+        catalog_lookups.forget()
+
+
+invalidation_bus.subscribe(_on_invalidation)
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Token introspection cache for service-to-service auth checks.
+
+A gateway asks about the same tokens over and over, so two in-process maps
+answer most checks without touching the database:
+
+    claims      token -> (subject phone number, expiry), kept until the token
+                expires; the signature is verified once per token
+    principals  phone number -> AuthPrincipal (or None for an unknown number),
+                kept for a TTL
+
+Principals are dropped through the invalidation bus when their user or role
+assignments change, so a deactivated user or a revoked role stops being
+accepted on every worker without waiting for the TTL. Both maps are LRU
+bounded. A generation counter keeps a lookup that started before an
+invalidation from re-inserting what it read.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.config import settings
+from domain.models.user_projections import AuthPrincipal
+from .invalidation import USER, USER_SERVICE_ROLE, InvalidationEvent, invalidation_bus
+
+Claims = Tuple[str, int]
+
+
+class TokenCache:
+    """In-process cache of verified token claims and caller principals"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._claims: "OrderedDict[str, Claims]" = OrderedDict()
+        # phone number -> (principal, or None when no such user, monotonic expiry)
+        self._principals: "OrderedDict[str, Tuple[Optional[AuthPrincipal], float]]" = OrderedDict()
+        # str(user id) -> phone number, so id-keyed invalidations and lookups find the entry
+        self._phones_by_id: Dict[str, str] = {}
+        # Invalidation handlers run on the bus listener thread
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        """Take before loading principals and pass to ``put_principals``"""
+        return self._generation
+
+    def get_claims(self, token: str) -> Optional[Claims]:
+        entry = self._claims.get(token)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            with self._lock:
+                self._claims.pop(token, None)
+            return None
+        return entry
+
+    def put_claims(self, token: str, claims: Claims) -> None:
+        with self._lock:
+            self._claims[token] = claims
+            while len(self._claims) > self.max_entries:
+                self._claims.popitem(last=False)
+
+    def get_principals(self, phone_numbers: Iterable[str]) -> Tuple[Dict[str, Optional[AuthPrincipal]], List[str]]:
+        """Cached principals by phone number, and the numbers that need loading"""
+        now = time.monotonic()
+        found: Dict[str, Optional[AuthPrincipal]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for phone_number in phone_numbers:
+                entry = self._principals.get(phone_number)
+                if entry is None or entry[1] <= now:
+                    missing.append(phone_number)
+                    continue
+                self._principals.move_to_end(phone_number)
+                found[phone_number] = entry[0]
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def get_principals_by_id(self, user_ids: Sequence[int]) -> Tuple[Dict[int, AuthPrincipal], List[int]]:
+        """Cached principals by user id, and the ids that need loading"""
+        phones = {user_id: self._phones_by_id.get(str(user_id)) for user_id in user_ids}
+        cached, _ = self.get_principals(phone for phone in phones.values() if phone is not None)
+        found: Dict[int, AuthPrincipal] = {}
+        missing: List[int] = []
+        for user_id, phone_number in phones.items():
+            principal = cached.get(phone_number) if phone_number is not None else None
+            if principal is not None and principal.id == user_id:
+                found[user_id] = principal
+            else:
+                missing.append(user_id)
+        return found, missing
+
+    def put_principals(self, generation: int, principals: Iterable[AuthPrincipal],
+                       unknown_phone_numbers: Iterable[str] = ()) -> None:
+        """Store loaded principals, and remember numbers that belong to no user"""
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if generation != self._generation:
+                # An invalidation landed while these were loading; they may predate it
+                return
+            for principal in principals:
+                self._principals[principal.phone_number] = (principal, expires_at)
+                self._principals.move_to_end(principal.phone_number)
+                self._phones_by_id[str(principal.id)] = principal.phone_number
+            for phone_number in unknown_phone_numbers:
+                self._principals[phone_number] = (None, expires_at)
+                self._principals.move_to_end(phone_number)
+            while len(self._principals) > self.max_entries:
+                _, (evicted, _) = self._principals.popitem(last=False)
+                if evicted is not None:
+                    self._phones_by_id.pop(str(evicted.id), None)
+
+    def forget(self, keys: Iterable[str] = ()) -> None:
+        """Drop principals by phone number or user id; no keys drops them all"""
+        keys = tuple(keys)
+        with self._lock:
+            self._generation += 1
+            if not keys:
+                self._principals.clear()
+                self._phones_by_id.clear()
+                return
+            for key in keys:
+                phone_number = self._phones_by_id.pop(key, None)
+                if phone_number is not None:
+                    self._principals.pop(phone_number, None)
+                entry = self._principals.pop(key, None)
+                if entry is not None and entry[0] is not None:
+                    self._phones_by_id.pop(str(entry[0].id), None)
+
+    def stats(self) -> dict:
+        return {
+            "claims": len(self._claims),
+            "principals": len(self._principals),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+token_cache = TokenCache(
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES
+)
+
+
+def _on_invalidation(event: InvalidationEvent) -> None:
+    # User events are keyed by id and phone number, assignment events by user id
+    if event.entity in (USER, USER_SERVICE_ROLE):
+        token_cache.forget(event.keys)
+
+
+invalidation_bus.subscribe(_on_invalidation)
\ No newline at end of file
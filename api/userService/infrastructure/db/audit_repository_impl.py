@@ -0,0 +1,90 @@
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert
+
+from domain.models.audit_event import AuditEvent
+from domain.repositories.audit_repository import AuditRepository
+from .models import AuditEventModel
+from .base_repository import BaseRepository
+
+
+class SQLAuditRepository(BaseRepository[AuditEvent, AuditEventModel], AuditRepository):
+    """SQL implementation of AuditRepository interface"""
+    
+    def __init__(self, db: Optional[Session] = None):
+        super().__init__(db)
+    
+    async def add_many(self, events: List[AuditEvent]) -> int:
+        """Append a batch of events with one multi-row INSERT"""
+        if not events:
+            return 0
+        try:
+            self.db.execute(insert(AuditEventModel), [
+                {
+                    'action': event.action,
+                    'outcome': event.outcome,
+                    'actor_user_id': event.actor_user_id,
+                    'subject_user_id': event.subject_user_id,
+                    'details': json.dumps(event.details, default=str) if event.details else None,
+                    'created_at': event.created_at
+                }
+                for event in events
+            ])
+            self._commit()
+        except Exception:
+            if self._unit_of_work is None:
+                self.db.rollback()
+            raise
+        return len(events)
+    
+    async def list_events(
+        self,
+        action: Optional[str] = None,
+        actor_user_id: Optional[int] = None,
+        subject_user_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[AuditEvent], Optional[int]]:
+        """Newest events first; returns the page and the id to continue before, or None"""
+        statement = select(AuditEventModel).order_by(AuditEventModel.id.desc()).limit(limit + 1)
+        if action is not None:
+            statement = statement.where(AuditEventModel.action == action)
+        if actor_user_id is not None:
+            statement = statement.where(AuditEventModel.actor_user_id == actor_user_id)
+        if subject_user_id is not None:
+            statement = statement.where(AuditEventModel.subject_user_id == subject_user_id)
+        if since is not None:
+            statement = statement.where(AuditEventModel.created_at >= since)
+        if before_id is not None:
+            statement = statement.where(AuditEventModel.id < before_id)
+        
+        db_events = self.db.execute(statement).scalars().all()
+        next_before_id = db_events[limit - 1].id if len(db_events) > limit else None
+        return [self._to_domain(db_event) for db_event in db_events[:limit]], next_before_id
+    
+    def _to_domain(self, db_event: AuditEventModel) -> AuditEvent:
+        """Convert database model to domain model"""
+        return AuditEvent(
+            id=db_event.id,
+            action=db_event.action,
+            outcome=db_event.outcome,
+            actor_user_id=db_event.actor_user_id,
+            subject_user_id=db_event.subject_user_id,
+            details=json.loads(db_event.details) if db_event.details else {},
+            created_at=db_event.created_at
+        )
+    
+    def _to_database(self, event: AuditEvent) -> AuditEventModel:
+        """Convert domain model to database model"""
+        return AuditEventModel(
+            id=event.id,
+            action=event.action,
+            outcome=event.outcome,
+            actor_user_id=event.actor_user_id,
+            subject_user_id=event.subject_user_id,
+            details=json.dumps(event.details, default=str) if event.details else None,
+            created_at=event.created_at
+        )
\ No newline at end of file
@@ -1,17 +1,32 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Optional, List
+from typing import TypeVar, Generic, Optional, List, Tuple, Callable, Hashable
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
 
+from core.session_context import current_session
+from infrastructure.cache.invalidation import invalidation_bus
+from infrastructure.cache.single_flight import SingleFlight
+
 # Generic types for domain and database models
 DomainModel = TypeVar('DomainModel')
 DatabaseModel = TypeVar('DatabaseModel')
+T = TypeVar('T')
+
+# Session.info key holding the active unit of work, if any
+UNIT_OF_WORK_KEY = "unit_of_work"
 
 
 class BaseRepository(Generic[DomainModel, DatabaseModel], ABC):
     """Abstract base repository class providing common database operations"""
     
-    def __init__(self, db: Session):
-        self.db = db
+    def __init__(self, db: Optional[Session] = None):
+        self._db = db
+    
+    @property
+    def db(self) -> Session:
+        """The session given at construction, else the current request's (shared instances)"""
+        return self._db if self._db is not None else current_session()
     
     @abstractmethod
     def _to_domain(self, db_model: DatabaseModel) -> DomainModel:
@@ -23,18 +38,66 @@ class BaseRepository(Generic[DomainModel, DatabaseModel], ABC):
         """Convert domain model to database model"""
         pass
     
+    @property
+    def _unit_of_work(self):
+        return self.db.info.get(UNIT_OF_WORK_KEY)
+    
+    async def _shared_read(self, flights: SingleFlight, key: Hashable, read: Callable[["BaseRepository"], T]) -> T:
+        """Run ``read``, sharing it with concurrent identical reads unless a unit of work is active.
+        
+        Shared reads run in a worker thread on a short-lived session of their own:
+        followers must not see rows flushed but not committed on the leader's
+        session, and a cancelled leader must not leave its thread on a session the
+        request then closes.
+        """
+        if self._unit_of_work is not None:
+            return read(self)
+        bind = self.db.get_bind()
+        
+        def read_apart() -> T:
+            with Session(bind, autoflush=False) as db:
+                return read(type(self)(db))
+        
+        return await flights.do(key, lambda: asyncio.to_thread(read_apart))
+    
+    def _commit(self) -> None:
+        """Commit, or only flush when a unit of work owns the transaction"""
+        if self._unit_of_work is not None:
+            self.db.flush()
+        else:
+            self.db.commit()
+    
     def _commit_and_refresh(self, db_model: DatabaseModel) -> DatabaseModel:
         """Common commit and refresh operation"""
         self.db.add(db_model)
-        self.db.commit()
+        self._commit()
         self.db.refresh(db_model)
         return db_model
     
     def _safe_commit(self) -> bool:
         """Safely commit changes with error handling"""
         try:
-            self.db.commit()
+            self._commit()
             return True
         except Exception:
-            self.db.rollback()
-            return False
\ No newline at end of file
+            # Inside a unit of work the failure propagates and the unit of work rolls back
+            if self._unit_of_work is None:
+                self.db.rollback()
+            return False
+    
+    def _invalidate(self, entity: str, *keys) -> None:
+        """Tell every worker's caches that a committed write touched these keys"""
+        unit_of_work = self._unit_of_work
+        if unit_of_work is not None:
+            # Nothing is visible to other workers until the unit of work commits
+            unit_of_work.defer_invalidation(entity, keys)
+        else:
+            invalidation_bus.publish(entity, *keys)
+    
+    @staticmethod
+    def _collection_version_columns(model) -> list:
+        """Aggregates that change whenever a row is inserted, updated or deleted"""
+        return [func.count(model.id), func.max(model.id), func.sum(model.row_version), func.max(model.updated_at)]
+    
+    def _collection_version(self, model, *criteria) -> Tuple:
+        return tuple(self.db.execute(select(*self._collection_version_columns(model)).where(*criteria)).one())
\ No newline at end of file
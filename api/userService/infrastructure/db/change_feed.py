@@ -0,0 +1,102 @@
+"""
+Change sequence numbers behind the incremental change feed (``/sync/changes``).
+
+Every ORM flush that inserts a user or user-service-role row, or changes one of
+their published fields, stamps the row's ``change_seq`` with the next number
+from ``change_sequence`` in the same transaction; deleting a row writes a
+tombstone with a number of its own. The counter row stays locked until the
+transaction ends, so numbers become visible in commit order: a consumer that
+has read up to N never later finds a smaller number committed behind it.
+Writes issued as Core statements bypass the ORM and must call
+``next_change_seq`` themselves (see ``SQLUserRepository.create_with_service_role``).
+
+Each database (the primary, or each shard) numbers its own rows.
+"""
+import logging
+
+from sqlalchemy import event, func, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from domain.models.change import USER, ASSIGNMENT
+from .models import ChangeSequenceModel, ChangeTombstoneModel, UserModel, UserServiceRoleModel
+from .outbox import USER_FIELDS, ASSIGNMENT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+SEQUENCE_KEY = "changes"
+
+_TRACKED = (
+    (UserModel, USER, USER_FIELDS),
+    (UserServiceRoleModel, ASSIGNMENT, ASSIGNMENT_FIELDS),
+)
+
+
+def _last_used(connection) -> int:
+    return max(
+        connection.execute(select(func.coalesce(func.max(column), 0))).scalar()
+        for column in (UserModel.change_seq, UserServiceRoleModel.change_seq, ChangeTombstoneModel.change_seq)
+    )
+
+
+def next_change_seq(connection, count: int = 1) -> int:
+    """Reserve ``count`` consecutive sequence numbers inside the caller's transaction; returns the first"""
+    table = ChangeSequenceModel.__table__
+    last = connection.execute(
+        update(table).where(table.c.key == SEQUENCE_KEY).values(value=table.c.value + count).returning(table.c.value)
+    ).scalar_one_or_none()
+    if last is None:
+        # A database ensure_change_feed has not seen yet
+        last = _last_used(connection) + count
+        connection.execute(insert(table).values(key=SEQUENCE_KEY, value=last))
+    return last - count + 1
+
+
+def _published_change(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_changes(session, flush_context, instances):
+    changed, deleted = [], []
+    for model, entity, fields in _TRACKED:
+        for obj in session.new:
+            if isinstance(obj, model):
+                changed.append(obj)
+        for obj in session.dirty:
+            if isinstance(obj, model) and _published_change(obj, fields):
+                changed.append(obj)
+        for obj in session.deleted:
+            if isinstance(obj, model):
+                deleted.append((entity, obj.id))
+    if not changed and not deleted:
+        return
+    seq = next_change_seq(session.connection(), len(changed) + len(deleted))
+    for obj in changed:
+        obj.change_seq = seq
+        seq += 1
+    if deleted:
+        session.connection().execute(insert(ChangeTombstoneModel), [
+            {"entity": entity, "entity_id": entity_id, "change_seq": seq + offset}
+            for offset, (entity, entity_id) in enumerate(deleted)
+        ])
+
+
+def ensure_change_feed(engine) -> None:
+    """Number the rows written before the feed existed and seed the counter on first start"""
+    table = ChangeSequenceModel.__table__
+    try:
+        with engine.begin() as connection:
+            if connection.execute(select(table.c.value).where(table.c.key == SEQUENCE_KEY)).first() is not None:
+                return
+            for model in (UserModel, UserServiceRoleModel):
+                # In id order, after anything already numbered
+                offset = _last_used(connection)
+                # Keep updated_at and row_version: numbering is not a change to the row
+                connection.execute(
+                    update(model).where(model.change_seq == 0)
+                    .values(change_seq=model.id + offset, updated_at=model.updated_at, row_version=model.row_version)
+                )
+            connection.execute(insert(table).values(key=SEQUENCE_KEY, value=_last_used(connection)))
+    except Exception:
+        logger.exception("Could not initialise the change sequence; /sync/changes may miss older rows")
\ No newline at end of file
@@ -3,11 +3,25 @@ from .otp_verification import OTPVerificationModel
 from .user_role import UserRoleModel
 from .service import ServiceModel
 from .user_service_role import UserServiceRoleModel
+from .stats_counter import StatsCounterModel
+from .audit_event import AuditEventModel
+from .user_directory import UserDirectoryModel, AssignmentDirectoryModel
+from .webhook import OutboxEventModel, WebhookEndpointModel, WebhookDeliveryModel
+from .change_feed import ChangeSequenceModel, ChangeTombstoneModel
 
 __all__ = [
     "UserModel", 
     "OTPVerificationModel",
     "UserRoleModel",
     "ServiceModel", 
-    "UserServiceRoleModel"
+    "UserServiceRoleModel",
+    "StatsCounterModel",
+    "AuditEventModel",
+    "UserDirectoryModel",
+    "AssignmentDirectoryModel",
+    "OutboxEventModel",
+    "WebhookEndpointModel",
+    "WebhookDeliveryModel",
+    "ChangeSequenceModel",
+    "ChangeTombstoneModel"
 ]
\ No newline at end of file
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class AuditEventModel(Base):
+    """Append-only audit trail, written in batches by the audit log writer"""
+    __tablename__ = "audit_events"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    action = Column(String, nullable=False)
+    outcome = Column(String, nullable=False)
+    actor_user_id = Column(Integer, nullable=True)
+    subject_user_id = Column(Integer, nullable=True)
+    details = Column(Text, nullable=True)  # JSON object
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    
+    # Queries filter on one of these and page backwards by id
+    __table_args__ = (
+        Index('ix_audit_events_action_id', 'action', 'id'),
+        Index('ix_audit_events_actor_id', 'actor_user_id', 'id'),
+        Index('ix_audit_events_subject_id', 'subject_user_id', 'id'),
+        Index('ix_audit_events_created_at', 'created_at'),
+    )
\ No newline at end of file
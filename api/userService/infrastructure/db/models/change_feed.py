@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class ChangeSequenceModel(Base):
+    """Last change sequence number handed out, one row per database.
+
+    Writers bump it in their own transaction, so its row lock orders the
+    sequence numbers of concurrent writes the same way their commits are ordered.
+    """
+    __tablename__ = "change_sequence"
+    
+    key = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+class ChangeTombstoneModel(Base):
+    """Deleted users and role assignments, so the change feed can report them"""
+    __tablename__ = "change_tombstones"
+    
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)  # "user" or "assignment"
+    entity_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class StatsCounterModel(Base):
+    """One row per dashboard counter, e.g. ``users.active`` or ``signups.2024-05-01``"""
+    __tablename__ = "stats_counters"
+    
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Text, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
@@ -23,7 +23,11 @@ class UserModel(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Bumped by every UPDATE (ORM or Core) so ETags change even within one timestamp tick
+    row_version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("row_version + 1"))
     last_login = Column(DateTime(timezone=True), nullable=True)
+    # Position in the change feed (/sync/changes): set from change_sequence whenever a published field changes
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0", index=True)
     
     # Relationships - One user can have multiple service roles (one per service)
     user_service_roles = relationship("UserServiceRoleModel", back_populates="user")
\ No newline at end of file
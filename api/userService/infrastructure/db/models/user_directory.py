@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class UserDirectoryModel(Base):
+    """Primary-database index of which shard holds each user; its id is the global user id"""
+    __tablename__ = "user_directory"
+    
+    id = Column(Integer, primary_key=True)
+    phone_number = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, unique=True, index=True, nullable=True)
+    shard = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class AssignmentDirectoryModel(Base):
+    """Global ids for user-service-role rows and the shard that holds each one"""
+    __tablename__ = "assignment_directory"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    shard = Column(Integer, nullable=False)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
@@ -15,6 +15,8 @@ class UserRoleModel(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Bumped by every UPDATE (ORM or Core) so ETags change even within one timestamp tick
+    row_version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("row_version + 1"))
     
     # Relationships
     user_service_roles = relationship("UserServiceRoleModel", back_populates="role")
\ No newline at end of file
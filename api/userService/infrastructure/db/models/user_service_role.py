@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Boolean, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, Boolean, DateTime, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
@@ -16,9 +16,17 @@ class UserServiceRoleModel(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Bumped by every UPDATE (ORM or Core) so ETags change even within one timestamp tick
+    row_version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("row_version + 1"))
+    # Position in the change feed, as on users
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0", index=True)
     
     # Unique constraint: one role per user per service
-    __table_args__ = (UniqueConstraint('user_id', 'service_id', name='uq_user_service'),)
+    # Listing index: filter on service/role/active, then walk by id for keyset pagination
+    __table_args__ = (
+        UniqueConstraint('user_id', 'service_id', name='uq_user_service'),
+        Index('ix_user_service_roles_service_role_active', 'service_id', 'role_id', 'is_active', 'id'),
+    )
     
     # Relationships
     user = relationship("UserModel", back_populates="user_service_roles")
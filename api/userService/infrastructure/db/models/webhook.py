@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class OutboxEventModel(Base):
+    """User and role change events, written in the transaction that made the change.
+
+    Every database holding users (the primary, or each shard) has its own outbox;
+    the webhook dispatcher relays rows into ``webhook_deliveries`` and stamps ``relayed_at``.
+    """
+    __tablename__ = "outbox_events"
+    
+    id = Column(Integer, primary_key=True)
+    event_id = Column(String(32), unique=True, nullable=False)  # uuid4 hex, unique across shards
+    event_type = Column(String, nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON object
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    relayed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # The relay walks unrelayed rows by id
+    __table_args__ = (
+        Index('ix_outbox_events_relayed_at_id', 'relayed_at', 'id'),
+    )
+
+
+class WebhookEndpointModel(Base):
+    __tablename__ = "webhook_endpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, nullable=False)
+    secret = Column(String, nullable=False)
+    event_types = Column(Text, nullable=True)  # JSON list; NULL = every event type
+    is_active = Column(Boolean, nullable=False, default=True)
+    max_concurrency = Column(Integer, nullable=False, default=1)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class WebhookDeliveryModel(Base):
+    """One event owed to one endpoint, retried until delivered or out of attempts"""
+    __tablename__ = "webhook_deliveries"
+    
+    id = Column(Integer, primary_key=True)
+    endpoint_id = Column(Integer, ForeignKey("webhook_endpoints.id", ondelete="CASCADE"), nullable=False)
+    event_id = Column(String(32), nullable=False)
+    event_type = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(Text, nullable=True)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Relaying the same event twice must not deliver it twice; the dispatcher claims due
+    # deliveries per endpoint
+    __table_args__ = (
+        UniqueConstraint('endpoint_id', 'event_id', name='uq_webhook_delivery_event'),
+        Index('ix_webhook_deliveries_due', 'endpoint_id', 'status', 'next_attempt_at', 'id'),
+    )
\ No newline at end of file
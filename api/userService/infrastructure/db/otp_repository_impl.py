@@ -12,7 +12,7 @@ from .base_repository import BaseRepository
 class SQLOTPRepository(BaseRepository[OTPVerification, OTPVerificationModel], OTPRepository):
     """SQL implementation of OTPRepository interface"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         super().__init__(db)
 
     async def create(self, otp: OTPVerification) -> OTPVerification:
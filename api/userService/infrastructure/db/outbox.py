@@ -0,0 +1,147 @@
+"""
+Transactional outbox of user and role change events (``outbox_events``).
+
+Every ORM flush turns the user and user-service-role rows it inserts, updates
+or deletes into change events and inserts them in the same transaction, the
+way ``stats_summary`` maintains its counters: an event exists exactly when its
+change committed. Writes issued as Core statements bypass the ORM and must call
+``record_events`` themselves (see ``SQLUserRepository.create_with_service_role``).
+Updates that touch none of the published fields (password hashes, last_login,
+MFA secrets) produce no event.
+
+Event payloads hold the row's published fields after the change (before it for
+deletes) plus ``previous`` values of the fields that changed. The webhook
+dispatcher relays committed events to the registered endpoints.
+"""
+import json
+import uuid
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from domain.models.webhook import (
+    USER_CREATED, USER_UPDATED, USER_DEACTIVATED, USER_DELETED, ROLE_ASSIGNED, ROLE_CHANGED, ROLE_REVOKED
+)
+from .models import OutboxEventModel, UserModel, UserServiceRoleModel
+from .stats_summary import flush_states
+
+# Session.info keys: events collected between before_flush and after_flush, and whether the
+# current transaction wrote any (so commit listeners only run when there is something to relay)
+PENDING_EVENTS_KEY = "outbox_pending_events"
+WROTE_EVENTS_KEY = "outbox_wrote_events"
+
+USER_FIELDS = ("phone_number", "full_name", "email", "is_active", "is_verified", "mfa_enabled")
+ASSIGNMENT_FIELDS = ("user_id", "service_id", "role_id", "is_active")
+
+# (event type, aggregate id, payload)
+ChangeEvent = Tuple[str, int, dict]
+
+_commit_listeners: List[Callable[[], None]] = []
+
+
+def on_commit(listener: Callable[[], None]) -> None:
+    """Call ``listener`` after every commit that wrote outbox events (from the committing thread)"""
+    _commit_listeners.append(listener)
+
+
+def _payload(before: Optional[dict], after: Optional[dict]) -> dict:
+    payload = dict(after if after is not None else before)
+    if before is not None and after is not None:
+        payload["previous"] = {key: before[key] for key in after if before[key] != after[key]}
+    return payload
+
+
+def user_event_type(before: Optional[dict], after: Optional[dict]) -> Optional[str]:
+    if before is None:
+        return USER_CREATED
+    if after is None:
+        return USER_DELETED
+    if before["is_active"] and not after["is_active"]:
+        return USER_DEACTIVATED
+    return USER_UPDATED if before != after else None
+
+
+def assignment_event_type(before: Optional[dict], after: Optional[dict]) -> Optional[str]:
+    was_active = before is not None and bool(before["is_active"])
+    is_active = after is not None and bool(after["is_active"])
+    if is_active and not was_active:
+        return ROLE_ASSIGNED
+    if was_active and not is_active:
+        return ROLE_REVOKED
+    if was_active and before != after:
+        return ROLE_CHANGED
+    # Inactive before and after: nothing a mirror of active roles needs to know
+    return None
+
+
+def record_events(session: Session, events: Iterable[ChangeEvent]) -> int:
+    """Insert change events inside the session's current transaction"""
+    rows = [
+        {
+            "event_id": uuid.uuid4().hex,
+            "event_type": event_type,
+            "aggregate_id": aggregate_id,
+            "payload": json.dumps(payload, separators=(",", ":"), default=str),
+        }
+        for event_type, aggregate_id, payload in events
+    ]
+    if rows:
+        session.connection().execute(insert(OutboxEventModel), rows)
+        session.info[WROTE_EVENTS_KEY] = True
+    return len(rows)
+
+
+_TRACKED = (
+    (UserModel, USER_FIELDS, user_event_type),
+    (UserServiceRoleModel, ASSIGNMENT_FIELDS, assignment_event_type),
+)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_events(session, flush_context, instances):
+    if not settings.WEBHOOKS_ENABLED:
+        return
+    pending = session.info.setdefault(PENDING_EVENTS_KEY, [])
+    for model, fields, classify in _TRACKED:
+        for obj in session.new:
+            if isinstance(obj, model):
+                pending.append((obj, fields, classify, None, flush_states(session, obj, model, fields)[1]))
+        for obj in session.dirty:
+            if isinstance(obj, model) and session.is_modified(obj):
+                pending.append((obj, fields, classify, *flush_states(session, obj, model, fields)))
+        for obj in session.deleted:
+            if isinstance(obj, model):
+                pending.append((obj, fields, classify, flush_states(session, obj, model, fields)[0], None))
+
+
+@event.listens_for(Session, "after_flush")
+def _write_collected_events(session, flush_context):
+    pending = session.info.pop(PENDING_EVENTS_KEY, None)
+    if not pending:
+        return
+    events = []
+    for obj, fields, classify, before, after in pending:
+        if after is not None:
+            # Values only known once flushed (defaults, foreign keys set through relationships)
+            for field in fields:
+                if after[field] is None:
+                    after[field] = obj.__dict__.get(field)
+        event_type = classify(before, after)
+        if event_type is not None:
+            events.append((event_type, obj.id, {"id": obj.id, **_payload(before, after)}))
+    record_events(session, events)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_commit_listeners(session):
+    if session.info.pop(WROTE_EVENTS_KEY, False):
+        for listener in _commit_listeners:
+            listener()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_collected_events(session, previous_transaction):
+    session.info.pop(PENDING_EVENTS_KEY, None)
+    session.info.pop(WROTE_EVENTS_KEY, None)
\ No newline at end of file
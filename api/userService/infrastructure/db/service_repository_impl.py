@@ -1,19 +1,22 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete
 from domain.models.service import Service
 from domain.repositories.service_repository import ServiceRepository
 from infrastructure.db.models.service import ServiceModel
 from .base_repository import BaseRepository
+from infrastructure.cache.invalidation import SERVICE
+from infrastructure.cache.single_flight import catalog_lookups
 
 
 class ServiceRepositoryImpl(BaseRepository[Service, ServiceModel], ServiceRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         super().__init__(db)
     
     async def create(self, service: Service) -> Service:
         db_service = self._to_database(service)
         db_service = self._commit_and_refresh(db_service)
+        self._invalidate(SERVICE, db_service.id, db_service.name)
         return self._to_domain(db_service)
     
     async def get_by_id(self, service_id: int) -> Optional[Service]:
@@ -25,6 +28,10 @@ class ServiceRepositoryImpl(BaseRepository[Service, ServiceModel], ServiceReposi
         return self._to_domain(db_service) if db_service else None
     
     async def get_all(self, active_only: bool = True) -> List[Service]:
+        # Concurrent catalog reads (e.g. a cold admin UI) share a single query
+        return await self._shared_read(catalog_lookups, ("services", active_only), lambda repo: repo._get_all(active_only))
+    
+    def _get_all(self, active_only: bool) -> List[Service]:
         query = self.db.query(ServiceModel)
         if active_only:
             query = query.filter(ServiceModel.is_active == True)
@@ -34,20 +41,28 @@ class ServiceRepositoryImpl(BaseRepository[Service, ServiceModel], ServiceReposi
     async def update(self, service: Service) -> Service:
         db_service = self.db.query(ServiceModel).filter(ServiceModel.id == service.id).first()
         if db_service:
+            previous_name = db_service.name
             db_service.name = service.name
             db_service.description = service.description
             db_service.is_active = service.is_active
             if self._safe_commit():
+                self._invalidate(SERVICE, service.id, previous_name, service.name)
                 return self._to_domain(db_service)
         raise ValueError("Service not found or update failed")
     
     async def delete(self, service_id: int) -> bool:
         db_service = self.db.query(ServiceModel).filter(ServiceModel.id == service_id).first()
         if db_service:
+            name = db_service.name
             self.db.delete(db_service)
-            return self._safe_commit()
+            if self._safe_commit():
+                self._invalidate(SERVICE, service_id, name)
+                return True
         return False
     
+    async def get_collection_version(self) -> Tuple:
+        return self._collection_version(ServiceModel)
+    
     def _to_domain(self, db_service: ServiceModel) -> Service:
         """Convert database model to domain model"""
         return Service(
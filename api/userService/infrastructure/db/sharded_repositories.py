@@ -0,0 +1,648 @@
+"""
+Shard-aware repositories, used when ``SHARD_DATABASE_URLS`` is configured.
+
+Users, their OTPs and their role assignments live on the shard chosen by
+``core.sharding``; the primary database (``DATABASE_URL``) keeps the catalog
+(services, roles), the user and assignment directories that hand out global
+ids, and everything else (audit, idempotency). Stats counters are kept by
+each shard for its own users and summed on read. Each shard holds a
+read-only replica of the catalog so role assignments can still be joined
+locally; ``sync_catalog`` refreshes it on start-up and after catalog writes.
+
+Per-user operations touch one shard. Listings without a user filter are
+scatter-gathered across shards in parallel and merged by id.
+"""
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import replace
+from datetime import date, datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.database import engine as primary_engine
+from core.session_context import current_session, current_shard_sessions, session_scope
+from core.sharding import ShardRouter, ShardSessions, shard_router
+from domain.models.user import User, OTPVerification
+from domain.models.user_projections import AuthPrincipal, UserProfile, CredentialRecord
+from domain.models.user_service_role import UserServiceRole
+from domain.repositories.user_repository import UserRepository, OTPRepository
+from domain.repositories.user_service_role_repository import UserServiceRoleRepository
+from domain.repositories.change_feed_repository import ChangeFeedRepository
+from domain.repositories.stats_repository import StatsRepository
+from domain.models.change import ChangePage
+from domain.models.stats_summary import StatsSummary
+from infrastructure.cache.invalidation import SERVICE, USER_ROLE, InvalidationEvent, invalidation_bus
+from .models import ServiceModel, UserModel, UserRoleModel, UserDirectoryModel, AssignmentDirectoryModel
+from .otp_repository_impl import SQLOTPRepository
+from .base_repository import UNIT_OF_WORK_KEY
+from .unit_of_work import SQLUnitOfWork
+from .user_repository_impl import SQLUserRepository
+from .user_role_repository_impl import UserRoleRepositoryImpl
+from .service_repository_impl import ServiceRepositoryImpl
+from .user_service_role_repository_impl import UserServiceRoleRepositoryImpl
+from .change_feed_repository_impl import read_changes
+from .stats_repository_impl import read_counters, rebuild_counters, to_summary
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _ShardedRepository:
+    """Sessions given at construction, else the current request's (shared instances)"""
+
+    def __init__(self, shards: Optional[ShardSessions] = None, directory_db: Optional[Session] = None):
+        self._shards = shards
+        self._directory_db = directory_db
+
+    @property
+    def shards(self) -> ShardSessions:
+        return self._shards if self._shards is not None else current_shard_sessions()
+
+    @property
+    def directory_db(self) -> Session:
+        return self._directory_db if self._directory_db is not None else current_session()
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.shards.router)
+
+    async def _scatter(self, make_repo: Callable[[Session], R], call: Callable[[R], Awaitable[T]]) -> List[T]:
+        """Run ``call`` against every shard concurrently, one worker thread per shard"""
+        repos = [make_repo(self.shards.get(shard)) for shard in range(self.shard_count)]
+        return list(await asyncio.gather(*(asyncio.to_thread(asyncio.run, call(repo)) for repo in repos)))
+
+    def shard_of_user(self, user_id: int) -> Optional[int]:
+        return self.directory_db.execute(
+            select(UserDirectoryModel.shard).where(UserDirectoryModel.id == user_id)
+        ).scalar_one_or_none()
+
+    def _directory_write(self, statement) -> None:
+        try:
+            self.directory_db.execute(statement)
+            self.directory_db.commit()
+        except IntegrityError as e:
+            self.directory_db.rollback()
+            raise ValueError(SQLUserRepository._integrity_error_message(e, 0)) from e
+        except Exception:
+            self.directory_db.rollback()
+            raise
+
+    def _unit_of_work_on(self, shard: int) -> Optional["ShardedUnitOfWork"]:
+        return self.shards.get(shard).info.get(UNIT_OF_WORK_KEY)
+
+    def _reserved(self, shard: int, undo) -> None:
+        """Record a reservation made for a write on ``shard``; ``undo`` runs if its unit of work rolls back"""
+        unit_of_work = self._unit_of_work_on(shard)
+        if unit_of_work is not None:
+            unit_of_work.undo_on_rollback(undo)
+
+    def _release(self, shard: int, statement) -> None:
+        """Free directory entries after a delete on ``shard``; inside a unit of work, once it commits"""
+        unit_of_work = self._unit_of_work_on(shard)
+        if unit_of_work is not None:
+            unit_of_work.after_commit(statement)
+        else:
+            self._directory_write(statement)
+
+    def _allocate_assignment_id(self, user_id: int, shard: int) -> int:
+        assignment_id = self.directory_db.execute(
+            insert(AssignmentDirectoryModel).values(user_id=user_id, shard=shard)
+            .returning(AssignmentDirectoryModel.id)
+        ).scalar_one()
+        self.directory_db.commit()
+        return assignment_id
+
+    def _release_assignment_id(self, assignment_id: int) -> None:
+        self._directory_write(delete(AssignmentDirectoryModel).where(AssignmentDirectoryModel.id == assignment_id))
+
+
+class ShardedUserRepository(_ShardedRepository, UserRepository):
+    """Routes by the directory (ids, emails) or the phone hash; lists by scatter-gather"""
+
+    def __init__(self, directory_db: Optional[Session] = None, shards: Optional[ShardSessions] = None):
+        super().__init__(shards, directory_db)
+
+    def _repo(self, shard: int) -> SQLUserRepository:
+        return SQLUserRepository(self.shards.get(shard))
+
+    def _allocate_user(self, user: User, shard: int) -> int:
+        try:
+            user_id = self.directory_db.execute(
+                insert(UserDirectoryModel)
+                .values(phone_number=user.phone_number, email=user.email, shard=shard)
+                .returning(UserDirectoryModel.id)
+            ).scalar_one()
+            self.directory_db.commit()
+        except IntegrityError as e:
+            self.directory_db.rollback()
+            raise ValueError(SQLUserRepository._integrity_error_message(e, 0)) from e
+        return user_id
+
+    def _release_user(self, user_id: int) -> None:
+        self._directory_write(delete(UserDirectoryModel).where(UserDirectoryModel.id == user_id))
+
+    async def create(self, user: User) -> User:
+        shard = self.shards.router.shard_for_phone(user.phone_number)
+        user_id = self._allocate_user(user, shard)
+        try:
+            created = await self._repo(shard).create(replace(user, id=user_id))
+        except Exception:
+            self._release_user(user_id)
+            raise
+        self._reserved(shard, delete(UserDirectoryModel).where(UserDirectoryModel.id == user_id))
+        return created
+
+    async def create_with_service_role(self, user: User, service_id: int, role_id: int) -> dict:
+        shard = self.shards.router.shard_for_phone(user.phone_number)
+        user_id = self._allocate_user(user, shard)
+        assignment_id = None
+        try:
+            assignment_id = self._allocate_assignment_id(user_id, shard)
+            created = await self._repo(shard).create_with_service_role(
+                replace(user, id=user_id), service_id, role_id, assignment_id=assignment_id
+            )
+        except Exception:
+            # Release the reservations so the phone number and email can be registered again
+            if assignment_id is not None:
+                self._release_assignment_id(assignment_id)
+            self._release_user(user_id)
+            raise
+        self._reserved(shard, delete(AssignmentDirectoryModel).where(AssignmentDirectoryModel.id == assignment_id))
+        self._reserved(shard, delete(UserDirectoryModel).where(UserDirectoryModel.id == user_id))
+        return created
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        shard = self.shard_of_user(user_id)
+        return await self._repo(shard).get_by_id(user_id) if shard is not None else None
+
+    async def get_by_id_with_roles(self, user_id: int) -> Optional[UserModel]:
+        shard = self.shard_of_user(user_id)
+        return await self._repo(shard).get_by_id_with_roles(user_id) if shard is not None else None
+
+    async def get_by_phone_number_with_roles(self, phone_number: str) -> Optional[UserModel]:
+        user = await self.get_by_phone_number(phone_number)
+        return await self.get_by_id_with_roles(user.id) if user is not None else None
+
+    def db_user_to_response_dict(self, db_user: UserModel) -> dict:
+        return SQLUserRepository.db_user_to_response_dict(self, db_user)
+
+    async def _by_phone(self, phone_number: str, call: Callable[[SQLUserRepository], Awaitable[T]]) -> Optional[T]:
+        # Hot path (every authenticated request): one query on the hashed shard
+        placement = self.shards.router.shard_for_phone(phone_number)
+        result = await call(self._repo(placement))
+        if result is not None:
+            return result
+        # Users who changed number stay on the shard of their original one
+        shard = self.directory_db.execute(
+            select(UserDirectoryModel.shard).where(UserDirectoryModel.phone_number == phone_number)
+        ).scalar_one_or_none()
+        if shard is None or shard == placement:
+            return None
+        return await call(self._repo(shard))
+
+    async def get_by_phone_number(self, phone_number: str) -> Optional[User]:
+        return await self._by_phone(phone_number, lambda repo: repo.get_by_phone_number(phone_number))
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        shard = self.directory_db.execute(
+            select(UserDirectoryModel.shard).where(UserDirectoryModel.email == email)
+        ).scalar_one_or_none()
+        return await self._repo(shard).get_by_email(email) if shard is not None else None
+
+    async def update(self, user: User) -> User:
+        entry = self.directory_db.execute(
+            select(UserDirectoryModel.shard, UserDirectoryModel.phone_number, UserDirectoryModel.email)
+            .where(UserDirectoryModel.id == user.id)
+        ).one_or_none()
+        if entry is None:
+            raise ValueError(f"User with id {user.id} not found")
+        keys_changed = (entry.phone_number, entry.email) != (user.phone_number, user.email)
+        if keys_changed:
+            # Reserve the new phone/email first so uniqueness holds across shards
+            self._directory_write(
+                update(UserDirectoryModel).where(UserDirectoryModel.id == user.id)
+                .values(phone_number=user.phone_number, email=user.email)
+            )
+        restore = (
+            update(UserDirectoryModel).where(UserDirectoryModel.id == user.id)
+            .values(phone_number=entry.phone_number, email=entry.email)
+        )
+        try:
+            updated = await self._repo(entry.shard).update(user)
+        except Exception:
+            if keys_changed:
+                self._directory_write(restore)
+            raise
+        if keys_changed:
+            self._reserved(entry.shard, restore)
+        return updated
+
+    async def delete(self, user_id: int) -> bool:
+        shard = self.shard_of_user(user_id)
+        if shard is None or not await self._repo(shard).delete(user_id):
+            return False
+        self._release(shard, delete(AssignmentDirectoryModel).where(AssignmentDirectoryModel.user_id == user_id))
+        self._release(shard, delete(UserDirectoryModel).where(UserDirectoryModel.id == user_id))
+        return True
+
+    async def list_all(self) -> List[User]:
+        results = await self._scatter(SQLUserRepository, lambda repo: repo.list_all())
+        return sorted(itertools.chain.from_iterable(results), key=lambda user: user.id)
+
+    async def get_profile_version(self, user_id: int) -> Tuple:
+        shard = self.shard_of_user(user_id)
+        if shard is None:
+            return (None,)
+        return await self._repo(shard).get_profile_version(user_id)
+
+    async def search(self, query: str, fuzzy: bool = False, limit: int = 20, offset: int = 0) -> Tuple[List[User], bool]:
+        # Relevance scores are per shard, so merged results are ordered by id
+        results = await self._scatter(SQLUserRepository, lambda repo: repo.search(query, fuzzy, offset + limit, 0))
+        users = sorted(itertools.chain.from_iterable(page for page, _ in results), key=lambda user: user.id)
+        has_more = len(users) > offset + limit or any(more for _, more in results)
+        return users[offset:offset + limit], has_more
+
+    async def update_password_hash(self, user_id: int, expected_hash: str, new_hash: str) -> bool:
+        shard = self.shard_of_user(user_id)
+        if shard is None:
+            return False
+        return await self._repo(shard).update_password_hash(user_id, expected_hash, new_hash)
+
+    def count_password_hashes(self, parameters: Callable[[str], str]) -> List[Tuple[str, int, str]]:
+        groups: Dict[str, Tuple[str, int, str]] = {}
+        for shard in range(self.shard_count):
+            for key, count, sample in self._repo(shard).count_password_hashes(parameters):
+                previous = groups.get(key)
+                groups[key] = (key, count + (previous[1] if previous else 0), previous[2] if previous else sample)
+        return list(groups.values())
+
+    async def get_auth_principal(self, phone_number: str) -> Optional[AuthPrincipal]:
+        return await self._by_phone(phone_number, lambda repo: repo.get_auth_principal(phone_number))
+
+    async def get_auth_principals(self, phone_numbers: Sequence[str] = (), user_ids: Sequence[int] = ()) -> List[AuthPrincipal]:
+        ids_by_shard = self._ids_by_shard(phone_numbers, user_ids)
+        return await self._gather_by_id(ids_by_shard, lambda repo, ids: repo.get_auth_principals(user_ids=ids))
+
+    async def get_profile(self, user_id: int) -> Optional[UserProfile]:
+        shard = self.shard_of_user(user_id)
+        return await self._repo(shard).get_profile(user_id) if shard is not None else None
+
+    async def get_profiles(self, user_ids: Sequence[int]) -> List[UserProfile]:
+        ids_by_shard = self._ids_by_shard(user_ids=user_ids)
+        return await self._gather_by_id(ids_by_shard, lambda repo, ids: repo.get_profiles(ids))
+
+    def _ids_by_shard(self, phone_numbers: Sequence[str] = (), user_ids: Sequence[int] = ()) -> Dict[int, List[int]]:
+        """Resolve a batch of phone numbers and ids to user ids per shard with one directory query"""
+        criteria = []
+        if phone_numbers:
+            criteria.append(UserDirectoryModel.phone_number.in_(phone_numbers))
+        if user_ids:
+            criteria.append(UserDirectoryModel.id.in_(user_ids))
+        if not criteria:
+            return {}
+        ids_by_shard: Dict[int, List[int]] = {}
+        for row in self.directory_db.execute(
+            select(UserDirectoryModel.id, UserDirectoryModel.shard).where(or_(*criteria))
+        ):
+            ids_by_shard.setdefault(row.shard, []).append(row.id)
+        return ids_by_shard
+
+    async def _gather_by_id(self, ids_by_shard: Dict[int, List[int]],
+                            call: Callable[[SQLUserRepository, List[int]], Awaitable[List[T]]]) -> List[T]:
+        """Run ``call`` on each involved shard concurrently and merge the results by id"""
+        if len(ids_by_shard) == 1:
+            (shard, ids), = ids_by_shard.items()
+            return await call(self._repo(shard), ids)
+        results = await asyncio.gather(*(
+            asyncio.to_thread(asyncio.run, call(self._repo(shard), ids)) for shard, ids in ids_by_shard.items()
+        ))
+        return sorted(itertools.chain.from_iterable(results), key=lambda item: item.id)
+
+    async def get_credentials(self, phone_number: str) -> Optional[CredentialRecord]:
+        return await self._by_phone(phone_number, lambda repo: repo.get_credentials(phone_number))
+
+    async def record_login(self, user_id: int, last_login: datetime) -> Optional[UserProfile]:
+        shard = self.shard_of_user(user_id)
+        return await self._repo(shard).record_login(user_id, last_login) if shard is not None else None
+
+
+class ShardedOTPRepository(_ShardedRepository, OTPRepository):
+    """OTPs are keyed by phone number and live on that number's hashed shard"""
+
+    def __init__(self, shards: Optional[ShardSessions] = None):
+        super().__init__(shards)
+
+    @property
+    def _otp_shards(self) -> Dict[int, int]:
+        # OTP ids are per shard; remember where the OTPs handed out during this request live
+        return self.shards.info.setdefault("otp_shards", {})
+
+    def _repo(self, shard: int) -> SQLOTPRepository:
+        return SQLOTPRepository(self.shards.get(shard))
+
+    async def create(self, otp: OTPVerification) -> OTPVerification:
+        shard = self.shards.router.shard_for_phone(otp.phone_number)
+        created = await self._repo(shard).create(otp)
+        self._otp_shards[created.id] = shard
+        return created
+
+    async def get_by_phone_and_purpose(self, phone_number: str, purpose: str) -> Optional[OTPVerification]:
+        shard = self.shards.router.shard_for_phone(phone_number)
+        otp = await self._repo(shard).get_by_phone_and_purpose(phone_number, purpose)
+        if otp is not None:
+            self._otp_shards[otp.id] = shard
+        return otp
+
+    async def mark_as_used(self, otp_id: int) -> bool:
+        shard = self._otp_shards.get(otp_id)
+        if shard is None:
+            # The id alone is ambiguous across shards
+            return False
+        return await self._repo(shard).mark_as_used(otp_id)
+
+    async def cleanup_expired(self) -> int:
+        return sum(await self._scatter(SQLOTPRepository, lambda repo: repo.cleanup_expired()))
+
+
+class ShardedUserServiceRoleRepository(_ShardedRepository, UserServiceRoleRepository):
+    """Assignments live with their user; their global ids come from the assignment directory"""
+
+    def __init__(self, directory_db: Optional[Session] = None, shards: Optional[ShardSessions] = None):
+        super().__init__(shards, directory_db)
+
+    def _repo(self, shard: int) -> UserServiceRoleRepositoryImpl:
+        return UserServiceRoleRepositoryImpl(self.shards.get(shard))
+
+    def _assignment_shard(self, id: int) -> Optional[int]:
+        return self.directory_db.execute(
+            select(AssignmentDirectoryModel.shard).where(AssignmentDirectoryModel.id == id)
+        ).scalar_one_or_none()
+
+    async def create(self, user_service_role: UserServiceRole) -> UserServiceRole:
+        shard = self.shard_of_user(user_service_role.user_id)
+        if shard is None:
+            raise ValueError("User not found")
+        assignment_id = self._allocate_assignment_id(user_service_role.user_id, shard)
+        try:
+            created = await self._repo(shard).create(replace(user_service_role, id=assignment_id))
+        except Exception:
+            self._release_assignment_id(assignment_id)
+            raise
+        self._reserved(shard, delete(AssignmentDirectoryModel).where(AssignmentDirectoryModel.id == assignment_id))
+        return created
+
+    async def get_by_id(self, id: int) -> Optional[UserServiceRole]:
+        shard = self._assignment_shard(id)
+        return await self._repo(shard).get_by_id(id) if shard is not None else None
+
+    async def get_user_roles_in_service(self, user_id: int, service_id: int) -> List[UserServiceRole]:
+        shard = self.shard_of_user(user_id)
+        return await self._repo(shard).get_user_roles_in_service(user_id, service_id) if shard is not None else []
+
+    async def get_user_services(self, user_id: int, active_only: bool = True) -> List[UserServiceRole]:
+        shard = self.shard_of_user(user_id)
+        return await self._repo(shard).get_user_services(user_id, active_only) if shard is not None else []
+
+    async def get_service_users(self, service_id: int, role_id: Optional[int] = None, active_only: bool = True) -> List[UserServiceRole]:
+        results = await self._scatter(
+            UserServiceRoleRepositoryImpl, lambda repo: repo.get_service_users(service_id, role_id, active_only)
+        )
+        return sorted(itertools.chain.from_iterable(results), key=lambda usr: usr.id)
+
+    async def user_has_role_in_service(self, user_id: int, service_id: int, role_id: int) -> bool:
+        shard = self.shard_of_user(user_id)
+        return shard is not None and await self._repo(shard).user_has_role_in_service(user_id, service_id, role_id)
+
+    async def get_user_role_in_service(self, user_id: int, service_id: int) -> Optional[UserServiceRole]:
+        shard = self.shard_of_user(user_id)
+        return await self._repo(shard).get_user_role_in_service(user_id, service_id) if shard is not None else None
+
+    async def update_user_role_in_service(self, user_id: int, service_id: int, new_role_id: int) -> UserServiceRole:
+        shard = self.shard_of_user(user_id)
+        if shard is None:
+            raise ValueError("User service role not found or update failed")
+        return await self._repo(shard).update_user_role_in_service(user_id, service_id, new_role_id)
+
+    async def update(self, user_service_role: UserServiceRole) -> UserServiceRole:
+        shard = self._assignment_shard(user_service_role.id)
+        if shard is None:
+            raise ValueError("User service role not found or update failed")
+        if self.shard_of_user(user_service_role.user_id) != shard:
+            raise ValueError("Assignments cannot be moved to a user on another shard")
+        previous_user_id = self.directory_db.execute(
+            select(AssignmentDirectoryModel.user_id).where(AssignmentDirectoryModel.id == user_service_role.id)
+        ).scalar_one()
+        updated = await self._repo(shard).update(user_service_role)
+        if updated.user_id != previous_user_id:
+            self._directory_write(
+                update(AssignmentDirectoryModel).where(AssignmentDirectoryModel.id == updated.id)
+                .values(user_id=updated.user_id)
+            )
+            self._reserved(shard, (
+                update(AssignmentDirectoryModel).where(AssignmentDirectoryModel.id == updated.id)
+                .values(user_id=previous_user_id)
+            ))
+        return updated
+
+    async def delete(self, id: int) -> bool:
+        shard = self._assignment_shard(id)
+        if shard is None or not await self._repo(shard).delete(id):
+            return False
+        self._release(shard, delete(AssignmentDirectoryModel).where(AssignmentDirectoryModel.id == id))
+        return True
+
+    async def deactivate_user_service_role(self, user_id: int, service_id: int) -> bool:
+        shard = self.shard_of_user(user_id)
+        return shard is not None and await self._repo(shard).deactivate_user_service_role(user_id, service_id)
+
+    async def get_collection_version(self, user_id: Optional[int] = None, service_id: Optional[int] = None) -> Tuple:
+        if user_id:
+            shard = self.shard_of_user(user_id)
+            if shard is None:
+                return (None,)
+            return await self._repo(shard).get_collection_version(user_id=user_id, service_id=service_id)
+        versions = await self._scatter(
+            UserServiceRoleRepositoryImpl, lambda repo: repo.get_collection_version(service_id=service_id)
+        )
+        return tuple(itertools.chain.from_iterable(versions))
+
+    async def list_assignments(
+        self,
+        service_id: Optional[int] = None,
+        role_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        user_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[dict], Optional[int]]:
+        if user_id is not None:
+            shard = self.shard_of_user(user_id)
+            if shard is None:
+                return [], None
+            return await self._repo(shard).list_assignments(service_id, role_id, is_active, user_id, after_id, limit)
+        # Global ids make a k-way merge by id a consistent keyset order across shards
+        results = await self._scatter(
+            UserServiceRoleRepositoryImpl,
+            lambda repo: repo.list_assignments(service_id, role_id, is_active, None, after_id, limit)
+        )
+        merged = sorted(itertools.chain.from_iterable(rows for rows, _ in results), key=lambda row: row['id'])
+        has_more = len(merged) > limit or any(next_id is not None for _, next_id in results)
+        page = merged[:limit]
+        return page, (page[-1]['id'] if has_more and page else None)
+
+
+class ShardedChangeFeedRepository(_ShardedRepository, ChangeFeedRepository):
+    """Every shard numbers its own changes, so the cursor holds one position per shard"""
+
+    async def get_changes(self, since: Optional[List[int]], limit: int = 500) -> ChangePage:
+        if since is None:
+            since = [0] * self.shard_count
+        if len(since) != self.shard_count:
+            raise ValueError("Invalid change feed cursor")
+        results = await asyncio.gather(*(
+            asyncio.to_thread(read_changes, self.shards.get(shard), since[shard], limit)
+            for shard in range(self.shard_count)
+        ))
+        # Each shard's changes stay in sequence order; across shards any interleaving is consistent,
+        # as long as every shard contributes a prefix of its own changes
+        merged = sorted(
+            ((change.seq, shard, change) for shard, (changes, _) in enumerate(results) for change in changes),
+            key=lambda item: item[:2]
+        )
+        page = merged[:limit]
+        cursor = list(since)
+        for _, shard, change in page:
+            cursor[shard] = change.seq
+        has_more = len(merged) > limit or any(more for _, more in results)
+        return ChangePage(changes=[change for _, _, change in page], cursor=cursor, has_more=has_more)
+
+
+class ShardedStatsRepository(_ShardedRepository, StatsRepository):
+    """Every shard keeps counters for its own users; the summary is their sum"""
+
+    async def get_summary(self, signups_since: date) -> StatsSummary:
+        results = await asyncio.gather(*(
+            asyncio.to_thread(read_counters, self.shards.get(shard), signups_since)
+            for shard in range(self.shard_count)
+        ))
+        counters: Dict[str, int] = {}
+        for shard_counters, _ in results:
+            for key, value in shard_counters.items():
+                counters[key] = counters.get(key, 0) + value
+        return to_summary(counters, max((updated_at for _, updated_at in results if updated_at), default=None))
+
+    async def rebuild(self) -> StatsSummary:
+        await asyncio.gather(*(
+            asyncio.to_thread(rebuild_counters, self.shards.get(shard)) for shard in range(self.shard_count)
+        ))
+        return await self.get_summary(date.min)
+
+
+class ShardedUnitOfWork(SQLUnitOfWork):
+    """Unit of work on one user's shard.
+
+    Directory reservations (new ids, phone/email changes) are committed on the
+    primary immediately, so uniqueness holds across shards while the unit of work
+    runs, and are undone if it rolls back. Directory entries freed by deletes are
+    only released once it commits.
+    """
+
+    def __init__(self, directory_db: Session, shards: ShardSessions, shard: int):
+        super().__init__(shards.get(shard))
+        self.directory_db = directory_db
+        self._undo: list = []
+        self._after_commit: list = []
+        self.users = ShardedUserRepository(directory_db, shards)
+        self.otps = ShardedOTPRepository(shards)
+        self.user_service_roles = ShardedUserServiceRoleRepository(directory_db, shards)
+        # The catalog is written on the primary only; shards hold a replica
+        self.user_roles = UserRoleRepositoryImpl(directory_db)
+        self.services = ServiceRepositoryImpl(directory_db)
+
+    def undo_on_rollback(self, statement) -> None:
+        self._undo.append(statement)
+
+    def after_commit(self, statement) -> None:
+        self._after_commit.append(statement)
+
+    async def commit(self) -> None:
+        await super().commit()
+        self._undo.clear()
+        pending, self._after_commit = self._after_commit, []
+        self._write_directory(pending)
+
+    async def rollback(self) -> None:
+        try:
+            await super().rollback()
+        finally:
+            self._unwind(0, 0)
+
+    @asynccontextmanager
+    async def savepoint(self):
+        marks = len(self._undo), len(self._after_commit)
+        try:
+            async with super().savepoint():
+                yield
+        except BaseException:
+            self._unwind(*marks)
+            raise
+
+    def _unwind(self, undo_mark: int, after_commit_mark: int) -> None:
+        undo = self._undo[undo_mark:]
+        del self._undo[undo_mark:], self._after_commit[after_commit_mark:]
+        # Newest first, so a reservation changed twice ends at its original value
+        self._write_directory(list(reversed(undo)))
+
+    def _write_directory(self, statements: list) -> None:
+        if not statements:
+            return
+        try:
+            for statement in statements:
+                self.directory_db.execute(statement)
+            self.directory_db.commit()
+        except Exception:
+            self.directory_db.rollback()
+            logger.exception("Could not update the directory after a unit of work ended")
+
+
+@contextmanager
+def open_user_repository():
+    """User repository with its own sessions, for work outside a request (background tasks)"""
+    with session_scope():
+        yield ShardedUserRepository() if shard_router is not None else SQLUserRepository()
+
+
+def sync_catalog(router: ShardRouter, source_engine=primary_engine) -> None:
+    """Copy services and roles from the primary to every shard (small tables, full copy)"""
+    tables = [ServiceModel.__table__, UserRoleModel.__table__]
+    with source_engine.connect() as source:
+        rows = {table: [dict(row._mapping) for row in source.execute(select(table))] for table in tables}
+    for shard, shard_engine in enumerate(router.engines):
+        try:
+            with shard_engine.begin() as connection:
+                for table in tables:
+                    ids = [row["id"] for row in rows[table]]
+                    # Rows still referenced by assignments on the shard make this fail, as on the primary
+                    connection.execute(delete(table).where(table.c.id.not_in(ids)))
+                    for row in rows[table]:
+                        if connection.execute(update(table).where(table.c.id == row["id"]).values(**row)).rowcount == 0:
+                            connection.execute(insert(table).values(**row))
+        except Exception:
+            logger.exception("Could not replicate the catalog to shard %d", shard)
+
+
+def _on_invalidation(event: InvalidationEvent) -> None:
+    # Catalog writes are rare; replicate synchronously so the next request sees them
+    if event.entity in (SERVICE, USER_ROLE):
+        sync_catalog(shard_router)
+
+
+if shard_router is not None:
+    invalidation_bus.subscribe(_on_invalidation)
\ No newline at end of file
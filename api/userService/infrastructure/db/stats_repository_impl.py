@@ -0,0 +1,80 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, or_
+
+from core.session_context import current_session
+from domain.models.stats_summary import StatsSummary, AssignmentCount, SignupCount
+from domain.repositories.stats_repository import StatsRepository
+from .models import StatsCounterModel
+from .stats_summary import (
+    USERS_TOTAL, USERS_ACTIVE, USERS_VERIFIED, USERS_MFA_ENABLED, USER_KEYS,
+    SIGNUPS_PREFIX, ASSIGNMENTS_PREFIX, signup_key, rebuild_stats_summary
+)
+
+
+def read_counters(db: Session, signups_since: date) -> Tuple[Dict[str, int], Optional[datetime]]:
+    """Counter values of one database by key, and when the newest of them changed"""
+    rows = db.execute(
+        select(StatsCounterModel.key, StatsCounterModel.value, StatsCounterModel.updated_at)
+        .where(or_(
+            StatsCounterModel.key.in_(USER_KEYS),
+            StatsCounterModel.key.startswith(ASSIGNMENTS_PREFIX),
+            StatsCounterModel.key.between(signup_key(signups_since), SIGNUPS_PREFIX + "~")
+        ))
+        .order_by(StatsCounterModel.key)
+    ).all()
+    return {row.key: row.value for row in rows}, max((row.updated_at for row in rows if row.updated_at), default=None)
+
+
+def rebuild_counters(db: Session) -> None:
+    """Recompute the counters of one database from its source tables"""
+    try:
+        rebuild_stats_summary(db.connection())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def to_summary(counters: Dict[str, int], updated_at: Optional[datetime]) -> StatsSummary:
+    assignments = {}
+    signups = []
+    for key, value in sorted(counters.items()):
+        if key.startswith(ASSIGNMENTS_PREFIX):
+            service_id, role_id, state = key[len(ASSIGNMENTS_PREFIX):].split(".")
+            assignment = assignments.setdefault(
+                (int(service_id), int(role_id)), AssignmentCount(service_id=int(service_id), role_id=int(role_id))
+            )
+            setattr(assignment, state, value)
+        elif key.startswith(SIGNUPS_PREFIX) and value:
+            signups.append(SignupCount(day=date.fromisoformat(key[len(SIGNUPS_PREFIX):]), count=value))
+    return StatsSummary(
+        total_users=counters.get(USERS_TOTAL, 0),
+        active_users=counters.get(USERS_ACTIVE, 0),
+        verified_users=counters.get(USERS_VERIFIED, 0),
+        mfa_enabled_users=counters.get(USERS_MFA_ENABLED, 0),
+        assignments=[a for a in assignments.values() if a.active or a.inactive],
+        signups=signups,
+        updated_at=updated_at
+    )
+
+
+class SQLStatsRepository(StatsRepository):
+    """Reads the incrementally maintained stats_counters table"""
+    
+    def __init__(self, db: Optional[Session] = None):
+        self._db = db
+    
+    @property
+    def db(self) -> Session:
+        return self._db if self._db is not None else current_session()
+    
+    async def get_summary(self, signups_since: date) -> StatsSummary:
+        """One indexed read of the counter rows; cost does not grow with the number of users"""
+        return to_summary(*read_counters(self.db, signups_since))
+    
+    async def rebuild(self) -> StatsSummary:
+        """Recompute the counters from the source tables (full scan; for repairs)"""
+        rebuild_counters(self.db)
+        return await self.get_summary(date.min)
\ No newline at end of file
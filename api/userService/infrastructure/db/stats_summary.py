@@ -0,0 +1,209 @@
+"""
+Incrementally maintained dashboard counters (``stats_counters``).
+
+Every ORM flush turns the user and user-service-role rows it inserts, updates
+or deletes into counter deltas and upserts them in the same transaction, so
+the summary commits or rolls back together with the write. Writes issued as
+Core statements bypass the ORM and must call ``apply_deltas`` themselves (see
+``SQLUserRepository.create_with_service_role``).
+
+Counter keys:
+    users.total, users.active, users.verified, users.mfa_enabled
+    signups.<YYYY-MM-DD>                          users per creation day
+    assignments.<service_id>.<role_id>.<active|inactive>
+"""
+import logging
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, delete, event, func, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from .models import StatsCounterModel, UserModel, UserServiceRoleModel
+
+logger = logging.getLogger(__name__)
+
+USERS_TOTAL = "users.total"
+USERS_ACTIVE = "users.active"
+USERS_VERIFIED = "users.verified"
+USERS_MFA_ENABLED = "users.mfa_enabled"
+USER_KEYS = (USERS_TOTAL, USERS_ACTIVE, USERS_VERIFIED, USERS_MFA_ENABLED)
+SIGNUPS_PREFIX = "signups."
+ASSIGNMENTS_PREFIX = "assignments."
+
+# Session.info key collecting deltas between before_flush and after_flush
+PENDING_DELTAS_KEY = "stats_pending_deltas"
+
+_USER_FIELDS = ("is_active", "is_verified", "mfa_enabled", "created_at")
+_ASSIGNMENT_FIELDS = ("service_id", "role_id", "is_active")
+
+
+def signup_key(day: date) -> str:
+    return f"{SIGNUPS_PREFIX}{day.isoformat()}"
+
+
+def assignment_key(service_id: int, role_id: int, is_active: bool) -> str:
+    return f"{ASSIGNMENTS_PREFIX}{service_id}.{role_id}.{'active' if is_active else 'inactive'}"
+
+
+def _day(created_at) -> date:
+    if created_at is None:
+        # Not inserted yet: server_default now() will stamp it today (UTC)
+        return datetime.now(timezone.utc).date()
+    if isinstance(created_at, str):
+        return date.fromisoformat(created_at[:10])
+    if isinstance(created_at, datetime):
+        return created_at.date()
+    return created_at
+
+
+def user_deltas(before: Optional[dict], after: Optional[dict]) -> Counter:
+    """Counter changes for one user going from ``before`` to ``after`` (None = row absent)"""
+    deltas = Counter()
+    for state, sign in ((before, -1), (after, 1)):
+        if state is None:
+            continue
+        deltas[USERS_TOTAL] += sign
+        deltas[USERS_ACTIVE] += sign if state["is_active"] else 0
+        deltas[USERS_VERIFIED] += sign if state["is_verified"] else 0
+        deltas[USERS_MFA_ENABLED] += sign if state["mfa_enabled"] else 0
+        deltas[signup_key(_day(state["created_at"]))] += sign
+    return deltas
+
+
+def assignment_deltas(before: Optional[dict], after: Optional[dict]) -> Counter:
+    """Counter changes for one user-service-role row going from ``before`` to ``after``"""
+    deltas = Counter()
+    for state, sign in ((before, -1), (after, 1)):
+        if state is not None:
+            deltas[assignment_key(state["service_id"], state["role_id"], state["is_active"])] += sign
+    return deltas
+
+
+def apply_deltas(connection, deltas: Dict[str, int]) -> None:
+    """Add ``deltas`` to the counters inside the caller's transaction"""
+    # Sorted so concurrent transactions lock counter rows in the same order
+    rows = [{"key": key, "value": value} for key, value in sorted(deltas.items()) if value]
+    if not rows:
+        return
+    table = StatsCounterModel.__table__
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        statement = dialect_insert(table).values(rows)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"value": table.c.value + statement.excluded.value, "updated_at": func.now()}
+        ))
+        return
+    for row in rows:
+        result = connection.execute(
+            update(table).where(table.c.key == row["key"]).values(value=table.c.value + row["value"])
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**row))
+
+
+def _column_default(model, field: str):
+    default = model.__table__.c[field].default
+    return default.arg if default is not None and default.is_scalar else None
+
+
+def flush_states(session, obj, model, fields: Iterable[str]):
+    """(before, after) attribute values of an object about to be flushed, from its change history"""
+    state = inspect(obj)
+    before, after, unknown = {}, {}, []
+    for field in fields:
+        history = state.attrs[field].history
+        if history.added or history.deleted:
+            before[field] = history.deleted[0] if history.deleted else None
+            after[field] = history.added[0] if history.added else None
+            if not history.deleted and state.persistent:
+                # Assigned while expired, so the old value was never loaded
+                unknown.append(field)
+        else:
+            # Unchanged; reading it may load the current (pre-flush) value
+            before[field] = after[field] = getattr(obj, field)
+        if after[field] is None and not state.persistent:
+            after[field] = _column_default(model, field)
+    if unknown:
+        row = session.connection().execute(
+            select(*(model.__table__.c[field] for field in unknown)).where(model.id == obj.id)
+        ).one()
+        before.update(zip(unknown, row))
+    return before, after
+
+
+_TRACKED = (
+    (UserModel, _USER_FIELDS, user_deltas),
+    (UserServiceRoleModel, _ASSIGNMENT_FIELDS, assignment_deltas),
+)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_deltas(session, flush_context, instances):
+    deltas = session.info.setdefault(PENDING_DELTAS_KEY, Counter())
+    for model, fields, compute in _TRACKED:
+        for obj in session.new:
+            if isinstance(obj, model):
+                deltas.update(compute(None, flush_states(session, obj, model, fields)[1]))
+        for obj in session.dirty:
+            if isinstance(obj, model) and session.is_modified(obj):
+                deltas.update(compute(*flush_states(session, obj, model, fields)))
+        for obj in session.deleted:
+            if isinstance(obj, model):
+                deltas.update(compute(flush_states(session, obj, model, fields)[0], None))
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_collected_deltas(session, flush_context):
+    deltas = session.info.pop(PENDING_DELTAS_KEY, None)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_collected_deltas(session, previous_transaction):
+    session.info.pop(PENDING_DELTAS_KEY, None)
+
+
+def rebuild_stats_summary(connection) -> None:
+    """Recompute every counter from ``users`` and ``user_service_roles`` (full scan)"""
+    table = StatsCounterModel.__table__
+    users = connection.execute(select(
+        func.count(UserModel.id),
+        func.sum(case((UserModel.is_active == True, 1), else_=0)),
+        func.sum(case((UserModel.is_verified == True, 1), else_=0)),
+        func.sum(case((UserModel.mfa_enabled == True, 1), else_=0)),
+    )).one()
+    counters = {key: value or 0 for key, value in zip(USER_KEYS, users)}
+    signup_day = func.date(UserModel.created_at)
+    for day, count in connection.execute(
+        select(signup_day, func.count(UserModel.id)).group_by(signup_day)
+    ):
+        if day is not None:
+            counters[signup_key(_day(day))] = count
+    for service_id, role_id, is_active, count in connection.execute(
+        select(
+            UserServiceRoleModel.service_id, UserServiceRoleModel.role_id, UserServiceRoleModel.is_active,
+            func.count(UserServiceRoleModel.id)
+        ).group_by(UserServiceRoleModel.service_id, UserServiceRoleModel.role_id, UserServiceRoleModel.is_active)
+    ):
+        counters[assignment_key(service_id, role_id, bool(is_active))] = count
+    connection.execute(delete(table))
+    connection.execute(insert(table), [{"key": key, "value": value} for key, value in sorted(counters.items())])
+
+
+def ensure_stats_summary(engine) -> None:
+    """Build the counters on first start; afterwards they are maintained on every write"""
+    try:
+        with engine.begin() as connection:
+            if connection.execute(select(func.count()).select_from(StatsCounterModel.__table__)).scalar():
+                return
+            rebuild_stats_summary(connection)
+    except Exception:
+        logger.exception("Could not build the stats summary; /admin/stats may be incomplete until rebuilt")
\ No newline at end of file
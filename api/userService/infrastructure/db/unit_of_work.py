@@ -0,0 +1,70 @@
+from contextlib import asynccontextmanager
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from domain.repositories.unit_of_work import UnitOfWork
+from infrastructure.cache.invalidation import invalidation_bus
+from .base_repository import UNIT_OF_WORK_KEY
+from .user_repository_impl import SQLUserRepository
+from .otp_repository_impl import SQLOTPRepository
+from .user_service_role_repository_impl import UserServiceRoleRepositoryImpl
+from .user_role_repository_impl import UserRoleRepositoryImpl
+from .service_repository_impl import ServiceRepositoryImpl
+
+
+class SQLUnitOfWork(UnitOfWork):
+    """Unit of work over one SQLAlchemy session.
+
+    While active, repositories sharing the session flush instead of committing and
+    queue their cache invalidations, which are published only after the commit.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.users = SQLUserRepository(session)
+        self.otps = SQLOTPRepository(session)
+        self.user_service_roles = UserServiceRoleRepositoryImpl(session)
+        self.user_roles = UserRoleRepositoryImpl(session)
+        self.services = ServiceRepositoryImpl(session)
+        self._pending_invalidations: List[Tuple[str, tuple]] = []
+
+    async def __aenter__(self) -> "SQLUnitOfWork":
+        if self.session.info.get(UNIT_OF_WORK_KEY) is not None:
+            raise RuntimeError("A unit of work is already active on this session")
+        self.session.info[UNIT_OF_WORK_KEY] = self
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            # No-op after commit(); discards anything staged since
+            await self.rollback()
+        finally:
+            self.session.info.pop(UNIT_OF_WORK_KEY, None)
+
+    async def commit(self) -> None:
+        self.session.commit()
+        pending, self._pending_invalidations = self._pending_invalidations, []
+        for entity, keys in pending:
+            invalidation_bus.publish(entity, *keys)
+
+    async def rollback(self) -> None:
+        self.session.rollback()
+        self._pending_invalidations.clear()
+
+    @asynccontextmanager
+    async def savepoint(self):
+        nested = self.session.begin_nested()
+        mark = len(self._pending_invalidations)
+        try:
+            yield
+        except BaseException:
+            # Also required after a failed flush, which deactivates but does not roll back the savepoint
+            nested.rollback()
+            del self._pending_invalidations[mark:]
+            raise
+        else:
+            nested.commit()
+
+    def defer_invalidation(self, entity: str, keys: tuple) -> None:
+        self._pending_invalidations.append((entity, keys))
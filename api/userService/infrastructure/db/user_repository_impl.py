@@ -1,28 +1,182 @@
+import asyncio
+import itertools
 import json
 from datetime import datetime
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Sequence, Tuple
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select, insert, update, func
+from sqlalchemy.exc import IntegrityError
 
+from core.config import settings
 from domain.models.user import User
+from domain.models.user_projections import AuthPrincipal, UserProfile, CredentialRecord
+from domain.models.webhook import USER_CREATED, ROLE_ASSIGNED
 from domain.repositories.user_repository import UserRepository
-from .models import UserModel
+from .models import UserModel, ServiceModel, UserRoleModel
 from .models.user_service_role import UserServiceRoleModel
 from .base_repository import BaseRepository
+from .user_search import build_user_search, search_terms
+from .stats_summary import apply_deltas, assignment_deltas, user_deltas
+from .outbox import record_events
+from .change_feed import next_change_seq
+from infrastructure.cache.invalidation import USER, USER_SERVICE_ROLE
+from infrastructure.cache.single_flight import user_lookups, remember_principal
+
+# SQLSTATE of a foreign key violation (PostgreSQL)
+FOREIGN_KEY_VIOLATION = "23503"
+
+# Column order matches the UserProfile fields
+PROFILE_COLUMNS = (
+    UserModel.id, UserModel.phone_number, UserModel.full_name, UserModel.email, UserModel.is_active,
+    UserModel.is_verified, UserModel.mfa_enabled, UserModel.created_at, UserModel.last_login
+)
 
 
 class SQLUserRepository(BaseRepository[User, UserModel], UserRepository):
     """SQL implementation of UserRepository interface"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         super().__init__(db)
 
     async def create(self, user: User) -> User:
         """Create a new user in the database"""
         db_user = self._to_database(user)
         db_user = self._commit_and_refresh(db_user)
+        self._invalidate(USER, db_user.id, db_user.phone_number)
         return self._to_domain(db_user)
 
+    async def create_with_service_role(self, user: User, service_id: int, role_id: int,
+                                       assignment_id: Optional[int] = None) -> dict:
+        """Insert a user and their first role assignment in one transaction.
+
+        Duplicates are detected by the unique constraints rather than by lookups first;
+        the response dictionary is built from the RETURNING rows and one catalog read.
+        Ids are normally generated; on a shard they are the global ids from the directory.
+        """
+        try:
+            # Core inserts bypass the flush hook that numbers changes for the change feed
+            change_seq = next_change_seq(self.db.connection(), 2)
+            user_row = self.db.execute(
+                insert(UserModel)
+                .values(
+                    **({'id': user.id} if user.id is not None else {}),
+                    phone_number=user.phone_number,
+                    full_name=user.full_name,
+                    email=user.email,
+                    hashed_password=user.hashed_password,
+                    change_seq=change_seq
+                )
+                .returning(
+                    UserModel.id, UserModel.is_active, UserModel.is_verified, UserModel.mfa_enabled,
+                    UserModel.created_at, UserModel.updated_at
+                )
+            ).one()
+            role_row = self.db.execute(
+                insert(UserServiceRoleModel)
+                .values(
+                    **({'id': assignment_id} if assignment_id is not None else {}),
+                    user_id=user_row.id, service_id=service_id, role_id=role_id, is_active=True,
+                    change_seq=change_seq + 1
+                )
+                .returning(UserServiceRoleModel.id, UserServiceRoleModel.created_at)
+            ).one()
+            catalog_row = self.db.execute(
+                select(
+                    ServiceModel.name.label("service_name"), ServiceModel.description.label("service_description"),
+                    UserRoleModel.name.label("role_name"), UserRoleModel.description.label("role_description")
+                )
+                .join(UserRoleModel, UserRoleModel.id == role_id)
+                .where(ServiceModel.id == service_id)
+            ).one_or_none()
+            if catalog_row is None:
+                # Foreign keys are not enforced on every backend (e.g. SQLite by default)
+                raise ValueError("Invalid service or role")
+            # ...and the ones that maintain the stats counters
+            apply_deltas(self.db.connection(), user_deltas(None, {
+                'is_active': user_row.is_active,
+                'is_verified': user_row.is_verified,
+                'mfa_enabled': user_row.mfa_enabled,
+                'created_at': user_row.created_at
+            }) + assignment_deltas(None, {'service_id': service_id, 'role_id': role_id, 'is_active': True}))
+            # ...and the outbox hooks
+            if settings.WEBHOOKS_ENABLED:
+                record_events(self.db, [
+                    (USER_CREATED, user_row.id, {
+                        'id': user_row.id,
+                        'phone_number': user.phone_number,
+                        'full_name': user.full_name,
+                        'email': user.email,
+                        'is_active': user_row.is_active,
+                        'is_verified': user_row.is_verified,
+                        'mfa_enabled': user_row.mfa_enabled
+                    }),
+                    (ROLE_ASSIGNED, role_row.id, {
+                        'id': role_row.id,
+                        'user_id': user_row.id,
+                        'service_id': service_id,
+                        'role_id': role_id,
+                        'is_active': True
+                    })
+                ])
+            self._commit()
+        except IntegrityError as e:
+            if self._unit_of_work is None:
+                self.db.rollback()
+            raise ValueError(self._integrity_error_message(e, service_id)) from e
+        except Exception:
+            if self._unit_of_work is None:
+                self.db.rollback()
+            raise
+
+        self._invalidate(USER, user_row.id, user.phone_number)
+        self._invalidate(USER_SERVICE_ROLE, user_row.id)
+        return {
+            'user': User(
+                id=user_row.id,
+                phone_number=user.phone_number,
+                full_name=user.full_name,
+                email=user.email,
+                hashed_password=user.hashed_password,
+                is_active=user_row.is_active,
+                is_verified=user_row.is_verified,
+                mfa_enabled=user_row.mfa_enabled,
+                created_at=user_row.created_at,
+                updated_at=user_row.updated_at
+            ),
+            'roles': [{
+                'id': role_row.id,
+                'service': {
+                    'id': service_id,
+                    'name': catalog_row.service_name,
+                    'description': catalog_row.service_description
+                },
+                'role': {
+                    'id': role_id,
+                    'name': catalog_row.role_name,
+                    'description': catalog_row.role_description
+                },
+                'is_active': True,
+                'created_at': role_row.created_at
+            }]
+        }
+
+    @staticmethod
+    def _integrity_error_message(error: IntegrityError, service_id: int) -> str:
+        # PostgreSQL reports the SQLSTATE and the violated constraint (its message names the table
+        # for foreign keys too); SQLite only a message naming table.column for unique violations
+        driver_error = error.orig
+        sqlstate = getattr(driver_error, "sqlstate", None) or getattr(driver_error, "pgcode", None)
+        detail = getattr(getattr(driver_error, "diag", None), "constraint_name", None) or str(driver_error)
+        if sqlstate == FOREIGN_KEY_VIOLATION or "FOREIGN KEY" in detail:
+            return "Invalid service or role"
+        if "phone_number" in detail:
+            return "User with this phone number already exists"
+        if "email" in detail:
+            return "User with this email already exists"
+        if "uq_user_service" in detail or "user_service_roles" in detail:
+            return f"User already has a role assigned in service {service_id}"
+        return "Invalid service or role"
+
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Retrieve user by ID"""
         db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
@@ -44,7 +198,12 @@ class SQLUserRepository(BaseRepository[User, UserModel], UserRepository):
         return db_user
 
     async def get_by_phone_number(self, phone_number: str) -> Optional[User]:
-        """Retrieve user by phone number"""
+        """Retrieve user by phone number; concurrent lookups of one number share a single query"""
+        return await self._shared_read(
+            user_lookups, ("phone", phone_number), lambda repo: repo._get_by_phone_number(phone_number)
+        )
+
+    def _get_by_phone_number(self, phone_number: str) -> Optional[User]:
         db_user = self.db.query(UserModel).filter(UserModel.phone_number == phone_number).first()
         return self._to_domain(db_user) if db_user else None
 
@@ -73,6 +232,7 @@ class SQLUserRepository(BaseRepository[User, UserModel], UserRepository):
         db_user = self.db.query(UserModel).filter(UserModel.id == user.id).first()
         if not db_user:
             raise ValueError(f"User with id {user.id} not found")
+        previous_phone_number = db_user.phone_number
 
         # Update fields
         db_user.phone_number = user.phone_number
@@ -88,6 +248,7 @@ class SQLUserRepository(BaseRepository[User, UserModel], UserRepository):
         db_user.updated_at = datetime.utcnow()
 
         if self._safe_commit():
+            self._invalidate(USER, user.id, previous_phone_number, user.phone_number)
             self.db.refresh(db_user)
             return self._to_domain(db_user)
         else:
@@ -97,8 +258,11 @@ class SQLUserRepository(BaseRepository[User, UserModel], UserRepository):
         """Delete a user by ID"""
         db_user = self.db.query(UserModel).filter(UserModel.id == user_id).first()
         if db_user:
+            phone_number = db_user.phone_number
             self.db.delete(db_user)
-            return self._safe_commit()
+            if self._safe_commit():
+                self._invalidate(USER, user_id, phone_number)
+                return True
         return False
 
     async def list_all(self) -> List[User]:
@@ -106,6 +270,155 @@ class SQLUserRepository(BaseRepository[User, UserModel], UserRepository):
         db_users = self.db.query(UserModel).all()
         return [self._to_domain(db_user) for db_user in db_users]
 
+    async def get_profile_version(self, user_id: int) -> Tuple:
+        """Validator for the user's profile: the user row, their role assignments and the catalog names"""
+        columns = [select(UserModel.row_version).where(UserModel.id == user_id).scalar_subquery()]
+        for model, criteria in (
+            (UserServiceRoleModel, [UserServiceRoleModel.user_id == user_id]),
+            (ServiceModel, []),
+            (UserRoleModel, [])
+        ):
+            columns.extend(
+                select(column).where(*criteria).scalar_subquery()
+                for column in self._collection_version_columns(model)
+            )
+        # One round trip for all four validators
+        return tuple(self.db.execute(select(*columns)).one())
+
+    async def search(self, query: str, fuzzy: bool = False, limit: int = 20, offset: int = 0) -> Tuple[List[User], bool]:
+        """Indexed search on name, email and phone; returns a page and whether more results exist"""
+        statement = build_user_search(self.db.get_bind().dialect.name, search_terms(query), fuzzy)
+        # One extra row tells whether there is a next page without a COUNT over all matches
+        db_users = self.db.execute(statement.limit(limit + 1).offset(offset)).scalars().all()
+        return [self._to_domain(db_user) for db_user in db_users[:limit]], len(db_users) > limit
+
+    async def update_password_hash(self, user_id: int, expected_hash: str, new_hash: str) -> bool:
+        """Replace a password hash only if it still matches the one that was verified"""
+        result = self.db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id, UserModel.hashed_password == expected_hash)
+            .values(hashed_password=new_hash)
+            .returning(UserModel.phone_number)
+        )
+        phone_number = result.scalar_one_or_none()
+        if self._safe_commit() and phone_number is not None:
+            self._invalidate(USER, user_id, phone_number)
+            return True
+        return False
+
+    def count_password_hashes(self, parameters: Callable[[str], str]) -> List[Tuple[str, int, str]]:
+        """Count users per hash parameter string (``parameters(hash)``), with one sample hash per group.
+
+        Blocking: streams the hash column, so run it off the event loop.
+        """
+        groups: Dict[str, list] = {}
+        statement = select(UserModel.hashed_password).execution_options(yield_per=1000)
+        for hashed_password in self.db.execute(statement).scalars():
+            key = parameters(hashed_password)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [key, 1, hashed_password]
+            else:
+                group[1] += 1
+        return [tuple(group) for group in groups.values()]
+
+    async def get_auth_principal(self, phone_number: str) -> Optional[AuthPrincipal]:
+        """Identity and active roles of a caller in one narrow query; concurrent lookups share it"""
+        principal = await self._shared_read(
+            user_lookups, ("principal", phone_number), lambda repo: repo._get_auth_principal(phone_number)
+        )
+        if principal is not None:
+            remember_principal(principal.phone_number, principal.id)
+        return principal
+
+    def _get_auth_principal(self, phone_number: str) -> Optional[AuthPrincipal]:
+        principals = self._principals_where(UserModel.phone_number == phone_number)
+        return principals[0] if principals else None
+
+    async def get_auth_principals(self, phone_numbers: Sequence[str] = (), user_ids: Sequence[int] = ()) -> List[AuthPrincipal]:
+        """Principals of many callers, by phone number and/or id, in one query (ordered by id)"""
+        criteria = []
+        if phone_numbers:
+            criteria.append(UserModel.phone_number.in_(phone_numbers))
+        if user_ids:
+            criteria.append(UserModel.id.in_(user_ids))
+        if not criteria:
+            return []
+        return await asyncio.to_thread(self._principals_where, or_(*criteria))
+
+    def _principals_where(self, criterion) -> List[AuthPrincipal]:
+        # One row per active assignment (or one row with no role), grouped back per user
+        rows = self.db.execute(
+            select(
+                UserModel.id, UserModel.phone_number, UserModel.is_active,
+                UserServiceRoleModel.service_id, UserServiceRoleModel.role_id
+            )
+            .outerjoin(UserServiceRoleModel, and_(
+                UserServiceRoleModel.user_id == UserModel.id, UserServiceRoleModel.is_active == True
+            ))
+            .where(criterion)
+            .order_by(UserModel.id)
+        ).all()
+        principals = []
+        for _, group in itertools.groupby(rows, key=lambda row: row.id):
+            group = list(group)
+            first = group[0]
+            roles = tuple((row.service_id, row.role_id) for row in group if row.service_id is not None)
+            principals.append(AuthPrincipal(
+                id=first.id, phone_number=first.phone_number, is_active=first.is_active, roles=roles
+            ))
+        return principals
+
+    async def get_profile(self, user_id: int) -> Optional[UserProfile]:
+        """Public profile fields only"""
+        row = self.db.execute(select(*PROFILE_COLUMNS).where(UserModel.id == user_id)).one_or_none()
+        return UserProfile(*row) if row else None
+
+    async def get_profiles(self, user_ids: Sequence[int]) -> List[UserProfile]:
+        """Public profile fields of many users in one query (ordered by id); unknown ids are skipped"""
+        if not user_ids:
+            return []
+        rows = await asyncio.to_thread(
+            lambda: self.db.execute(
+                select(*PROFILE_COLUMNS).where(UserModel.id.in_(user_ids)).order_by(UserModel.id)
+            ).all()
+        )
+        return [UserProfile(*row) for row in rows]
+
+    async def get_credentials(self, phone_number: str) -> Optional[CredentialRecord]:
+        """Password hash and second-factor secrets for a login attempt"""
+        row = self.db.execute(
+            select(
+                UserModel.id, UserModel.phone_number, UserModel.hashed_password, UserModel.is_active,
+                UserModel.mfa_enabled, UserModel.mfa_secret, UserModel.backup_codes
+            ).where(UserModel.phone_number == phone_number)
+        ).one_or_none()
+        if row is None:
+            return None
+        return CredentialRecord(
+            id=row.id,
+            phone_number=row.phone_number,
+            hashed_password=row.hashed_password,
+            is_active=row.is_active,
+            mfa_enabled=row.mfa_enabled,
+            mfa_secret=row.mfa_secret,
+            backup_codes=tuple(json.loads(row.backup_codes)) if row.backup_codes else ()
+        )
+
+    async def record_login(self, user_id: int, last_login: datetime) -> Optional[UserProfile]:
+        """Stamp last_login and return the updated profile in the same statement"""
+        row = self.db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(last_login=last_login)
+            .returning(*PROFILE_COLUMNS)
+        ).one_or_none()
+        self._commit()
+        if row is None:
+            return None
+        self._invalidate(USER, user_id, row.phone_number)
+        return UserProfile(*row)
+
     def _to_domain(self, db_user: UserModel) -> User:
         """Convert database model to domain model"""
         backup_codes = json.loads(db_user.backup_codes) if db_user.backup_codes else None
@@ -1,19 +1,22 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete
 from domain.models.user_role import UserRole
 from domain.repositories.user_role_repository import UserRoleRepository
 from infrastructure.db.models.user_role import UserRoleModel
 from .base_repository import BaseRepository
+from infrastructure.cache.invalidation import USER_ROLE
+from infrastructure.cache.single_flight import catalog_lookups
 
 
 class UserRoleRepositoryImpl(BaseRepository[UserRole, UserRoleModel], UserRoleRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         super().__init__(db)
     
     async def create(self, user_role: UserRole) -> UserRole:
         db_role = self._to_database(user_role)
         db_role = self._commit_and_refresh(db_role)
+        self._invalidate(USER_ROLE, db_role.id, db_role.name)
         return self._to_domain(db_role)
     
     async def get_by_id(self, role_id: int) -> Optional[UserRole]:
@@ -25,6 +28,10 @@ class UserRoleRepositoryImpl(BaseRepository[UserRole, UserRoleModel], UserRoleRe
         return self._to_domain(db_role) if db_role else None
     
     async def get_all(self, active_only: bool = True) -> List[UserRole]:
+        # Concurrent catalog reads (e.g. a cold admin UI) share a single query
+        return await self._shared_read(catalog_lookups, ("roles", active_only), lambda repo: repo._get_all(active_only))
+    
+    def _get_all(self, active_only: bool) -> List[UserRole]:
         query = self.db.query(UserRoleModel)
         if active_only:
             query = query.filter(UserRoleModel.is_active == True)
@@ -34,20 +41,28 @@ class UserRoleRepositoryImpl(BaseRepository[UserRole, UserRoleModel], UserRoleRe
     async def update(self, user_role: UserRole) -> UserRole:
         db_role = self.db.query(UserRoleModel).filter(UserRoleModel.id == user_role.id).first()
         if db_role:
+            previous_name = db_role.name
             db_role.name = user_role.name
             db_role.description = user_role.description
             db_role.is_active = user_role.is_active
             if self._safe_commit():
+                self._invalidate(USER_ROLE, user_role.id, previous_name, user_role.name)
                 return self._to_domain(db_role)
         raise ValueError("Role not found or update failed")
     
     async def delete(self, role_id: int) -> bool:
         db_role = self.db.query(UserRoleModel).filter(UserRoleModel.id == role_id).first()
         if db_role:
+            name = db_role.name
             self.db.delete(db_role)
-            return self._safe_commit()
+            if self._safe_commit():
+                self._invalidate(USER_ROLE, role_id, name)
+                return True
         return False
     
+    async def get_collection_version(self) -> Tuple:
+        return self._collection_version(UserRoleModel)
+    
     def _to_domain(self, db_role: UserRoleModel) -> UserRole:
         """Convert database model to domain model"""
         return UserRole(
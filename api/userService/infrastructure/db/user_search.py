@@ -0,0 +1,138 @@
+"""
+Indexed substring and fuzzy search over users' name, email and phone number.
+
+SQLite uses an external-content FTS5 table with the trigram tokenizer, kept in
+sync by triggers on ``users``. PostgreSQL uses pg_trgm GIN indexes, which the
+database maintains itself. Other dialects fall back to unindexed LIKE.
+"""
+import logging
+from typing import List
+
+from sqlalchemy import Float, Integer, and_, func, inspect, literal, or_, select, text
+
+from .models import UserModel
+
+logger = logging.getLogger(__name__)
+
+MIN_TERM_LENGTH = 3
+
+SQLITE_FTS_TABLE = "users_search"
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        full_name, email, phone_number, content='users', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_search_ai AFTER INSERT ON users BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, full_name, email, phone_number)
+        VALUES (new.id, new.full_name, new.email, new.phone_number);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_search_ad AFTER DELETE ON users BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, full_name, email, phone_number)
+        VALUES ('delete', old.id, old.full_name, old.email, old.phone_number);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_search_au AFTER UPDATE OF full_name, email, phone_number ON users BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, full_name, email, phone_number)
+        VALUES ('delete', old.id, old.full_name, old.email, old.phone_number);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, full_name, email, phone_number)
+        VALUES (new.id, new.full_name, new.email, new.phone_number);
+    END""",
+]
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm ON users USING gin (lower(full_name) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (lower(email) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_phone_number_trgm ON users USING gin (phone_number gin_trgm_ops)",
+]
+
+
+def install_user_search_index(engine) -> None:
+    """Create the search index for the engine's dialect if missing (idempotent)"""
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as connection:
+            if dialect == "sqlite":
+                existed = inspect(connection).has_table(SQLITE_FTS_TABLE)
+                for statement in SQLITE_DDL:
+                    connection.exec_driver_sql(statement)
+                if not existed:
+                    # Index the rows that were there before the triggers
+                    connection.exec_driver_sql(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+            elif dialect == "postgresql":
+                for statement in POSTGRES_DDL:
+                    connection.exec_driver_sql(statement)
+    except Exception:
+        logger.exception("Could not install the user search index; search will fall back to LIKE scans")
+
+
+def search_terms(query: str) -> List[str]:
+    """Lower-cased terms long enough to be matched through a trigram index"""
+    terms = [term for term in query.lower().split() if len(term) >= MIN_TERM_LENGTH]
+    if not terms:
+        raise ValueError(f"Search terms must be at least {MIN_TERM_LENGTH} characters")
+    return terms
+
+
+def _trigrams(term: str) -> List[str]:
+    return [term[i:i + 3] for i in range(len(term) - 2)]
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def build_user_search(dialect: str, terms: List[str], fuzzy: bool):
+    """SELECT of matching UserModel rows, best matches first.
+
+    Default mode requires every term to appear as a substring of one of the fields,
+    which also covers prefixes. Fuzzy mode matches on shared trigrams, so typos and
+    transpositions still find the user, ranked by how much of the query matches.
+    """
+    if dialect == "sqlite":
+        if fuzzy:
+            trigrams = dict.fromkeys(trigram for term in terms for trigram in _trigrams(term))
+            match = " OR ".join(_fts_phrase(trigram) for trigram in trigrams)
+        else:
+            match = " AND ".join(_fts_phrase(term) for term in terms)
+        hits = (
+            text(f"SELECT rowid AS id, rank FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :match")
+            .bindparams(match=match)
+            .columns(id=Integer, rank=Float)
+            .subquery("hits")
+        )
+        # FTS5 rank is bm25, where lower is better
+        return select(UserModel).join(hits, hits.c.id == UserModel.id).order_by(hits.c.rank, UserModel.id)
+
+    name = func.lower(UserModel.full_name)
+    # Same expression as ix_users_email_trgm, so the planner can use the index
+    email = func.lower(UserModel.email)
+    phone = UserModel.phone_number
+
+    if dialect == "postgresql":
+        needle = literal(" ".join(terms))
+        score = func.greatest(
+            func.similarity(name, needle),
+            func.similarity(func.coalesce(email, ""), needle),
+            func.similarity(phone, needle)
+        )
+        if fuzzy:
+            condition = or_(name.op("%")(needle), email.op("%")(needle), phone.op("%")(needle))
+        else:
+            condition = and_(*(
+                or_(name.like(_like_pattern(t), escape="\\"), email.like(_like_pattern(t), escape="\\"),
+                    phone.like(_like_pattern(t), escape="\\"))
+                for t in terms
+            ))
+        return select(UserModel).where(condition).order_by(score.desc(), UserModel.id)
+
+    # No search index for this dialect: substring scan (fuzzy behaves like any-term match)
+    clauses = [
+        or_(name.like(_like_pattern(t), escape="\\"), email.like(_like_pattern(t), escape="\\"),
+            phone.like(_like_pattern(t), escape="\\"))
+        for t in terms
+    ]
+    return select(UserModel).where(or_(*clauses) if fuzzy else and_(*clauses)).order_by(UserModel.id)
\ No newline at end of file
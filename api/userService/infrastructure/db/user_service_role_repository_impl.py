@@ -1,20 +1,24 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete, and_
 from sqlalchemy.orm import joinedload
 from domain.models.user_service_role import UserServiceRole
 from domain.repositories.user_service_role_repository import UserServiceRoleRepository
 from infrastructure.db.models.user_service_role import UserServiceRoleModel
+from infrastructure.db.models.service import ServiceModel
+from infrastructure.db.models.user_role import UserRoleModel
 from .base_repository import BaseRepository
+from infrastructure.cache.invalidation import USER_SERVICE_ROLE
 
 
 class UserServiceRoleRepositoryImpl(BaseRepository[UserServiceRole, UserServiceRoleModel], UserServiceRoleRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         super().__init__(db)
     
     async def create(self, user_service_role: UserServiceRole) -> UserServiceRole:
         db_usr = self._to_database(user_service_role)
         db_usr = self._commit_and_refresh(db_usr)
+        self._invalidate(USER_SERVICE_ROLE, db_usr.user_id)
         return self._to_domain(db_usr)
     
     async def get_by_id(self, id: int) -> Optional[UserServiceRole]:
@@ -96,25 +100,31 @@ class UserServiceRoleRepositoryImpl(BaseRepository[UserServiceRole, UserServiceR
         if db_usr:
             db_usr.role_id = new_role_id
             if self._safe_commit():
+                self._invalidate(USER_SERVICE_ROLE, user_id)
                 return self._to_domain(db_usr)
         raise ValueError("User service role not found or update failed")
 
     async def update(self, user_service_role: UserServiceRole) -> UserServiceRole:
         db_usr = self.db.query(UserServiceRoleModel).filter(UserServiceRoleModel.id == user_service_role.id).first()
         if db_usr:
+            previous_user_id = db_usr.user_id
             db_usr.user_id = user_service_role.user_id
             db_usr.service_id = user_service_role.service_id
             db_usr.role_id = user_service_role.role_id
             db_usr.is_active = user_service_role.is_active
             if self._safe_commit():
+                self._invalidate(USER_SERVICE_ROLE, previous_user_id, user_service_role.user_id)
                 return self._to_domain(db_usr)
         raise ValueError("User service role not found or update failed")
     
     async def delete(self, id: int) -> bool:
         db_usr = self.db.query(UserServiceRoleModel).filter(UserServiceRoleModel.id == id).first()
         if db_usr:
+            user_id = db_usr.user_id
             self.db.delete(db_usr)
-            return self._safe_commit()
+            if self._safe_commit():
+                self._invalidate(USER_SERVICE_ROLE, user_id)
+                return True
         return False
 
     async def deactivate_user_service_role(self, user_id: int, service_id: int) -> bool:
@@ -131,9 +141,83 @@ class UserServiceRoleRepositoryImpl(BaseRepository[UserServiceRole, UserServiceR
         )
         if db_usr:
             db_usr.is_active = False
-            return self._safe_commit()
+            if self._safe_commit():
+                self._invalidate(USER_SERVICE_ROLE, user_id)
+                return True
         return False
     
+    async def get_collection_version(self, user_id: Optional[int] = None, service_id: Optional[int] = None) -> Tuple:
+        criteria = []
+        if user_id:
+            criteria.append(UserServiceRoleModel.user_id == user_id)
+        if service_id:
+            criteria.append(UserServiceRoleModel.service_id == service_id)
+        return self._collection_version(UserServiceRoleModel, *criteria)
+    
+    async def list_assignments(
+        self,
+        service_id: Optional[int] = None,
+        role_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        user_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[dict], Optional[int]]:
+        """Page of assignments with their service and role resolved in one joined query.
+
+        Keyset pagination on id: returns the rows after ``after_id`` and the id to
+        continue from, or None on the last page.
+        """
+        statement = (
+            select(
+                UserServiceRoleModel.id,
+                UserServiceRoleModel.user_id,
+                UserServiceRoleModel.is_active,
+                UserServiceRoleModel.created_at,
+                ServiceModel.id.label("service_id"),
+                ServiceModel.name.label("service_name"),
+                ServiceModel.description.label("service_description"),
+                UserRoleModel.id.label("role_id"),
+                UserRoleModel.name.label("role_name"),
+                UserRoleModel.description.label("role_description"),
+            )
+            .join(ServiceModel, ServiceModel.id == UserServiceRoleModel.service_id)
+            .join(UserRoleModel, UserRoleModel.id == UserServiceRoleModel.role_id)
+            .order_by(UserServiceRoleModel.id)
+            .limit(limit + 1)
+        )
+        if service_id is not None:
+            statement = statement.where(UserServiceRoleModel.service_id == service_id)
+        if role_id is not None:
+            statement = statement.where(UserServiceRoleModel.role_id == role_id)
+        if is_active is not None:
+            statement = statement.where(UserServiceRoleModel.is_active == is_active)
+        if user_id is not None:
+            statement = statement.where(UserServiceRoleModel.user_id == user_id)
+        if after_id is not None:
+            statement = statement.where(UserServiceRoleModel.id > after_id)
+
+        rows = self.db.execute(statement).all()
+        # The extra row only tells whether there is a next page
+        next_after_id = rows[limit - 1].id if len(rows) > limit else None
+        assignments = [{
+            'id': row.id,
+            'user_id': row.user_id,
+            'service': {
+                'id': row.service_id,
+                'name': row.service_name,
+                'description': row.service_description
+            },
+            'role': {
+                'id': row.role_id,
+                'name': row.role_name,
+                'description': row.role_description
+            },
+            'is_active': row.is_active,
+            'created_at': row.created_at
+        } for row in rows[:limit]]
+        return assignments, next_after_id
+    
     def _to_domain(self, db_usr: UserServiceRoleModel) -> UserServiceRole:
         """Convert database model to domain model"""
         return UserServiceRole(
@@ -0,0 +1,263 @@
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete, or_, and_, tuple_
+
+from domain.models.webhook import WebhookEndpoint, WebhookDelivery, PENDING, DELIVERED, FAILED
+from domain.repositories.webhook_repository import WebhookRepository
+from .models import OutboxEventModel, WebhookEndpointModel, WebhookDeliveryModel
+from .base_repository import BaseRepository
+
+
+def _insert_ignoring_duplicates(db: Session, rows: List[dict]) -> None:
+    """Insert deliveries, skipping (endpoint, event) pairs that already exist"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        existing = set(db.execute(
+            select(WebhookDeliveryModel.endpoint_id, WebhookDeliveryModel.event_id).where(
+                tuple_(WebhookDeliveryModel.endpoint_id, WebhookDeliveryModel.event_id).in_(
+                    [(row["endpoint_id"], row["event_id"]) for row in rows]
+                )
+            )
+        ).all())
+        rows = [row for row in rows if (row["endpoint_id"], row["event_id"]) not in existing]
+        if rows:
+            db.execute(insert(WebhookDeliveryModel), rows)
+        return
+    db.execute(
+        dialect_insert(WebhookDeliveryModel).on_conflict_do_nothing(index_elements=["endpoint_id", "event_id"]),
+        rows
+    )
+
+
+class SQLWebhookRepository(BaseRepository[WebhookEndpoint, WebhookEndpointModel], WebhookRepository):
+    """SQL implementation of WebhookRepository, plus the delivery queue used by the dispatcher.
+
+    Endpoints and deliveries live on the primary database; outbox rows live next to
+    the users they describe, so ``relay`` takes the session of the database to read.
+    The queue methods are blocking and meant for a worker thread.
+    """
+
+    def __init__(self, db: Optional[Session] = None):
+        super().__init__(db)
+
+    async def create_endpoint(self, endpoint: WebhookEndpoint) -> WebhookEndpoint:
+        db_endpoint = self._commit_and_refresh(self._to_database(endpoint))
+        return self._to_domain(db_endpoint)
+
+    async def get_endpoint(self, endpoint_id: int) -> Optional[WebhookEndpoint]:
+        db_endpoint = self.db.get(WebhookEndpointModel, endpoint_id)
+        return self._to_domain(db_endpoint) if db_endpoint else None
+
+    async def list_endpoints(self, active_only: bool = False) -> List[WebhookEndpoint]:
+        return self.active_endpoints() if active_only else [
+            self._to_domain(db_endpoint)
+            for db_endpoint in self.db.execute(select(WebhookEndpointModel).order_by(WebhookEndpointModel.id)).scalars()
+        ]
+
+    async def update_endpoint(self, endpoint: WebhookEndpoint) -> WebhookEndpoint:
+        db_endpoint = self.db.get(WebhookEndpointModel, endpoint.id)
+        if db_endpoint:
+            db_endpoint.url = endpoint.url
+            db_endpoint.secret = endpoint.secret
+            db_endpoint.event_types = json.dumps(endpoint.event_types) if endpoint.event_types else None
+            db_endpoint.is_active = endpoint.is_active
+            db_endpoint.max_concurrency = endpoint.max_concurrency
+            if self._safe_commit():
+                self.db.refresh(db_endpoint)
+                return self._to_domain(db_endpoint)
+        raise ValueError("Webhook endpoint not found or update failed")
+
+    async def delete_endpoint(self, endpoint_id: int) -> bool:
+        db_endpoint = self.db.get(WebhookEndpointModel, endpoint_id)
+        if db_endpoint:
+            # Not every dialect enforces ON DELETE CASCADE (SQLite needs a pragma)
+            self.db.execute(delete(WebhookDeliveryModel).where(WebhookDeliveryModel.endpoint_id == endpoint_id))
+            self.db.delete(db_endpoint)
+            return self._safe_commit()
+        return False
+
+    async def list_deliveries(
+        self,
+        endpoint_id: int,
+        status: Optional[str] = None,
+        before_id: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[WebhookDelivery], Optional[int]]:
+        """Newest deliveries first; returns the page and the id to continue before, or None"""
+        statement = (
+            select(WebhookDeliveryModel)
+            .where(WebhookDeliveryModel.endpoint_id == endpoint_id)
+            .order_by(WebhookDeliveryModel.id.desc())
+            .limit(limit + 1)
+        )
+        if status is not None:
+            statement = statement.where(WebhookDeliveryModel.status == status)
+        if before_id is not None:
+            statement = statement.where(WebhookDeliveryModel.id < before_id)
+
+        db_deliveries = self.db.execute(statement).scalars().all()
+        next_before_id = db_deliveries[limit - 1].id if len(db_deliveries) > limit else None
+        return [self._delivery_to_domain(db_delivery) for db_delivery in db_deliveries[:limit]], next_before_id
+
+    async def retry_failed(self, endpoint_id: int) -> int:
+        """Put deliveries that ran out of attempts back in the queue"""
+        result = self.db.execute(
+            update(WebhookDeliveryModel)
+            .where(WebhookDeliveryModel.endpoint_id == endpoint_id, WebhookDeliveryModel.status == FAILED)
+            .values(status=PENDING, attempts=0, next_attempt_at=datetime.now(timezone.utc), last_error=None)
+        )
+        self._commit()
+        return result.rowcount
+
+    # Delivery queue (dispatcher only)
+
+    def active_endpoints(self) -> List[WebhookEndpoint]:
+        statement = select(WebhookEndpointModel).where(WebhookEndpointModel.is_active == True).order_by(WebhookEndpointModel.id)
+        return [self._to_domain(db_endpoint) for db_endpoint in self.db.execute(statement).scalars()]
+
+    def relay(self, source: Session, endpoints: Sequence[WebhookEndpoint], batch_size: int) -> int:
+        """Fan the oldest unrelayed outbox events of ``source`` out into deliveries.
+
+        Deliveries are committed before the events are stamped as relayed; if the
+        stamp is lost the next pass relays them again and the unique constraint
+        drops the duplicates. Events committed while no endpoint wants them are
+        stamped and never delivered.
+        """
+        events = source.execute(
+            select(OutboxEventModel)
+            .where(OutboxEventModel.relayed_at.is_(None))
+            .order_by(OutboxEventModel.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not events:
+            return 0
+        now = datetime.now(timezone.utc)
+        event_ids = [event.id for event in events]
+        rows = [
+            {
+                "endpoint_id": endpoint.id,
+                "event_id": event.event_id,
+                "event_type": event.event_type,
+                "payload": event.payload,
+                "occurred_at": event.created_at,
+                "status": PENDING,
+                "attempts": 0,
+                "next_attempt_at": now
+            }
+            for event in events
+            for endpoint in endpoints
+            if endpoint.wants(event.event_type)
+        ]
+        if rows:
+            _insert_ignoring_duplicates(self.db, rows)
+            self.db.commit()
+        source.execute(
+            update(OutboxEventModel)
+            .where(OutboxEventModel.id.in_(event_ids))
+            .values(relayed_at=now)
+        )
+        source.commit()
+        return len(event_ids)
+
+    def claim(self, endpoint_id: int, batch_size: int, lease: timedelta) -> List[Dict]:
+        """Take up to ``batch_size`` due deliveries for one endpoint, oldest first.
+
+        Claimed rows are pushed ``lease`` into the future, so they come due again
+        if this process dies before recording the outcome. Concurrent dispatchers
+        on PostgreSQL skip each other's rows; elsewhere a row may be sent twice.
+        """
+        now = datetime.now(timezone.utc)
+        rows = self.db.execute(
+            select(
+                WebhookDeliveryModel.id,
+                WebhookDeliveryModel.event_id,
+                WebhookDeliveryModel.event_type,
+                WebhookDeliveryModel.payload,
+                WebhookDeliveryModel.occurred_at,
+                WebhookDeliveryModel.attempts
+            )
+            .where(
+                WebhookDeliveryModel.endpoint_id == endpoint_id,
+                WebhookDeliveryModel.status == PENDING,
+                WebhookDeliveryModel.next_attempt_at <= now
+            )
+            .order_by(WebhookDeliveryModel.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).mappings().all()
+        if rows:
+            self.db.execute(
+                update(WebhookDeliveryModel)
+                .where(WebhookDeliveryModel.id.in_([row["id"] for row in rows]))
+                .values(next_attempt_at=now + lease)
+            )
+        self.db.commit()
+        return [dict(row) for row in rows]
+
+    def record_outcomes(self, outcomes: List[Dict]) -> None:
+        """Apply per-delivery outcomes given as primary-keyed update dicts"""
+        if outcomes:
+            self.db.execute(update(WebhookDeliveryModel), outcomes)
+            self.db.commit()
+
+    def prune_deliveries(self, older_than: datetime) -> int:
+        """Drop delivered and failed deliveries past the retention period"""
+        pruned = self.db.execute(
+            delete(WebhookDeliveryModel).where(or_(
+                and_(WebhookDeliveryModel.status == DELIVERED, WebhookDeliveryModel.delivered_at < older_than),
+                and_(WebhookDeliveryModel.status == FAILED, WebhookDeliveryModel.next_attempt_at < older_than)
+            ))
+        ).rowcount
+        self.db.commit()
+        return pruned
+
+    @staticmethod
+    def prune_outbox(source: Session, older_than: datetime) -> int:
+        """Drop outbox events relayed before ``older_than``"""
+        pruned = source.execute(delete(OutboxEventModel).where(OutboxEventModel.relayed_at < older_than)).rowcount
+        source.commit()
+        return pruned
+
+    def _delivery_to_domain(self, db_delivery: WebhookDeliveryModel) -> WebhookDelivery:
+        return WebhookDelivery(
+            id=db_delivery.id,
+            endpoint_id=db_delivery.endpoint_id,
+            event_id=db_delivery.event_id,
+            event_type=db_delivery.event_type,
+            status=db_delivery.status,
+            attempts=db_delivery.attempts,
+            next_attempt_at=db_delivery.next_attempt_at,
+            last_error=db_delivery.last_error,
+            occurred_at=db_delivery.occurred_at,
+            delivered_at=db_delivery.delivered_at
+        )
+
+    def _to_domain(self, db_endpoint: WebhookEndpointModel) -> WebhookEndpoint:
+        """Convert database model to domain model"""
+        return WebhookEndpoint(
+            id=db_endpoint.id,
+            url=db_endpoint.url,
+            secret=db_endpoint.secret,
+            event_types=json.loads(db_endpoint.event_types) if db_endpoint.event_types else [],
+            is_active=db_endpoint.is_active,
+            max_concurrency=db_endpoint.max_concurrency,
+            created_at=db_endpoint.created_at,
+            updated_at=db_endpoint.updated_at
+        )
+
+    def _to_database(self, endpoint: WebhookEndpoint) -> WebhookEndpointModel:
+        """Convert domain model to database model"""
+        return WebhookEndpointModel(
+            id=endpoint.id,
+            url=endpoint.url,
+            secret=endpoint.secret,
+            event_types=json.dumps(endpoint.event_types) if endpoint.event_types else None,
+            is_active=endpoint.is_active,
+            max_concurrency=endpoint.max_concurrency
+        )
\ No newline at end of file
@@ -0,0 +1,10 @@
+# Infrastructure monitoring package
+from .metrics import registry, MetricsRegistry
+from .readiness import readiness, ReadinessProbe
+
+__all__ = [
+    'registry',
+    'MetricsRegistry',
+    'readiness',
+    'ReadinessProbe'
+]
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Event-loop stall detection.
+
+A heartbeat coroutine wakes every ``interval`` and stamps the time; a watchdog
+thread notices when the stamp goes stale for longer than ``threshold``, which
+means one callback is holding the loop (sync SQLAlchemy, bcrypt, QR rendering,
+blocking I/O...). While the loop is still blocked the thread keeps snapshotting
+the loop thread's stack, so the report points at the blocking calls rather than
+at the code that happened to run next. Once the loop resumes, the stall is
+reported with its full duration and the routes of the request tasks that were
+running.
+
+The first occurrence of each blocking stack is logged in full; repeats log one
+line with the blocking frame, so a hot path that always blocks cannot flood
+the logs. Every stall is counted in metrics by route.
+"""
+import asyncio
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from core.config import settings
+from .service_metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS, EVENT_LOOP_STALL_DURATION
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_ROUTE = "background"
+UNATTRIBUTED_ROUTE = "unattributed"
+# Distinct stacks remembered for the full-vs-short log decision
+MAX_REMEMBERED_STACKS = 1000
+# Routes whose stall counter child is kept at hand; others look it up on each stall
+MAX_REMEMBERED_ROUTES = 1000
+_LIBRARY_PATHS = tuple({os.path.realpath(sysconfig.get_paths()[name]) for name in ("stdlib", "purelib", "platlib")})
+
+
+def _blocking_frame(stack: traceback.StackSummary) -> str:
+    """Innermost frame in our own code, which is where a blocking call is fixed"""
+    for frame in reversed(stack):
+        if not os.path.realpath(frame.filename).startswith(_LIBRARY_PATHS):
+            return f"{frame.name} ({frame.filename}:{frame.lineno})"
+    if stack:
+        return f"{stack[-1].name} ({stack[-1].filename}:{stack[-1].lineno})"
+    return "<unknown>"
+
+
+def _route_of(scope: dict) -> str:
+    # Only the route template: raw paths carry ids and would give the metric a label per URL
+    route = scope.get("route")
+    return route.path if route is not None else UNATTRIBUTED_ROUTE
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and reports callbacks that block the loop for too long"""
+
+    def __init__(self, threshold_ms: float, interval_ms: float):
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        self.stalls = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Time the heartbeat is due next; the loop is stalled once it is overdue by the threshold
+        self._due = 0.0
+        # Request task -> ASGI scope, read from the watchdog thread to name the blocked route
+        self._requests: Dict[asyncio.Task, dict] = {}
+        self._seen_stacks = set()
+        # Route -> its stall counter child
+        self._route_children = {}
+
+    def track(self, scope: dict) -> Optional[asyncio.Task]:
+        """Attribute stalls in the current task to this request until ``untrack`` is called"""
+        task = asyncio.current_task()
+        if task is not None:
+            self._requests[task] = scope
+        return task
+
+    def untrack(self, task: Optional[asyncio.Task]) -> None:
+        if task is not None:
+            self._requests.pop(task, None)
+
+    def start(self) -> None:
+        """Start watching the running loop; call from a coroutine on that loop"""
+        if self._heartbeat is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._due = time.monotonic() + self.interval
+        self._stop.clear()
+        self._heartbeat = self._loop.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if self._heartbeat is None:
+            return
+        self._stop.set()
+        self._heartbeat.cancel()
+        try:
+            await self._heartbeat
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat = None
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(0.0, now - self._due))
+            self._due = now + self.interval
+
+    def _watch(self) -> None:
+        # Poll several times per threshold so the stack is taken early in the stall
+        poll = max(min(self.threshold, self.interval) / 4, 0.001)
+        stalled_since = None
+        samples = {}
+        previous = None
+        while not self._stop.wait(poll):
+            due = self._due
+            if stalled_since is None:
+                if time.monotonic() - due < self.threshold:
+                    continue
+                stalled_since = due
+            elif due != stalled_since:
+                # The heartbeat ran again: the stall is over and _due now holds the resume time
+                self._report(due - self.interval - stalled_since, list(samples.values()))
+                stalled_since = previous = None
+                samples = {}
+                continue
+            # Keep sampling: back-to-back blocking callbacks of several requests show up as one
+            # stall. Past the first sample, only stacks seen twice in a row count as blocking;
+            # a single hit is usually the loop passing between callbacks.
+            sample = self._sample()
+            if sample is None:
+                continue
+            route, stack = sample
+            key = (route, tuple((frame.filename, frame.lineno) for frame in stack))
+            if not samples or key == previous:
+                samples.setdefault(key, (route, stack))
+            previous = key
+
+    def _sample(self):
+        """Stack of the loop thread and the route of the task it is running, taken mid-stall.
+
+        None when the loop is polling its selector: it is between callbacks, not blocked.
+        """
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None or os.path.basename(frame.f_code.co_filename) == "selectors.py":
+            return None
+        stack = traceback.extract_stack(frame)
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        if task is None:
+            route = BACKGROUND_ROUTE
+        else:
+            scope = self._requests.get(task)
+            route = _route_of(scope) if scope is not None else UNATTRIBUTED_ROUTE
+        return route, stack
+
+    def _report(self, duration: float, samples) -> None:
+        self.stalls += 1
+        EVENT_LOOP_STALL_DURATION.observe(duration)
+        for route in dict.fromkeys(route for route, _ in samples):
+            child = self._route_children.get(route)
+            if child is None:
+                child = EVENT_LOOP_STALLS.labels(route)
+                if len(self._route_children) < MAX_REMEMBERED_ROUTES:
+                    self._route_children[route] = child
+            child.inc()
+
+        for route, stack in samples:
+            key = tuple((frame.filename, frame.lineno) for frame in stack)
+            blocking_frame = _blocking_frame(stack)
+            if key in self._seen_stacks:
+                logger.warning("Event loop blocked for %.1f ms on %s in %s", duration * 1000, route, blocking_frame)
+                continue
+            if len(self._seen_stacks) < MAX_REMEMBERED_STACKS:
+                self._seen_stacks.add(key)
+            logger.warning(
+                "Event loop blocked for %.1f ms on %s in %s; stack of the blocking call:\n%s",
+                duration * 1000, route, blocking_frame, "".join(stack.format())
+            )
+
+    def stats(self) -> dict:
+        return {
+            "running": self._heartbeat is not None,
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.stalls,
+            "tracked_requests": len(self._requests),
+        }
+
+
+loop_watchdog = LoopWatchdog(
+    threshold_ms=settings.LOOP_WATCHDOG_THRESHOLD_MS,
+    interval_ms=settings.LOOP_WATCHDOG_INTERVAL_MS
+)
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Per-request SQL statement accounting.
+
+Engine events attribute every cursor execution to the request bound in the
+current context, log slow statements with their route and, when enabled,
+warn when one statement shape repeats enough times to look like an N+1.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from .service_metrics import DB_QUERIES_PER_REQUEST, DB_SLOW_QUERIES
+
+logger = logging.getLogger(__name__)
+
+# Collapse expanded IN lists so "IN (?, ?)" and "IN (?, ?, ?)" count as the same shape
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+)\s*\)")
+
+
+class RequestQueryStats:
+    """Statement count and database time accumulated for one request"""
+
+    __slots__ = ("scope", "count", "total_time", "shapes", "flagged")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+        self.flagged = set()
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route") if self.scope else None
+        if route is not None:
+            return route.path
+        return self.scope.get("path", "-") if self.scope else "-"
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def begin_request(scope: Optional[dict] = None):
+    """Start collecting statements for the current request; returns the stats and a reset token"""
+    stats = RequestQueryStats(scope)
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        DB_QUERIES_PER_REQUEST.observe(stats.count)
+    _current_stats.reset(token)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+def instrument_queries(engine, slow_query_ms: float, detect_n_plus_one: bool, n_plus_one_threshold: int) -> None:
+    """Attach statement timing hooks to the engine"""
+    slow_threshold = slow_query_ms / 1000.0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which is dropped with the statement even when it raises
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        stats = _current_stats.get()
+
+        if elapsed >= slow_threshold:
+            DB_SLOW_QUERIES.inc()
+            logger.warning(
+                "Slow query (%.1f ms) on %s: %s",
+                elapsed * 1000, stats.route if stats else "-", statement
+            )
+
+        if stats is None:
+            return
+        stats.count += 1
+        stats.total_time += elapsed
+
+        if detect_n_plus_one:
+            shape = _IN_LIST.sub("(?)", statement)
+            stats.shapes[shape] += 1
+            if stats.shapes[shape] > n_plus_one_threshold and shape not in stats.flagged:
+                stats.flagged.add(shape)
+                logger.warning(
+                    "Possible N+1 on %s: statement ran more than %d times in one request: %s",
+                    stats.route, n_plus_one_threshold, shape
+                )
@@ -0,0 +1,150 @@
+"""
+Readiness probe for load balancers and orchestrators.
+
+The database ping is cached and rate limited: concurrent probes share one
+ping and no more than one runs per ``db_check_interval`` seconds, so probing
+a fleet does not add database load. The primary and every shard are pinged in
+parallel, and a ping that has not answered within ``db_ping_timeout`` counts
+as a failure, so a saturated pool cannot hold the probe for its checkout
+timeout. Pool saturation and worker queue depths are read from in-process
+counters and are free to check.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Sequence
+
+from sqlalchemy import text
+
+from core.config import settings
+from core.database import engine
+from core.sharding import shard_router
+from infrastructure.services.password_service import PasswordService
+from infrastructure.services.password_rehash_service import password_rehash_service
+from infrastructure.services.audit_service import audit_log
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessProbe:
+    def __init__(self, engine, shard_engines: Sequence = (), db_check_interval: float = 5.0,
+                 db_ping_timeout: float = 1.0, pool_saturation_threshold: float = 0.9, max_queue_depth: int = 50):
+        self.engine = engine
+        self.engines = [engine, *shard_engines]
+        self.db_check_interval = db_check_interval
+        self.db_ping_timeout = db_ping_timeout
+        self.pool_saturation_threshold = pool_saturation_threshold
+        self.max_queue_depth = max_queue_depth
+        self._queues: Dict[str, Callable[[], int]] = {}
+        self._db_lock = threading.Lock()
+        self._db_result: Optional[dict] = None
+        self._db_checked_at = 0.0
+        # One thread per database; a ping still stuck on a checkout is waited on again, never doubled up
+        self._ping_executor = ThreadPoolExecutor(max_workers=len(self.engines), thread_name_prefix="readiness-ping")
+        self._pings: Dict[int, Future] = {}
+        self._warmed_up = False
+
+    def register_queue(self, name: str, depth: Callable[[], int]) -> None:
+        """Report a background worker queue; too deep a backlog marks the instance unready"""
+        self._queues[name] = depth
+
+    def mark_warmed_up(self) -> None:
+        self._warmed_up = True
+
+    @property
+    def warmed_up(self) -> bool:
+        return self._warmed_up
+
+    def pool_status(self) -> dict:
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout"):
+            # Non-queue pools (e.g. NullPool) cannot saturate
+            return {"checked_out": 0, "capacity": None, "saturation": 0.0}
+        checked_out = pool.checkedout()
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        capacity = None if max_overflow < 0 else pool.size() + max_overflow
+        saturation = checked_out / capacity if capacity else 0.0
+        return {"checked_out": checked_out, "capacity": capacity, "saturation": round(saturation, 3)}
+
+    def db_status(self, pool_saturated: bool) -> dict:
+        now = time.monotonic()
+        if self._db_result is not None and now - self._db_checked_at < self.db_check_interval:
+            return self._db_result
+        if pool_saturated and self._db_result is not None:
+            # A checkout would block until the pool timeout; report the last known state instead
+            return self._db_result
+        if not self._db_lock.acquire(blocking=False):
+            # Another probe is pinging right now; don't queue up behind it
+            return self._db_result or {"reachable": None, "latency_ms": None, "checked_at": None}
+        try:
+            for index, db_engine in enumerate(self.engines):
+                ping = self._pings.get(index)
+                if ping is None or ping.done():
+                    self._pings[index] = self._ping_executor.submit(self._ping, index, db_engine)
+            wait(self._pings.values(), timeout=self.db_ping_timeout)
+            results = [
+                ping.result() if ping.done() else {"reachable": False, "latency_ms": None, "timed_out": True}
+                for _, ping in sorted(self._pings.items())
+            ]
+            self._db_checked_at = time.monotonic()
+            self._db_result = {
+                "reachable": all(result["reachable"] for result in results),
+                "latency_ms": results[0]["latency_ms"],
+                "checked_at": time.time()
+            }
+            if len(results) > 1:
+                self._db_result["shards"] = results[1:]
+            return self._db_result
+        finally:
+            self._db_lock.release()
+
+    @staticmethod
+    def _ping(index: int, db_engine) -> dict:
+        start = time.perf_counter()
+        try:
+            with db_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            reachable = True
+        except Exception as e:
+            logger.warning("Readiness ping of %s failed: %s", f"shard {index - 1}" if index else "primary database", e)
+            reachable = False
+        return {"reachable": reachable, "latency_ms": round((time.perf_counter() - start) * 1000, 3)}
+
+    def check(self) -> dict:
+        """Collect every signal and decide whether this instance should receive traffic"""
+        pool = self.pool_status()
+        pool_saturated = pool["saturation"] >= self.pool_saturation_threshold
+        db = self.db_status(pool_saturated)
+        queues = {name: depth() for name, depth in self._queues.items()}
+
+        reasons = []
+        if not self._warmed_up:
+            reasons.append("warming_up")
+        if db.get("reachable") is False:
+            reasons.append("database_unreachable")
+        if pool_saturated:
+            reasons.append("db_pool_saturated")
+        reasons.extend(f"{name}_backlog" for name, depth in queues.items() if depth > self.max_queue_depth)
+
+        return {
+            "ready": not reasons,
+            "reasons": reasons,
+            "warmed_up": self._warmed_up,
+            "database": db,
+            "pool": pool,
+            "queues": queues
+        }
+
+
+readiness = ReadinessProbe(
+    engine,
+    shard_engines=shard_router.engines if shard_router is not None else (),
+    db_check_interval=settings.READINESS_DB_CHECK_INTERVAL_SECONDS,
+    db_ping_timeout=settings.READINESS_DB_PING_TIMEOUT_SECONDS,
+    pool_saturation_threshold=settings.READINESS_POOL_SATURATION_THRESHOLD,
+    max_queue_depth=settings.READINESS_MAX_QUEUE_DEPTH
+)
+readiness.register_queue("password_hash", lambda: PasswordService.pool_stats()["queued"])
+readiness.register_queue("password_rehash", password_rehash_service.pending)
+readiness.register_queue("audit_batches", audit_log.backlog_batches)
\ No newline at end of file
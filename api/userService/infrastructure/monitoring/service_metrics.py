@@ -0,0 +1,199 @@
+"""
+Metric families exported by the user service.
+
+Label children that are known up front are bound here once so callers only
+pay for the increment.
+"""
+import time
+
+from infrastructure.services.password_service import PasswordService
+from infrastructure.services.password_rehash_service import password_rehash_service
+from infrastructure.services.audit_service import audit_log
+from infrastructure.services.webhook_dispatcher import webhook_dispatcher
+from infrastructure.cache.token_cache import token_cache
+from .metrics import registry
+
+# HTTP
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code",
+    ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served"
+)
+
+# Database connection pool
+DB_POOL_WAIT = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the SQLAlchemy pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+)
+DB_SLOW_QUERIES = registry.counter(
+    "db_slow_queries_total",
+    "SQL statements slower than the configured slow-query threshold"
+)
+
+# Event loop
+EVENT_LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the loop heartbeat was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+EVENT_LOOP_STALLS = registry.counter(
+    "event_loop_stalls_total",
+    "Times one callback blocked the event loop longer than the watchdog threshold, by route",
+    ("route",)
+)
+EVENT_LOOP_STALL_DURATION = registry.histogram(
+    "event_loop_stall_seconds",
+    "How long the event loop stayed blocked, per detected stall",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+# Business counters
+REGISTRATIONS = registry.counter("registrations_total", "User registrations by outcome", ("outcome",))
+REGISTRATIONS_SUCCEEDED = REGISTRATIONS.labels("success")
+REGISTRATIONS_FAILED = REGISTRATIONS.labels("failure")
+
+LOGINS = registry.counter("login_attempts_total", "Login attempts by outcome", ("outcome",))
+LOGINS_SUCCEEDED = LOGINS.labels("success")
+LOGINS_FAILED = LOGINS.labels("failure")
+
+OTP_REQUESTS = registry.counter("otp_requests_total", "OTP requests by purpose and outcome", ("purpose", "outcome"))
+OTP_VERIFICATIONS = registry.counter("otp_verifications_total", "OTP verifications by outcome", ("outcome",))
+OTP_VERIFICATIONS_SUCCEEDED = OTP_VERIFICATIONS.labels("success")
+OTP_VERIFICATIONS_FAILED = OTP_VERIFICATIONS.labels("failure")
+
+# Password hashing policy
+PASSWORD_HASH_CHECKS = registry.counter(
+    "password_hash_checks_total",
+    "Successful password verifications by whether the stored hash matched the current policy",
+    ("policy",)
+)
+PASSWORD_HASH_CHECKS_CURRENT = PASSWORD_HASH_CHECKS.labels("current")
+PASSWORD_HASH_CHECKS_OUTDATED = PASSWORD_HASH_CHECKS.labels("outdated")
+PASSWORD_REHASHES = registry.counter(
+    "password_rehashes_total",
+    "Background rehashes to the current policy by outcome",
+    ("outcome",)
+)
+
+# Audit trail
+AUDIT_EVENTS = registry.counter("audit_events_total", "Audit events by stage", ("stage",))
+AUDIT_EVENTS_QUEUED = AUDIT_EVENTS.labels("queued")
+AUDIT_EVENTS_DROPPED = AUDIT_EVENTS.labels("dropped")
+AUDIT_EVENTS_WRITTEN = AUDIT_EVENTS.labels("written")
+AUDIT_EVENTS_FAILED = AUDIT_EVENTS.labels("failed")
+
+registry.callback_gauge(
+    "audit_queue_depth",
+    "Audit events waiting to be written",
+    lambda: [((), audit_log.depth())]
+)
+
+# Webhooks
+WEBHOOK_EVENTS_RELAYED = registry.counter(
+    "webhook_events_relayed_total",
+    "Outbox events fanned out to webhook deliveries"
+)
+WEBHOOK_DELIVERIES = registry.counter(
+    "webhook_deliveries_total",
+    "Webhook event deliveries by outcome of the attempt",
+    ("outcome",)
+)
+WEBHOOK_DELIVERIES_DELIVERED = WEBHOOK_DELIVERIES.labels("delivered")
+WEBHOOK_DELIVERIES_RETRIED = WEBHOOK_DELIVERIES.labels("retried")
+WEBHOOK_DELIVERIES_FAILED = WEBHOOK_DELIVERIES.labels("failed")
+WEBHOOK_BATCH_DURATION = registry.histogram(
+    "webhook_batch_duration_seconds",
+    "Time to POST one batch of events to a webhook endpoint"
+)
+
+registry.callback_gauge(
+    "webhook_batches_in_flight",
+    "Webhook batches being sent",
+    lambda: [((), webhook_dispatcher.in_flight())]
+)
+
+
+def _token_cache_samples(*fields):
+    def samples():
+        stats = token_cache.stats()
+        return [((field,), stats[field]) for field in fields]
+    return samples
+
+
+registry.callback_gauge(
+    "token_cache_entries",
+    "Internal introspection cache entries by kind",
+    _token_cache_samples("claims", "principals"),
+    ("kind",)
+)
+registry.callback_counter(
+    "token_cache_principal_lookups_total",
+    "Principal lookups answered by the introspection cache, by result",
+    _token_cache_samples("hits", "misses"),
+    ("result",)
+)
+
+
+def _password_pool_samples():
+    stats = PasswordService.pool_stats()
+    return [(("queued",), stats["queued"]), (("active",), stats["active"]), (("workers",), stats["workers"])]
+
+
+registry.callback_gauge(
+    "password_hash_pool_jobs",
+    "bcrypt hashing pool jobs by state",
+    _password_pool_samples,
+    ("state",)
+)
+
+
+def _stored_hash_samples():
+    return [((policy,), count) for policy, count in password_rehash_service.policy_stats()]
+
+
+registry.callback_gauge(
+    "password_hashes_stored",
+    "Stored password hashes by whether they match the current hashing policy",
+    _stored_hash_samples,
+    ("policy",)
+)
+
+
+def instrument_engine(engine) -> None:
+    """Export pool occupancy gauges and time pool checkouts for the given engine"""
+    pool = engine.pool
+    connect = pool.connect
+    observe = DB_POOL_WAIT.observe
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+
+    def pool_samples():
+        samples = []
+        for state, reader in (("checked_out", "checkedout"), ("overflow", "overflow"), ("size", "size")):
+            if hasattr(engine.pool, reader):
+                samples.append(((state,), getattr(engine.pool, reader)()))
+        return samples
+
+    registry.callback_gauge(
+        "db_pool_connections",
+        "SQLAlchemy connection pool occupancy by state",
+        pool_samples,
+        ("state",)
+    )
\ No newline at end of file
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from core.config import settings
+from core.database import SessionLocal
+from domain.models.audit_event import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+# Wakes the writer on shutdown
+_STOP = object()
+
+
+class AuditLog:
+    """
+    Non-blocking audit trail.
+
+    ``record`` only appends to a bounded in-memory queue; a background task
+    drains it and writes each batch with one INSERT from a worker thread. When
+    the queue is full the configured policy drops either the new event or the
+    oldest queued one, so a slow database never stalls request handling.
+    Events still queued when the process dies are lost.
+    """
+
+    def __init__(self, max_queue_size: int = 10000, batch_size: int = 200, flush_interval: float = 1.0,
+                 drop_policy: str = DROP_NEWEST, enabled: bool = True, max_write_attempts: int = 3):
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown audit drop policy: {drop_policy}")
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.enabled = enabled
+        self.max_write_attempts = max_write_attempts
+        # Created in start() so it belongs to the serving event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def record(self, action: str, outcome: str = "success", actor_user_id: Optional[int] = None,
+               subject_user_id: Optional[int] = None, **details) -> bool:
+        """Enqueue an event; returns False if it was dropped. Call from the event loop thread."""
+        from infrastructure.monitoring.service_metrics import AUDIT_EVENTS_QUEUED, AUDIT_EVENTS_DROPPED
+
+        if not self.enabled:
+            return False
+        if self._queue is None or self._stopping:
+            AUDIT_EVENTS_DROPPED.inc()
+            return False
+        event = AuditEvent(
+            action=action,
+            outcome=outcome,
+            actor_user_id=actor_user_id,
+            subject_user_id=subject_user_id,
+            details=details,
+            created_at=datetime.now(timezone.utc)
+        )
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            AUDIT_EVENTS_DROPPED.inc()
+            if self.drop_policy == DROP_NEWEST:
+                return False
+            self._queue.get_nowait()
+            self._queue.put_nowait(event)
+        AUDIT_EVENTS_QUEUED.inc()
+        return True
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def backlog_batches(self) -> int:
+        """Full batches waiting beyond the one being collected; grows only if writes fall behind"""
+        return self.depth() // self.batch_size
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Flush what is queued, waiting at most ``timeout`` seconds"""
+        if self._task is None:
+            return
+        self._stopping = True
+        try:
+            self._queue.put_nowait(_STOP)
+        except asyncio.QueueFull:
+            # The writer is busy with a backlog, not waiting on the queue
+            pass
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Audit log shutdown timed out; %d events not written", self.depth())
+        finally:
+            self._task = None
+            self._queue = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            if batch:
+                await self._write(batch)
+            if self._stopping and self._queue.empty():
+                return
+
+    async def _next_batch(self) -> List[AuditEvent]:
+        items = [await self._queue.get()]
+        if not self._stopping and self._queue.qsize() < self.batch_size - 1:
+            # Let a batch accumulate rather than inserting one row per event
+            await asyncio.sleep(self.flush_interval)
+        while len(items) < self.batch_size and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return [item for item in items if item is not _STOP]
+
+    async def _write(self, batch: List[AuditEvent]) -> None:
+        from infrastructure.monitoring.service_metrics import AUDIT_EVENTS_WRITTEN, AUDIT_EVENTS_FAILED
+
+        for attempt in range(1, self.max_write_attempts + 1):
+            try:
+                await asyncio.to_thread(self._insert, batch)
+            except Exception:
+                logger.exception("Audit batch of %d events failed (attempt %d)", len(batch), attempt)
+                if attempt < self.max_write_attempts and not self._stopping:
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+                continue
+            AUDIT_EVENTS_WRITTEN.inc(len(batch))
+            return
+        AUDIT_EVENTS_FAILED.inc(len(batch))
+
+    @staticmethod
+    def _insert(batch: List[AuditEvent]) -> None:
+        from infrastructure.db.audit_repository_impl import SQLAuditRepository
+
+        db = SessionLocal()
+        try:
+            # Runs in a worker thread, off the event loop
+            asyncio.run(SQLAuditRepository(db).add_many(batch))
+        finally:
+            db.close()
+
+
+audit_log = AuditLog(
+    max_queue_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    drop_policy=settings.AUDIT_DROP_POLICY,
+    enabled=settings.AUDIT_ENABLED
+)
\ No newline at end of file
@@ -32,6 +32,21 @@ class AuthService:
         """Verify a plain text password against a hashed password."""
         return PasswordService.verify_password(plain_password, hashed_password)
     
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash a plain text password without blocking the event loop."""
+        return await PasswordService.hash_password_async(password)
+    
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop."""
+        return await PasswordService.verify_password_async(plain_password, hashed_password)
+    
+    @staticmethod
+    def password_needs_update(hashed_password: str) -> bool:
+        """Check whether a stored hash should be upgraded to the current policy."""
+        return PasswordService.needs_update(hashed_password)
+    
     # JWT operations
     @staticmethod
     def create_access_token(data: dict, expires_delta=None) -> str:
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import List, Optional, Set, Tuple
+
+from core.config import settings
+from .password_service import PasswordService
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordRehashService:
+    """Upgrades stored password hashes to the current policy after a successful login."""
+
+    def __init__(self, stats_ttl_seconds: int = 300):
+        self.stats_ttl_seconds = stats_ttl_seconds
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats_lock = threading.Lock()
+        self._stats: Optional[List[Tuple[str, int]]] = None
+        self._stats_expires_at = 0.0
+
+    def schedule(self, user_id: int, plain_password: str, old_hash: str) -> None:
+        """Rehash in the background so the login response is not delayed."""
+        task = asyncio.get_running_loop().create_task(self._rehash(user_id, plain_password, old_hash))
+        # Keep a strong reference until the task finishes, the loop only holds weak ones
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def pending(self) -> int:
+        """Rehash tasks that have not finished yet."""
+        return len(self._tasks)
+
+    async def _rehash(self, user_id: int, plain_password: str, old_hash: str) -> None:
+        from infrastructure.db.sharded_repositories import open_user_repository
+        from infrastructure.monitoring.service_metrics import PASSWORD_REHASHES
+
+        try:
+            new_hash = await PasswordService.hash_password_async(plain_password)
+            with open_user_repository() as user_repo:
+                # Compare-and-set: a password changed concurrently must not be overwritten
+                updated = await user_repo.update_password_hash(user_id, old_hash, new_hash)
+        except Exception:
+            logger.exception("Password rehash failed for user %s", user_id)
+            PASSWORD_REHASHES.labels("failure").inc()
+            return
+        PASSWORD_REHASHES.labels("success" if updated else "conflict").inc()
+
+    def policy_stats(self) -> List[Tuple[str, int]]:
+        """Stored hashes per policy ("current" / "outdated"), cached between scrapes."""
+        with self._stats_lock:
+            now = time.monotonic()
+            if self._stats is None or now >= self._stats_expires_at:
+                self._stats = self._count_by_policy()
+                self._stats_expires_at = now + self.stats_ttl_seconds
+            return self._stats
+
+    def _count_by_policy(self) -> List[Tuple[str, int]]:
+        from infrastructure.db.sharded_repositories import open_user_repository
+
+        counts = {"current": 0, "outdated": 0}
+        try:
+            with open_user_repository() as user_repo:
+                # Hashes sharing a parameter string share scheme and cost, so one sample classifies the group
+                groups = user_repo.count_password_hashes(PasswordService.hash_parameters)
+        except Exception:
+            logger.exception("Could not count stored password hashes by policy")
+            return list(counts.items())
+        for _parameters, count, sample in groups:
+            try:
+                outdated = PasswordService.needs_update(sample)
+            except ValueError:
+                # Unrecognised hash format can never verify under the current policy
+                outdated = True
+            counts["outdated" if outdated else "current"] += count
+        return list(counts.items())
+
+
+password_rehash_service = PasswordRehashService(stats_ttl_seconds=settings.PASSWORD_POLICY_STATS_TTL_SECONDS)
\ No newline at end of file
@@ -1,17 +1,93 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from core.config import settings
+
+# Password hashing context built from the configured policy. Pinning min/max rounds to the
+# configured cost makes needs_update() flag hashes created under an older cost in either direction.
+pwd_context = CryptContext(
+    schemes=settings.PASSWORD_HASH_SCHEMES,
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+    argon2__parallelism=settings.ARGON2_PARALLELISM
+)
+
+# bcrypt is CPU bound and releases the GIL, so it runs on a dedicated pool instead of the event loop
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_queue_lock = threading.Lock()
+_queued = 0
+_active = 0
+
+
+def _track(func, *args):
+    global _queued, _active
+    with _queue_lock:
+        _queued -= 1
+        _active += 1
+    try:
+        return func(*args)
+    finally:
+        with _queue_lock:
+            _active -= 1
+
+
+async def _run_in_hash_pool(func, *args):
+    global _queued
+    with _queue_lock:
+        _queued += 1
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, _track, func, *args)
+
 
 class PasswordService:
     """Service responsible for password hashing and verification operations."""
-    
+
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a plain text password."""
         return pwd_context.hash(password)
-    
+
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a plain text password against a hashed password."""
-        return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+        return pwd_context.verify(plain_password, hashed_password)
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash a plain text password on the hashing pool."""
+        return await _run_in_hash_pool(pwd_context.hash, password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the hashing pool."""
+        return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+    @staticmethod
+    def hash_parameters(hashed_password: str) -> str:
+        """Leading part of a hash naming its scheme and cost, i.e. everything before the salt."""
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or parts[0]:
+            # Not in modular crypt format; grouped together and classified by one sample
+            return ""
+        # bcrypt keeps salt and digest in one field ($2b$12$<salt><digest>), other schemes in two
+        salt_index = len(parts) - 1 if parts[1].startswith("2") else len(parts) - 2
+        return "$".join(parts[:salt_index]) + "$"
+
+    @staticmethod
+    def needs_update(hashed_password: str) -> bool:
+        """Check whether a hash was created under an outdated scheme or cost."""
+        return pwd_context.needs_update(hashed_password)
+
+    @staticmethod
+    def pool_stats() -> dict:
+        """Jobs waiting for a hashing thread and jobs currently running."""
+        return {"queued": _queued, "active": _active, "workers": settings.PASSWORD_HASH_WORKERS}
\ No newline at end of file
@@ -0,0 +1,303 @@
+"""
+Webhook delivery of user and role change events.
+
+A background task moves events from the transactional outbox of every user
+database (the primary, or each shard) into per-endpoint deliveries on the
+primary, then POSTs due deliveries to each endpoint in batches of up to
+``batch_size`` events, with up to ``max_concurrency`` batches in flight per
+endpoint. A failed batch is retried with exponential backoff and jitter until
+``max_attempts``, after which its deliveries are marked failed (the admin API
+can requeue them).
+
+Delivery is at least once and unordered across batches: receivers dedupe on
+the event ``id``. Each request is signed so receivers can reject forgeries::
+
+    X-Webhook-Timestamp: <unix seconds>
+    X-Webhook-Signature: sha256=<hex HMAC-SHA256 of "<timestamp>.<body>" keyed by the endpoint secret>
+
+Commits that write outbox events wake the dispatcher in this process; events
+written by other processes are picked up at the next poll.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from core.config import settings
+from core.database import SessionLocal
+from core.sharding import shard_router
+from domain.models.webhook import WebhookEndpoint, PENDING, DELIVERED, FAILED
+from infrastructure.db import outbox
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_HEADER = "X-Webhook-Timestamp"
+SIGNATURE_HEADER = "X-Webhook-Signature"
+# Finished deliveries and relayed outbox rows are pruned at most this often
+PRUNE_INTERVAL_SECONDS = 600.0
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def _isoformat(value: datetime) -> str:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+class WebhookDispatcher:
+    """Relays outbox events to webhook endpoints from a background task"""
+
+    def __init__(self, poll_interval: float = 1.0, batch_size: int = 100, timeout: float = 10.0,
+                 max_attempts: int = 8, retry_base: float = 2.0, retry_max: float = 3600.0,
+                 retention_hours: float = 168.0, enabled: bool = True,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.retention = timedelta(hours=retention_hours)
+        self.enabled = enabled
+        # Where batches are sent; None is the network (tests pass an in-process transport)
+        self.transport = transport
+        # Claimed deliveries come due again after this if the outcome is never recorded
+        self.lease = timedelta(seconds=max(60.0, 4 * timeout))
+        # Created in start() so they belong to the serving event loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Endpoint id -> batches being sent to it
+        self._in_flight: Dict[int, Set[asyncio.Task]] = {}
+        self._last_prune = 0.0
+        outbox.on_commit(self.wake)
+
+    def wake(self) -> None:
+        """Relay and send now rather than at the next poll; safe to call from any thread"""
+        loop = self._loop
+        if loop is None or self._wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # The loop closed under us during shutdown
+            pass
+
+    def in_flight(self) -> int:
+        return sum(len(tasks) for tasks in self._in_flight.values())
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._client = httpx.AsyncClient(timeout=self.timeout, transport=self.transport)
+        self._stopping = False
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop polling and give batches in flight ``timeout`` seconds to finish"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        sends = [task for tasks in self._in_flight.values() for task in tasks]
+        try:
+            await asyncio.wait_for(asyncio.gather(self._task, *sends, return_exceptions=True), timeout)
+        except asyncio.TimeoutError:
+            # Unfinished batches stay claimed until their lease runs out, then go out again
+            logger.warning("Webhook dispatcher shutdown timed out; %d batches abandoned", self.in_flight())
+        finally:
+            await self._client.aclose()
+            self._task = None
+            self._client = None
+            self._wake = None
+            self._loop = None
+            self._in_flight.clear()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wake.clear()
+            backlog = False
+            try:
+                endpoints, backlog = await asyncio.to_thread(self._relay)
+                await self._dispatch(endpoints)
+                if time.monotonic() - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+                    self._last_prune = time.monotonic()
+                    await asyncio.to_thread(self._prune)
+            except Exception:
+                logger.exception("Webhook dispatch pass failed")
+            if backlog or self._stopping:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _relay(self) -> Tuple[List[WebhookEndpoint], bool]:
+        """Fan out committed events; returns the active endpoints and whether a source has more waiting"""
+        from infrastructure.db.webhook_repository_impl import SQLWebhookRepository
+        from infrastructure.monitoring.service_metrics import WEBHOOK_EVENTS_RELAYED
+
+        db = SessionLocal()
+        try:
+            repo = SQLWebhookRepository(db)
+            endpoints = repo.active_endpoints()
+            counts = [repo.relay(db, endpoints, self.batch_size)]
+            for shard in range(len(shard_router) if shard_router is not None else 0):
+                source = shard_router.session(shard)
+                try:
+                    counts.append(repo.relay(source, endpoints, self.batch_size))
+                finally:
+                    source.close()
+        finally:
+            db.close()
+        WEBHOOK_EVENTS_RELAYED.inc(sum(counts))
+        return endpoints, max(counts) >= self.batch_size
+
+    async def _dispatch(self, endpoints: List[WebhookEndpoint]) -> None:
+        for endpoint in endpoints:
+            tasks = self._in_flight.setdefault(endpoint.id, set())
+            while len(tasks) < endpoint.max_concurrency and not self._stopping:
+                batch = await asyncio.to_thread(self._claim, endpoint.id)
+                if not batch:
+                    break
+                task = self._loop.create_task(self._send(endpoint, batch))
+                tasks.add(task)
+                task.add_done_callback(lambda done, tasks=tasks: self._sent(tasks, done))
+
+    def _sent(self, tasks: Set[asyncio.Task], task: asyncio.Task) -> None:
+        tasks.discard(task)
+        if self._wake is not None:
+            # A slot is free: claim the endpoint's next batch without waiting for the poll
+            self._wake.set()
+
+    def _claim(self, endpoint_id: int) -> List[Dict]:
+        from infrastructure.db.webhook_repository_impl import SQLWebhookRepository
+
+        db = SessionLocal()
+        try:
+            return SQLWebhookRepository(db).claim(endpoint_id, self.batch_size, self.lease)
+        finally:
+            db.close()
+
+    async def _send(self, endpoint: WebhookEndpoint, batch: List[Dict]) -> None:
+        from infrastructure.monitoring.service_metrics import WEBHOOK_BATCH_DURATION
+
+        body = json.dumps({
+            "events": [
+                {
+                    "id": delivery["event_id"],
+                    "type": delivery["event_type"],
+                    "occurred_at": _isoformat(delivery["occurred_at"]),
+                    "data": json.loads(delivery["payload"])
+                }
+                for delivery in batch
+            ]
+        }, separators=(",", ":")).encode()
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            TIMESTAMP_HEADER: timestamp,
+            SIGNATURE_HEADER: sign(endpoint.secret, timestamp, body)
+        }
+
+        error = None
+        started = time.perf_counter()
+        try:
+            response = await self._client.post(endpoint.url, content=body, headers=headers)
+            if not response.is_success:
+                error = f"HTTP {response.status_code}"
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        WEBHOOK_BATCH_DURATION.observe(time.perf_counter() - started)
+        if error is not None:
+            logger.warning("Webhook batch of %d events to %s failed: %s", len(batch), endpoint.url, error)
+
+        try:
+            await asyncio.to_thread(self._record, self._outcomes(batch, error))
+        except Exception:
+            # The claim lease runs out and the batch is sent again
+            logger.exception("Could not record webhook outcomes for endpoint %d", endpoint.id)
+
+    def _outcomes(self, batch: List[Dict], error: Optional[str]) -> List[Dict]:
+        from infrastructure.monitoring.service_metrics import (
+            WEBHOOK_DELIVERIES_DELIVERED, WEBHOOK_DELIVERIES_RETRIED, WEBHOOK_DELIVERIES_FAILED
+        )
+
+        now = datetime.now(timezone.utc)
+        outcomes = []
+        for delivery in batch:
+            attempts = delivery["attempts"] + 1
+            if error is None:
+                outcome = {"status": DELIVERED, "delivered_at": now, "last_error": None}
+            elif attempts >= self.max_attempts:
+                outcome = {"status": FAILED, "next_attempt_at": now, "last_error": error}
+            else:
+                delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+                # Jitter so endpoints coming back up are not hit by every retry at once
+                delay *= 0.5 + random.random() / 2
+                outcome = {"status": PENDING, "next_attempt_at": now + timedelta(seconds=delay), "last_error": error}
+            outcomes.append({"id": delivery["id"], "attempts": attempts, **outcome})
+
+        if error is None:
+            WEBHOOK_DELIVERIES_DELIVERED.inc(len(batch))
+        else:
+            failed = sum(1 for outcome in outcomes if outcome["status"] == FAILED)
+            WEBHOOK_DELIVERIES_FAILED.inc(failed)
+            WEBHOOK_DELIVERIES_RETRIED.inc(len(batch) - failed)
+        return outcomes
+
+    @staticmethod
+    def _record(outcomes: List[Dict]) -> None:
+        from infrastructure.db.webhook_repository_impl import SQLWebhookRepository
+
+        db = SessionLocal()
+        try:
+            SQLWebhookRepository(db).record_outcomes(outcomes)
+        finally:
+            db.close()
+
+    def _prune(self) -> None:
+        from infrastructure.db.webhook_repository_impl import SQLWebhookRepository
+
+        older_than = datetime.now(timezone.utc) - self.retention
+        db = SessionLocal()
+        try:
+            repo = SQLWebhookRepository(db)
+            repo.prune_deliveries(older_than)
+            repo.prune_outbox(db, older_than)
+            for shard in range(len(shard_router) if shard_router is not None else 0):
+                source = shard_router.session(shard)
+                try:
+                    repo.prune_outbox(source, older_than)
+                finally:
+                    source.close()
+        finally:
+            db.close()
+
+
+webhook_dispatcher = WebhookDispatcher(
+    poll_interval=settings.WEBHOOK_POLL_INTERVAL_SECONDS,
+    batch_size=settings.WEBHOOK_BATCH_SIZE,
+    timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+    max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+    retry_base=settings.WEBHOOK_RETRY_BASE_SECONDS,
+    retry_max=settings.WEBHOOK_RETRY_MAX_SECONDS,
+    retention_hours=settings.WEBHOOK_RETENTION_HOURS,
+    enabled=settings.WEBHOOKS_ENABLED
+)
\ No newline at end of file
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+import secrets
 
-from domain.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from domain.models.user_projections import AuthPrincipal
 from domain.models.service import Service
 from domain.models.user_role import UserRole
 from domain.models.user_service_role import UserServiceRole
@@ -9,36 +12,36 @@ from interfaces.schemas.user_schemas import (
     UserResponse, MessageResponse, ServiceResponse, UserRoleResponse, 
     UserServiceRoleResponse, ServiceCreateRequest, ServiceUpdateRequest,
     UserRoleCreateRequest, UserRoleUpdateRequest, UserServiceRoleCreateRequest,
-    UserServiceRoleUpdateRequest
+    UserServiceRoleUpdateRequest, UserSearchResult, UserSearchPage,
+    UserServiceRolePage, StatsSummaryResponse, AuditEventResponse, AuditEventPage,
+    WebhookEndpointCreateRequest, WebhookEndpointUpdateRequest, WebhookEndpointResponse,
+    WebhookDeliveryResponse, WebhookDeliveryPage
 )
 from interfaces.dependencies import (
-    get_current_user, get_user_repository, get_service_repository,
-    get_user_role_repository, get_user_service_role_repository
+    get_current_principal, get_user_repository, get_service_repository,
+    get_user_role_repository, get_user_service_role_repository, get_stats_repository,
+    get_audit_repository, get_audit_log, get_webhook_repository
 )
 from domain.repositories.user_repository import UserRepository
 from domain.repositories.service_repository import ServiceRepository
 from domain.repositories.user_role_repository import UserRoleRepository
 from domain.repositories.user_service_role_repository import UserServiceRoleRepository
+from domain.repositories.stats_repository import StatsRepository
+from domain.repositories.audit_repository import AuditRepository
+from domain.repositories.webhook_repository import WebhookRepository
+from domain.models.webhook import WebhookEndpoint
+from domain.models import audit_event
+from infrastructure.services.audit_service import AuditLog
+from interfaces.http_cache import compute_etag, is_not_modified, not_modified, set_etag
+from interfaces.pagination import encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/admin", tags=["Administration"])
 
-async def check_admin_access(
-    current_user: User, 
-    user_service_role_repo: UserServiceRoleRepository
-):
+def check_admin_access(current_user: AuthPrincipal):
     """Helper function to check admin access using new role system"""
-    # Get userService (assuming ID 1 for userService)
-    # In production, you'd want to get this by name
-    user_service_roles = await user_service_role_repo.get_user_services(current_user.id)
-    
-    # Check if user has admin role in userService
-    has_admin_role = False
-    for usr in user_service_roles:
-        if usr.service_id == 1 and usr.role_id == 1:  # Assuming admin role has ID 1
-            has_admin_role = True
-            break
-    
-    if not has_admin_role:
+    # The principal already carries the caller's active (service, role) pairs
+    # Assuming userService has ID 1 and the admin role ID 1; in production, look these up by name
+    if not current_user.has_role(1, 1):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
@@ -47,12 +50,11 @@ async def check_admin_access(
 # User management endpoints
 @router.get("/users", response_model=List[UserResponse])
 async def list_users(
-    current_user: User = Depends(get_current_user),
-    user_repo: UserRepository = Depends(get_user_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    user_repo: UserRepository = Depends(get_user_repository)
 ):
     """List all users (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     # Get users with their roles
     users = await user_repo.list_all()
@@ -77,15 +79,38 @@ async def list_users(
     
     return user_responses
 
+@router.get("/users/search", response_model=UserSearchPage)
+async def search_users(
+    q: str = Query(..., min_length=3, max_length=100, description="Name, email or phone fragment(s)"),
+    fuzzy: bool = Query(False, description="Tolerate typos by matching on shared trigrams"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    user_repo: UserRepository = Depends(get_user_repository)
+):
+    """Search users by partial name, email or phone number (admin only)"""
+    check_admin_access(current_user)
+    
+    try:
+        users, has_more = await user_repo.search(q, fuzzy=fuzzy, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return UserSearchPage(
+        items=[UserSearchResult.model_validate(user) for user in users],
+        limit=limit,
+        offset=offset,
+        has_more=has_more
+    )
+
 @router.put("/users/{user_id}/deactivate", response_model=MessageResponse)
 async def deactivate_user(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     user_repo: UserRepository = Depends(get_user_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    audit: AuditLog = Depends(get_audit_log)
 ):
     """Deactivate a user (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     try:
         user = await user_repo.get_by_id(user_id)
@@ -97,6 +122,7 @@ async def deactivate_user(
         
         user.is_active = False
         await user_repo.update(user)
+        audit.record(audit_event.USER_DEACTIVATE, actor_user_id=current_user.id, subject_user_id=user_id)
         
         return MessageResponse(message=f"User {user.phone_number} deactivated successfully")
     except ValueError as e:
@@ -105,12 +131,18 @@ async def deactivate_user(
 # Service management endpoints
 @router.get("/services", response_model=List[ServiceResponse])
 async def list_services(
-    current_user: User = Depends(get_current_user),
-    service_repo: ServiceRepository = Depends(get_service_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    request: Request,
+    response: Response,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    service_repo: ServiceRepository = Depends(get_service_repository)
 ):
     """List all services (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
+    
+    etag = compute_etag("admin/services", *await service_repo.get_collection_version())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
     services = await service_repo.get_all(active_only=False)
     return [
@@ -124,12 +156,11 @@ async def list_services(
 @router.post("/services", response_model=ServiceResponse)
 async def create_service(
     service_request: ServiceCreateRequest,
-    current_user: User = Depends(get_current_user),
-    service_repo: ServiceRepository = Depends(get_service_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    service_repo: ServiceRepository = Depends(get_service_repository)
 ):
     """Create a new service (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     try:
         # Check if service already exists
@@ -158,12 +189,11 @@ async def create_service(
 @router.get("/services/{service_id}", response_model=ServiceResponse)
 async def get_service(
     service_id: int,
-    current_user: User = Depends(get_current_user),
-    service_repo: ServiceRepository = Depends(get_service_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    service_repo: ServiceRepository = Depends(get_service_repository)
 ):
     """Get a specific service (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     service = await service_repo.get_by_id(service_id)
     if not service:
@@ -182,12 +212,11 @@ async def get_service(
 async def update_service(
     service_id: int,
     service_request: ServiceUpdateRequest,
-    current_user: User = Depends(get_current_user),
-    service_repo: ServiceRepository = Depends(get_service_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    service_repo: ServiceRepository = Depends(get_service_repository)
 ):
     """Update a service (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     try:
         service = await service_repo.get_by_id(service_id)
@@ -217,12 +246,11 @@ async def update_service(
 @router.delete("/services/{service_id}", response_model=MessageResponse)
 async def delete_service(
     service_id: int,
-    current_user: User = Depends(get_current_user),
-    service_repo: ServiceRepository = Depends(get_service_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    service_repo: ServiceRepository = Depends(get_service_repository)
 ):
     """Delete a service (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     try:
         deleted = await service_repo.delete(service_id)
@@ -239,12 +267,18 @@ async def delete_service(
 # Role management endpoints
 @router.get("/roles", response_model=List[UserRoleResponse])
 async def list_roles(
-    current_user: User = Depends(get_current_user),
-    role_repo: UserRoleRepository = Depends(get_user_role_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    request: Request,
+    response: Response,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    role_repo: UserRoleRepository = Depends(get_user_role_repository)
 ):
     """List all roles (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
+    
+    etag = compute_etag("admin/roles", *await role_repo.get_collection_version())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
     roles = await role_repo.get_all(active_only=False)
     return [
@@ -258,12 +292,12 @@ async def list_roles(
 @router.post("/roles", response_model=UserRoleResponse)
 async def create_role(
     role_request: UserRoleCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     role_repo: UserRoleRepository = Depends(get_user_role_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    audit: AuditLog = Depends(get_audit_log)
 ):
     """Create a new role (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     try:
         # Check if role already exists
@@ -281,6 +315,8 @@ async def create_role(
         )
         
         created_role = await role_repo.create(role)
+        audit.record(audit_event.ROLE_CREATE, actor_user_id=current_user.id, role_id=created_role.id,
+                     name=created_role.name)
         return UserRoleResponse(
             id=created_role.id,
             name=created_role.name,
@@ -292,12 +328,11 @@ async def create_role(
 @router.get("/roles/{role_id}", response_model=UserRoleResponse)
 async def get_role(
     role_id: int,
-    current_user: User = Depends(get_current_user),
-    role_repo: UserRoleRepository = Depends(get_user_role_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    role_repo: UserRoleRepository = Depends(get_user_role_repository)
 ):
     """Get a specific role (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     role = await role_repo.get_by_id(role_id)
     if not role:
@@ -316,12 +351,12 @@ async def get_role(
 async def update_role(
     role_id: int,
     role_request: UserRoleUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     role_repo: UserRoleRepository = Depends(get_user_role_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    audit: AuditLog = Depends(get_audit_log)
 ):
     """Update a role (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     try:
         role = await role_repo.get_by_id(role_id)
@@ -340,6 +375,8 @@ async def update_role(
             role.is_active = role_request.is_active
         
         updated_role = await role_repo.update(role)
+        audit.record(audit_event.ROLE_UPDATE, actor_user_id=current_user.id, role_id=role_id,
+                     changes=role_request.model_dump(exclude_none=True))
         return UserRoleResponse(
             id=updated_role.id,
             name=updated_role.name,
@@ -351,12 +388,12 @@ async def update_role(
 @router.delete("/roles/{role_id}", response_model=MessageResponse)
 async def delete_role(
     role_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     role_repo: UserRoleRepository = Depends(get_user_role_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    audit: AuditLog = Depends(get_audit_log)
 ):
     """Delete a role (admin only)"""
-    await check_admin_access(current_user, user_service_role_repo)
+    check_admin_access(current_user)
     
     try:
         deleted = await role_repo.delete(role_id)
@@ -365,52 +402,71 @@ async def delete_role(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Role not found"
             )
+        audit.record(audit_event.ROLE_DELETE, actor_user_id=current_user.id, role_id=role_id)
         
         return MessageResponse(message="Role deleted successfully")
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 # Service Role management endpoints
-@router.get("/service-roles", response_model=List[UserServiceRoleResponse])
+@router.get("/service-roles", response_model=UserServiceRolePage)
 async def list_service_roles(
-    service_id: int = Query(None),
-    user_id: int = Query(None),
-    current_user: User = Depends(get_current_user),
-    usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    request: Request,
+    response: Response,
+    service_id: Optional[int] = Query(None),
+    role_id: Optional[int] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    user_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository),
+    service_repo: ServiceRepository = Depends(get_service_repository),
+    role_repo: UserRoleRepository = Depends(get_user_role_repository)
 ):
-    """List service roles with optional filtering (admin only)"""
-    await check_admin_access(current_user, usr_repo)
+    """List user service role assignments with optional filtering, cursor-paginated (admin only)"""
+    check_admin_access(current_user)
     
     try:
-        if user_id and service_id:
-            # Get specific user role in service
-            user_service_role = await usr_repo.get_user_role_in_service(user_id, service_id)
-            return [user_service_role] if user_service_role else []
-        elif user_id:
-            # Get all services for a user
-            user_services = await usr_repo.get_user_services(user_id, active_only=False)
-            return user_services
-        elif service_id:
-            # Get all users in a service
-            service_users = await usr_repo.get_service_users(service_id, active_only=False)
-            return service_users
-        else:
-            # This would require a new method to get all service roles
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Please provide either user_id or service_id as query parameter"
-            )
+        after_id = decode_cursor(cursor)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # The version covers at least the filtered rows, so it changes whenever the page could; items
+    # also embed service and role names and descriptions, so the catalog versions are part of it
+    etag = compute_etag(
+        "admin/service-roles", service_id, role_id, is_active, user_id, after_id, limit,
+        *await usr_repo.get_collection_version(user_id=user_id, service_id=service_id),
+        *await service_repo.get_collection_version(),
+        *await role_repo.get_collection_version()
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    assignments, next_after_id = await usr_repo.list_assignments(
+        service_id=service_id,
+        role_id=role_id,
+        is_active=is_active,
+        user_id=user_id,
+        after_id=after_id,
+        limit=limit
+    )
+    return UserServiceRolePage(
+        items=assignments,
+        limit=limit,
+        next_cursor=encode_cursor(next_after_id)
+    )
 
 @router.post("/service-roles", response_model=UserServiceRoleResponse)
 async def create_service_role(
     usr_request: UserServiceRoleCreateRequest,
-    current_user: User = Depends(get_current_user),
-    usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository),
+    audit: AuditLog = Depends(get_audit_log)
 ):
     """Create a new user service role (admin only)"""
-    await check_admin_access(current_user, usr_repo)
+    check_admin_access(current_user)
     
     try:
         # Check if user already has a role in this service
@@ -431,6 +487,9 @@ async def create_service_role(
         )
         
         created_usr = await usr_repo.create(user_service_role)
+        audit.record(audit_event.SERVICE_ROLE_CREATE, actor_user_id=current_user.id,
+                     subject_user_id=created_usr.user_id, service_role_id=created_usr.id,
+                     service_id=created_usr.service_id, role_id=created_usr.role_id)
         return created_usr
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -438,11 +497,11 @@ async def create_service_role(
 @router.get("/service-roles/{usr_id}", response_model=UserServiceRoleResponse)
 async def get_service_role(
     usr_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
 ):
     """Get a specific service role (admin only)"""
-    await check_admin_access(current_user, usr_repo)
+    check_admin_access(current_user)
     
     usr = await usr_repo.get_by_id(usr_id)
     if not usr:
@@ -457,11 +516,12 @@ async def get_service_role(
 async def update_service_role(
     usr_id: int,
     usr_request: UserServiceRoleUpdateRequest,
-    current_user: User = Depends(get_current_user),
-    usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository),
+    audit: AuditLog = Depends(get_audit_log)
 ):
     """Update a service role (admin only)"""
-    await check_admin_access(current_user, usr_repo)
+    check_admin_access(current_user)
     
     try:
         usr = await usr_repo.get_by_id(usr_id)
@@ -471,6 +531,7 @@ async def update_service_role(
                 detail="Service role not found"
             )
         
+        previous_role_id = usr.role_id
         # Update only provided fields
         if usr_request.user_id is not None:
             usr.user_id = usr_request.user_id
@@ -482,6 +543,9 @@ async def update_service_role(
             usr.is_active = usr_request.is_active
         
         updated_usr = await usr_repo.update(usr)
+        audit.record(audit_event.SERVICE_ROLE_UPDATE, actor_user_id=current_user.id,
+                     subject_user_id=updated_usr.user_id, service_role_id=usr_id,
+                     previous_role_id=previous_role_id, changes=usr_request.model_dump(exclude_none=True))
         return updated_usr
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -489,11 +553,12 @@ async def update_service_role(
 @router.delete("/service-roles/{usr_id}", response_model=MessageResponse)
 async def delete_service_role(
     usr_id: int,
-    current_user: User = Depends(get_current_user),
-    usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    usr_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository),
+    audit: AuditLog = Depends(get_audit_log)
 ):
     """Delete a service role (admin only)"""
-    await check_admin_access(current_user, usr_repo)
+    check_admin_access(current_user)
     
     try:
         deleted = await usr_repo.delete(usr_id)
@@ -502,7 +567,216 @@ async def delete_service_role(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Service role not found"
             )
+        audit.record(audit_event.SERVICE_ROLE_DELETE, actor_user_id=current_user.id, service_role_id=usr_id)
         
         return MessageResponse(message="Service role deleted successfully")
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/stats", response_model=StatsSummaryResponse)
+async def get_stats(
+    days: int = Query(30, ge=1, le=366, description="Signups per day for this many days back"),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    stats_repo: StatsRepository = Depends(get_stats_repository)
+):
+    """User, role assignment and MFA adoption counters, maintained on every write (admin only)"""
+    check_admin_access(current_user)
+    
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    return await stats_repo.get_summary(since)
+
+@router.post("/stats/rebuild", response_model=StatsSummaryResponse)
+async def rebuild_stats(
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    stats_repo: StatsRepository = Depends(get_stats_repository)
+):
+    """Recompute the counters from the users and role tables (admin only)"""
+    check_admin_access(current_user)
+    
+    return await stats_repo.rebuild()
+
+@router.get("/audit", response_model=AuditEventPage)
+async def list_audit_events(
+    action: Optional[str] = Query(None, description="e.g. auth.login, admin.service_role_update"),
+    actor_user_id: Optional[int] = Query(None),
+    subject_user_id: Optional[int] = Query(None),
+    since: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    audit_repo: AuditRepository = Depends(get_audit_repository)
+):
+    """Audit trail, newest first (admin only). Events appear once their batch is flushed."""
+    check_admin_access(current_user)
+    
+    try:
+        before_id = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    events, next_before_id = await audit_repo.list_events(
+        action=action,
+        actor_user_id=actor_user_id,
+        subject_user_id=subject_user_id,
+        since=since,
+        before_id=before_id,
+        limit=limit
+    )
+    return AuditEventPage(
+        items=[AuditEventResponse.model_validate(event) for event in events],
+        limit=limit,
+        next_cursor=encode_cursor(next_before_id)
+    )
+
+# Webhook endpoints: user and role change events are POSTed to these in signed batches
+@router.post("/webhooks", response_model=WebhookEndpointResponse, status_code=status.HTTP_201_CREATED)
+async def create_webhook(
+    webhook_request: WebhookEndpointCreateRequest,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    webhook_repo: WebhookRepository = Depends(get_webhook_repository),
+    audit: AuditLog = Depends(get_audit_log)
+):
+    """Register a webhook endpoint (admin only). The signing secret is only returned here."""
+    check_admin_access(current_user)
+    
+    endpoint = await webhook_repo.create_endpoint(WebhookEndpoint(
+        id=None,
+        url=webhook_request.url,
+        secret=webhook_request.secret or secrets.token_urlsafe(32),
+        event_types=webhook_request.event_types,
+        max_concurrency=webhook_request.max_concurrency
+    ))
+    audit.record(audit_event.WEBHOOK_CREATE, actor_user_id=current_user.id, webhook_id=endpoint.id,
+                 url=endpoint.url)
+    return WebhookEndpointResponse.model_validate(endpoint)
+
+@router.get("/webhooks", response_model=List[WebhookEndpointResponse])
+async def list_webhooks(
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    webhook_repo: WebhookRepository = Depends(get_webhook_repository)
+):
+    """List webhook endpoints (admin only)"""
+    check_admin_access(current_user)
+    
+    endpoints = await webhook_repo.list_endpoints()
+    return [WebhookEndpointResponse.model_validate(endpoint).model_copy(update={"secret": None}) for endpoint in endpoints]
+
+@router.get("/webhooks/{webhook_id}", response_model=WebhookEndpointResponse)
+async def get_webhook(
+    webhook_id: int,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    webhook_repo: WebhookRepository = Depends(get_webhook_repository)
+):
+    """Get a webhook endpoint (admin only)"""
+    check_admin_access(current_user)
+    
+    endpoint = await webhook_repo.get_endpoint(webhook_id)
+    if not endpoint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook endpoint not found"
+        )
+    return WebhookEndpointResponse.model_validate(endpoint).model_copy(update={"secret": None})
+
+@router.put("/webhooks/{webhook_id}", response_model=WebhookEndpointResponse)
+async def update_webhook(
+    webhook_id: int,
+    webhook_request: WebhookEndpointUpdateRequest,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    webhook_repo: WebhookRepository = Depends(get_webhook_repository),
+    audit: AuditLog = Depends(get_audit_log)
+):
+    """Update a webhook endpoint (admin only). A new secret is returned once, like on create."""
+    check_admin_access(current_user)
+    
+    endpoint = await webhook_repo.get_endpoint(webhook_id)
+    if not endpoint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook endpoint not found"
+        )
+    
+    # Update only provided fields
+    if webhook_request.url is not None:
+        endpoint.url = webhook_request.url
+    if webhook_request.event_types is not None:
+        endpoint.event_types = webhook_request.event_types
+    if webhook_request.secret is not None:
+        endpoint.secret = webhook_request.secret
+    if webhook_request.max_concurrency is not None:
+        endpoint.max_concurrency = webhook_request.max_concurrency
+    if webhook_request.is_active is not None:
+        endpoint.is_active = webhook_request.is_active
+    
+    try:
+        updated = await webhook_repo.update_endpoint(endpoint)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    audit.record(audit_event.WEBHOOK_UPDATE, actor_user_id=current_user.id, webhook_id=webhook_id,
+                 changes=webhook_request.model_dump(exclude_none=True, exclude={"secret"}))
+    response = WebhookEndpointResponse.model_validate(updated)
+    return response if webhook_request.secret is not None else response.model_copy(update={"secret": None})
+
+@router.delete("/webhooks/{webhook_id}", response_model=MessageResponse)
+async def delete_webhook(
+    webhook_id: int,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    webhook_repo: WebhookRepository = Depends(get_webhook_repository),
+    audit: AuditLog = Depends(get_audit_log)
+):
+    """Delete a webhook endpoint and its pending deliveries (admin only)"""
+    check_admin_access(current_user)
+    
+    if not await webhook_repo.delete_endpoint(webhook_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook endpoint not found"
+        )
+    audit.record(audit_event.WEBHOOK_DELETE, actor_user_id=current_user.id, webhook_id=webhook_id)
+    return MessageResponse(message="Webhook endpoint deleted successfully")
+
+@router.get("/webhooks/{webhook_id}/deliveries", response_model=WebhookDeliveryPage)
+async def list_webhook_deliveries(
+    webhook_id: int,
+    delivery_status: Optional[str] = Query(None, alias="status", pattern="^(pending|delivered|failed)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    webhook_repo: WebhookRepository = Depends(get_webhook_repository)
+):
+    """Deliveries to one endpoint, newest first (admin only)"""
+    check_admin_access(current_user)
+    
+    try:
+        before_id = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    deliveries, next_before_id = await webhook_repo.list_deliveries(
+        webhook_id,
+        status=delivery_status,
+        before_id=before_id,
+        limit=limit
+    )
+    return WebhookDeliveryPage(
+        items=[WebhookDeliveryResponse.model_validate(delivery) for delivery in deliveries],
+        limit=limit,
+        next_cursor=encode_cursor(next_before_id)
+    )
+
+@router.post("/webhooks/{webhook_id}/deliveries/retry", response_model=MessageResponse)
+async def retry_webhook_deliveries(
+    webhook_id: int,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    webhook_repo: WebhookRepository = Depends(get_webhook_repository)
+):
+    """Requeue deliveries that ran out of attempts (admin only)"""
+    check_admin_access(current_user)
+    
+    if not await webhook_repo.get_endpoint(webhook_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook endpoint not found"
+        )
+    requeued = await webhook_repo.retry_failed(webhook_id)
+    return MessageResponse(message=f"{requeued} deliveries requeued")
\ No newline at end of file
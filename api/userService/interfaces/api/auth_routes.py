@@ -15,6 +15,10 @@ from application.use_cases.user_use_cases import (
     RequestOTPUseCase, VerifyOTPUseCase, ResetPasswordUseCase
 )
 from core.config import settings
+from infrastructure.monitoring.service_metrics import (
+    REGISTRATIONS_SUCCEEDED, REGISTRATIONS_FAILED, LOGINS_SUCCEEDED, LOGINS_FAILED,
+    OTP_REQUESTS, OTP_VERIFICATIONS_SUCCEEDED, OTP_VERIFICATIONS_FAILED
+)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -35,6 +39,7 @@ async def register_user(
         
         user = result['user']
         roles = result['roles']
+        REGISTRATIONS_SUCCEEDED.inc()
         
         return UserResponse(
             id=user.id,
@@ -49,6 +54,7 @@ async def register_user(
             roles=roles
         )
     except ValueError as e:
+        REGISTRATIONS_FAILED.inc()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.post("/request-otp", response_model=OTPResponse)
@@ -59,11 +65,13 @@ async def request_otp(
     """Request OTP for registration, login, or password reset"""
     try:
         otp_code = await use_case.execute(otp_request.phone_number, otp_request.purpose)
+        OTP_REQUESTS.labels(otp_request.purpose, "success").inc()
         return OTPResponse(
             message="OTP sent successfully",
             otp=otp_code  # Remove this in production
         )
     except ValueError as e:
+        OTP_REQUESTS.labels(otp_request.purpose, "failure").inc()
         if "User already exists" in str(e):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         elif "User not found" in str(e):
@@ -79,8 +87,10 @@ async def verify_otp(
     """Verify OTP"""
     try:
         await use_case.execute(otp_verify.phone_number, otp_verify.otp_code, otp_verify.purpose)
+        OTP_VERIFICATIONS_SUCCEEDED.inc()
         return MessageResponse(message="OTP verified successfully")
     except ValueError as e:
+        OTP_VERIFICATIONS_FAILED.inc()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.post("/login", response_model=TokenResponse)
@@ -95,6 +105,7 @@ async def login(
             password=user_login.password,
             mfa_code=user_login.mfa_code
         )
+        LOGINS_SUCCEEDED.inc()
         
         user_response = UserResponse(
             id=result["user"].id,
@@ -115,6 +126,7 @@ async def login(
             user=user_response
         )
     except ValueError as e:
+        LOGINS_FAILED.inc()
         if "Invalid phone number or password" in str(e):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
         elif "deactivated" in str(e):
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
-from interfaces.schemas.user_schemas import HealthResponse
+from interfaces.schemas.user_schemas import HealthResponse, ReadinessResponse
+from infrastructure.monitoring.readiness import readiness
 from core.config import settings
 
 router = APIRouter(tags=["Health"])
@@ -20,4 +22,20 @@ def health_check():
         status="healthy",
         service=settings.APP_NAME,
         version=settings.APP_VERSION
-    )
\ No newline at end of file
+    )
+
+@router.get("/ready", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}})
+def readiness_check():
+    """Readiness probe - 503 while warming up, DB unreachable, pool saturated or queues backed up"""
+    result = readiness.check()
+    body = ReadinessResponse(
+        status="ready" if result["ready"] else "unavailable",
+        service=settings.APP_NAME,
+        version=settings.APP_VERSION,
+        reasons=result["reasons"],
+        warmed_up=result["warmed_up"],
+        database=result["database"],
+        pool=result["pool"],
+        queues=result["queues"]
+    )
+    return JSONResponse(body.model_dump(), status_code=200 if result["ready"] else 503)
\ No newline at end of file
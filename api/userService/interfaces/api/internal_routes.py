@@ -0,0 +1,56 @@
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from application.use_cases.user_use_cases import IntrospectTokensUseCase, LookupUsersUseCase
+from core.config import settings
+from interfaces.dependencies import (
+    require_service_key, get_introspect_tokens_use_case, get_lookup_users_use_case
+)
+from interfaces.internal_encoding import decode_body, encode_response
+
+# Service-to-service only: not in the public schema and every route needs a service key
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_service_key)]
+)
+
+def _batch(body: Any, field: str, item_type: type) -> List:
+    items = body.get(field) if isinstance(body, dict) else None
+    if not isinstance(items, list) or not all(
+        isinstance(item, item_type) and not isinstance(item, bool) for item in items
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f'"{field}" must be a list of {item_type.__name__}'
+        )
+    if len(items) > settings.INTERNAL_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {settings.INTERNAL_MAX_BATCH_SIZE} {field} per request"
+        )
+    return items
+
+@router.post("/introspect")
+async def introspect_tokens(
+    request: Request,
+    use_case: IntrospectTokensUseCase = Depends(get_introspect_tokens_use_case)
+):
+    """Check a batch of access tokens: {"tokens": [...]} -> {"results": [...]} in request order.
+
+    Each result is {"active": false} or the caller's user_id, phone_number, active
+    [service_id, role_id] roles and token exp.
+    """
+    tokens = _batch(await decode_body(request), "tokens", str)
+    return encode_response(request, {"results": await use_case.execute(tokens)})
+
+@router.post("/users/lookup")
+async def lookup_users(
+    request: Request,
+    use_case: LookupUsersUseCase = Depends(get_lookup_users_use_case)
+):
+    """Profiles and active roles by id: {"user_ids": [...]} -> {"users": [...]}, null for unknown ids"""
+    user_ids = _batch(await decode_body(request), "user_ids", int)
+    return encode_response(request, {"users": await use_case.execute(user_ids)})
\ No newline at end of file
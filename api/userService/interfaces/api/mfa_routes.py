@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from domain.models.user import User
+from domain.models.user_projections import AuthPrincipal
 from interfaces.schemas.user_schemas import (
     MFASetupResponse, MFAEnableRequest, MFAEnableResponse
 )
 from interfaces.dependencies import (
-    get_current_user, get_setup_mfa_use_case, get_enable_mfa_use_case
+    get_current_principal, get_setup_mfa_use_case, get_enable_mfa_use_case
 )
 from application.use_cases.user_use_cases import SetupMFAUseCase, EnableMFAUseCase
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/mfa", tags=["Multi-Factor Authentication"])
 
 @router.post("/setup", response_model=MFASetupResponse)
 async def setup_mfa(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     use_case: SetupMFAUseCase = Depends(get_setup_mfa_use_case)
 ):
     """Setup MFA for current user"""
@@ -26,7 +26,7 @@ async def setup_mfa(
 @router.post("/enable", response_model=MFAEnableResponse)
 async def enable_mfa(
     mfa_enable: MFAEnableRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     use_case: EnableMFAUseCase = Depends(get_enable_mfa_use_case)
 ):
     """Enable MFA for current user (mandatory)"""
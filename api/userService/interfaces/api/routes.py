@@ -5,6 +5,10 @@ from .auth_routes import router as auth_router
 from .user_routes import router as user_router
 from .mfa_routes import router as mfa_router
 from .admin_routes import router as admin_router
+from .metrics_routes import router as metrics_router
+from .internal_routes import router as internal_router
+from .sync_routes import router as sync_router
+from core.config import settings
 
 # Main router that includes all sub-routers
 router = APIRouter()
@@ -14,4 +18,11 @@ router.include_router(health_router)
 router.include_router(auth_router) 
 router.include_router(user_router)
 router.include_router(mfa_router)
-router.include_router(admin_router)
\ No newline at end of file
+router.include_router(admin_router)
+
+if settings.INTERNAL_SERVICE_KEYS:
+    router.include_router(internal_router)
+    router.include_router(sync_router)
+
+if settings.METRICS_ENABLED:
+    router.include_router(metrics_router)
\ No newline at end of file
@@ -0,0 +1,60 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from core.config import settings
+from domain.models.change import Change
+from domain.repositories.change_feed_repository import ChangeFeedRepository
+from interfaces.dependencies import require_service_key, get_change_feed_repository
+from interfaces.internal_encoding import encode_response
+
+# Incremental sync for downstream caches; service-to-service only, like /internal
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"],
+    include_in_schema=False,
+    dependencies=[Depends(require_service_key)]
+)
+
+def _parse_since(since: str) -> Optional[List[int]]:
+    """``0`` (start over) or the ``next_since`` of a previous page"""
+    if since == "0":
+        return None
+    try:
+        positions = [int(position) for position in since.split(".")]
+    except ValueError:
+        positions = []
+    if not positions or any(position < 0 for position in positions):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid change feed cursor")
+    return positions
+
+def _delta(change: Change) -> dict:
+    delta = {"seq": change.seq, "kind": change.kind, "id": change.id, "op": change.op}
+    if change.data is not None:
+        delta["data"] = change.data
+    return delta
+
+@router.get("/changes")
+async def list_changes(
+    request: Request,
+    since: str = Query("0", max_length=1000, description="next_since from the previous page; 0 to start over"),
+    limit: int = Query(500, ge=1, le=settings.INTERNAL_MAX_BATCH_SIZE),
+    feed_repo: ChangeFeedRepository = Depends(get_change_feed_repository)
+):
+    """Users and role assignments changed since a cursor, oldest change first.
+
+    Returns {"changes": [...], "next_since": "...", "has_more": bool}. Each change is
+    {"seq", "kind": "user"|"assignment", "id", "op": "upsert"|"delete"} plus "data" with the
+    current published fields for upserts; deleted and deactivated rows come back as deletes.
+    Consumers apply the changes in order, keep next_since and call again while has_more.
+    A row changed several times since the cursor appears once, in its latest state.
+    """
+    try:
+        page = await feed_repo.get_changes(_parse_since(since), limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return encode_response(request, {
+        "changes": [_delta(change) for change in page.changes],
+        "next_since": ".".join(str(position) for position in page.cursor),
+        "has_more": page.has_more
+    })
\ No newline at end of file
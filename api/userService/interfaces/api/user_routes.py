@@ -1,36 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from domain.models.user import User
+from domain.models.user_projections import AuthPrincipal
+from domain.models.user_service_role import UserServiceRole
 from interfaces.schemas.user_schemas import UserResponse, UserUpdateRequest
 from interfaces.dependencies import (
-    get_current_user, get_user_repository, get_user_service_role_repository
+    get_current_user, get_current_principal, get_user_repository, get_user_service_role_repository,
+    get_unit_of_work
 )
 from domain.repositories.user_repository import UserRepository
 from domain.repositories.user_service_role_repository import UserServiceRoleRepository
+from domain.repositories.unit_of_work import UnitOfWork
+from interfaces.http_cache import compute_etag, is_not_modified, not_modified, set_etag
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# At most one assignment per service (uq_user_service), so one page holds them all
+MAX_ROLES_PER_USER = 1000
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
-    user_repo: UserRepository = Depends(get_user_repository)
+    request: Request,
+    response: Response,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    user_repo: UserRepository = Depends(get_user_repository),
+    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
 ):
     """Get current user information with roles"""
-    # Use SQLAlchemy relationships to get user with populated roles
-    db_user_with_roles = await user_repo.get_by_id_with_roles(current_user.id)
-    result = user_repo.db_user_to_response_dict(db_user_with_roles)
+    # Conditional GET - answer 304 before loading roles or serializing
+    etag = compute_etag("users/me", current_user.id, *await user_repo.get_profile_version(current_user.id))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    # Profile columns and active roles (with service and role names) in two narrow queries
+    profile = await user_repo.get_profile(current_user.id)
+    roles, _ = await user_service_role_repo.list_assignments(
+        user_id=current_user.id, is_active=True, limit=MAX_ROLES_PER_USER
+    )
     
     return UserResponse(
-        id=result['user'].id,
-        phone_number=result['user'].phone_number,
-        full_name=result['user'].full_name,
-        email=result['user'].email,
-        is_active=result['user'].is_active,
-        is_verified=result['user'].is_verified,
-        mfa_enabled=result['user'].mfa_enabled,
-        created_at=result['user'].created_at,
-        last_login=result['user'].last_login,
-        roles=result['roles']
+        id=profile.id,
+        phone_number=profile.phone_number,
+        full_name=profile.full_name,
+        email=profile.email,
+        is_active=profile.is_active,
+        is_verified=profile.is_verified,
+        mfa_enabled=profile.mfa_enabled,
+        created_at=profile.created_at,
+        last_login=profile.last_login,
+        roles=roles
     )
 
 @router.put("/me", response_model=UserResponse)
@@ -38,7 +57,8 @@ async def update_current_user(
     user_update: UserUpdateRequest,
     current_user: User = Depends(get_current_user),
     user_repo: UserRepository = Depends(get_user_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
+    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ):
     """Update current user information"""
     # Check if user is trying to update role_id - only admin can do this
@@ -62,35 +82,31 @@ async def update_current_user(
         current_user.email = user_update.email
     
     try:
-        updated_user = await user_repo.update(current_user)
-        
-        # Handle role update if provided
-        if user_update.role_id is not None:
-            # For simplicity, update the user's role in userService
-            # In a real scenario, you might want to be more specific about which service
-            user_roles = await user_service_role_repo.get_user_roles_in_service(
-                user_id=current_user.id, 
-                service_id=1  # userService
-            )
+        # Profile and role changes are applied atomically with a single commit
+        async with uow:
+            updated_user = await uow.users.update(current_user)
             
-            # Deactivate existing roles and create new one
-            for role in user_roles:
-                await user_service_role_repo.deactivate_user_service_role(
-                    user_id=current_user.id,
-                    service_id=1,
-                    role_id=role.role_id
-                )
+            # Handle role update if provided
+            if user_update.role_id is not None:
+                # For simplicity, update the user's role in userService
+                # In a real scenario, you might want to be more specific about which service
+                # One row per user and service (uq_user_service): reassign and reactivate it, or create one
+                assignments = await uow.user_service_roles.get_user_services(current_user.id, active_only=False)
+                existing_role = next((a for a in assignments if a.service_id == 1), None)  # userService
+                if existing_role:
+                    existing_role.role_id = user_update.role_id
+                    existing_role.is_active = True
+                    await uow.user_service_roles.update(existing_role)
+                else:
+                    await uow.user_service_roles.create(UserServiceRole(
+                        id=None,
+                        user_id=current_user.id,
+                        service_id=1,
+                        role_id=user_update.role_id,
+                        is_active=True
+                    ))
             
-            # Create new role assignment
-            from domain.models.user_service_role import UserServiceRole
-            new_role = UserServiceRole(
-                id=None,
-                user_id=current_user.id,
-                service_id=1,
-                role_id=user_update.role_id,
-                is_active=True
-            )
-            await user_service_role_repo.create(new_role)
+            await uow.commit()
         
         # Use SQLAlchemy relationships to get updated user with populated roles
         db_user_with_roles = await user_repo.get_by_id_with_roles(updated_user.id)
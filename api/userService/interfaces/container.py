@@ -0,0 +1,66 @@
+"""
+Application object graph, built once at import.
+
+Repositories keep no per-request state: each resolves the session of the
+request it is serving through ``core.session_context``. So one instance of
+every repository and use case serves all requests, and the FastAPI
+dependencies in ``interfaces.dependencies`` only hand them out instead of
+re-building the graph per request.
+"""
+from core.sharding import shard_router
+from infrastructure.db.repositories import SQLUserRepository, SQLOTPRepository
+from infrastructure.db.user_service_role_repository_impl import UserServiceRoleRepositoryImpl
+from infrastructure.db.user_role_repository_impl import UserRoleRepositoryImpl
+from infrastructure.db.service_repository_impl import ServiceRepositoryImpl
+from infrastructure.db.stats_repository_impl import SQLStatsRepository
+from infrastructure.db.audit_repository_impl import SQLAuditRepository
+from infrastructure.db.webhook_repository_impl import SQLWebhookRepository
+from infrastructure.db.change_feed_repository_impl import SQLChangeFeedRepository
+from infrastructure.db.sharded_repositories import (
+    ShardedUserRepository, ShardedOTPRepository, ShardedUserServiceRoleRepository, ShardedChangeFeedRepository,
+    ShardedStatsRepository
+)
+from infrastructure.services.password_rehash_service import password_rehash_service
+from infrastructure.services.audit_service import audit_log
+from infrastructure.cache.token_cache import token_cache
+from application.use_cases.user_use_cases import (
+    UserRegistrationUseCase, UserLoginUseCase, SetupMFAUseCase, EnableMFAUseCase,
+    RequestOTPUseCase, VerifyOTPUseCase, ResetPasswordUseCase, IntrospectTokensUseCase, LookupUsersUseCase
+)
+
+
+class Container:
+    def __init__(self, sharded: bool = False):
+        # User data is routed to shards when SHARD_DATABASE_URLS is set
+        if sharded:
+            self.user_repository = ShardedUserRepository()
+            self.otp_repository = ShardedOTPRepository()
+            self.user_service_role_repository = ShardedUserServiceRoleRepository()
+            self.change_feed_repository = ShardedChangeFeedRepository()
+            self.stats_repository = ShardedStatsRepository()
+        else:
+            self.user_repository = SQLUserRepository()
+            self.otp_repository = SQLOTPRepository()
+            self.user_service_role_repository = UserServiceRoleRepositoryImpl()
+            self.change_feed_repository = SQLChangeFeedRepository()
+            self.stats_repository = SQLStatsRepository()
+        self.user_role_repository = UserRoleRepositoryImpl()
+        self.service_repository = ServiceRepositoryImpl()
+        self.audit_repository = SQLAuditRepository()
+        # Endpoints and deliveries live on the primary, sharded or not
+        self.webhook_repository = SQLWebhookRepository()
+
+        self.user_registration = UserRegistrationUseCase(
+            self.user_repository, self.otp_repository, self.user_service_role_repository
+        )
+        self.user_login = UserLoginUseCase(self.user_repository, password_rehash_service, audit_log)
+        self.setup_mfa = SetupMFAUseCase(self.user_repository, audit_log)
+        self.enable_mfa = EnableMFAUseCase(self.user_repository, audit_log)
+        self.request_otp = RequestOTPUseCase(self.user_repository, self.otp_repository, audit_log)
+        self.verify_otp = VerifyOTPUseCase(self.otp_repository)
+        self.reset_password = ResetPasswordUseCase(self.user_repository, self.otp_repository)
+        self.introspect_tokens = IntrospectTokensUseCase(self.user_repository, token_cache)
+        self.lookup_users = LookupUsersUseCase(self.user_repository, token_cache)
+
+
+container = Container(sharded=shard_router is not None)
\ No newline at end of file
@@ -1,110 +1,154 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
 
-from core.database import get_db
+from core.config import settings
+
+from core.session_context import current_scope
+from domain.models.user import User
+from domain.models.user_projections import AuthPrincipal
 from domain.repositories.user_repository import UserRepository, OTPRepository
 from domain.repositories.user_service_role_repository import UserServiceRoleRepository
 from domain.repositories.user_role_repository import UserRoleRepository
 from domain.repositories.service_repository import ServiceRepository
-from infrastructure.db.repositories import SQLUserRepository, SQLOTPRepository
-from infrastructure.db.user_service_role_repository_impl import UserServiceRoleRepositoryImpl
-from infrastructure.db.user_role_repository_impl import UserRoleRepositoryImpl
-from infrastructure.db.service_repository_impl import ServiceRepositoryImpl
+from domain.repositories.unit_of_work import UnitOfWork
+from domain.repositories.stats_repository import StatsRepository
+from domain.repositories.audit_repository import AuditRepository
+from domain.repositories.webhook_repository import WebhookRepository
+from domain.repositories.change_feed_repository import ChangeFeedRepository
+from infrastructure.db.unit_of_work import SQLUnitOfWork
+from infrastructure.db.sharded_repositories import ShardedUnitOfWork
 from infrastructure.services.auth_service import AuthService
+from infrastructure.services.audit_service import AuditLog, audit_log
 from application.use_cases.user_use_cases import (
     UserRegistrationUseCase, UserLoginUseCase, SetupMFAUseCase, EnableMFAUseCase,
-    RequestOTPUseCase, VerifyOTPUseCase, ResetPasswordUseCase
+    RequestOTPUseCase, VerifyOTPUseCase, ResetPasswordUseCase, IntrospectTokensUseCase, LookupUsersUseCase
 )
+from interfaces.container import container
 
 security = HTTPBearer()
 
-# Repository dependencies
-def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
-    return SQLUserRepository(db)
-
-def get_otp_repository(db: Session = Depends(get_db)) -> OTPRepository:
-    return SQLOTPRepository(db)
-
-def get_user_service_role_repository(db: Session = Depends(get_db)) -> UserServiceRoleRepository:
-    return UserServiceRoleRepositoryImpl(db)
-
-def get_user_role_repository(db: Session = Depends(get_db)) -> UserRoleRepository:
-    return UserRoleRepositoryImpl(db)
-
-def get_service_repository(db: Session = Depends(get_db)) -> ServiceRepository:
-    return ServiceRepositoryImpl(db)
-
-# Use case dependencies
-def get_user_registration_use_case(
-    user_repo: UserRepository = Depends(get_user_repository),
-    otp_repo: OTPRepository = Depends(get_otp_repository),
-    user_service_role_repo: UserServiceRoleRepository = Depends(get_user_service_role_repository)
-) -> UserRegistrationUseCase:
-    return UserRegistrationUseCase(user_repo, otp_repo, user_service_role_repo)
-
-def get_user_login_use_case(
-    user_repo: UserRepository = Depends(get_user_repository)
-) -> UserLoginUseCase:
-    return UserLoginUseCase(user_repo)
-
-def get_setup_mfa_use_case(
-    user_repo: UserRepository = Depends(get_user_repository)
-) -> SetupMFAUseCase:
-    return SetupMFAUseCase(user_repo)
-
-def get_enable_mfa_use_case(
-    user_repo: UserRepository = Depends(get_user_repository)
-) -> EnableMFAUseCase:
-    return EnableMFAUseCase(user_repo)
-
-def get_request_otp_use_case(
-    user_repo: UserRepository = Depends(get_user_repository),
-    otp_repo: OTPRepository = Depends(get_otp_repository)
-) -> RequestOTPUseCase:
-    return RequestOTPUseCase(user_repo, otp_repo)
-
-def get_verify_otp_use_case(
-    otp_repo: OTPRepository = Depends(get_otp_repository)
-) -> VerifyOTPUseCase:
-    return VerifyOTPUseCase(otp_repo)
-
-def get_reset_password_use_case(
-    user_repo: UserRepository = Depends(get_user_repository),
-    otp_repo: OTPRepository = Depends(get_otp_repository)
-) -> ResetPasswordUseCase:
-    return ResetPasswordUseCase(user_repo, otp_repo)
-
-# Authentication dependency
-async def get_current_user(
-    token: str = Depends(security),
-    user_repo: UserRepository = Depends(get_user_repository)
-):
+# Repository and use case dependencies - shared instances built once (see interfaces/container.py)
+# that use the request's session from the session scope. No sub-dependencies, and async so FastAPI
+# calls them inline instead of dispatching each one to the threadpool
+async def get_user_repository() -> UserRepository:
+    return container.user_repository
+
+async def get_otp_repository() -> OTPRepository:
+    return container.otp_repository
+
+async def get_user_service_role_repository() -> UserServiceRoleRepository:
+    return container.user_service_role_repository
+
+async def get_user_role_repository() -> UserRoleRepository:
+    return container.user_role_repository
+
+async def get_service_repository() -> ServiceRepository:
+    return container.service_repository
+
+async def get_stats_repository() -> StatsRepository:
+    return container.stats_repository
+
+async def get_audit_repository() -> AuditRepository:
+    return container.audit_repository
+
+async def get_webhook_repository() -> WebhookRepository:
+    return container.webhook_repository
+
+async def get_change_feed_repository() -> ChangeFeedRepository:
+    return container.change_feed_repository
+
+# Audit trail - enqueue only, written in batches in the background
+async def get_audit_log() -> AuditLog:
+    return audit_log
+
+async def get_user_registration_use_case() -> UserRegistrationUseCase:
+    return container.user_registration
+
+async def get_user_login_use_case() -> UserLoginUseCase:
+    return container.user_login
+
+async def get_setup_mfa_use_case() -> SetupMFAUseCase:
+    return container.setup_mfa
+
+async def get_enable_mfa_use_case() -> EnableMFAUseCase:
+    return container.enable_mfa
+
+async def get_request_otp_use_case() -> RequestOTPUseCase:
+    return container.request_otp
+
+async def get_verify_otp_use_case() -> VerifyOTPUseCase:
+    return container.verify_otp
+
+async def get_reset_password_use_case() -> ResetPasswordUseCase:
+    return container.reset_password
+
+async def get_introspect_tokens_use_case() -> IntrospectTokensUseCase:
+    return container.introspect_tokens
+
+async def get_lookup_users_use_case() -> LookupUsersUseCase:
+    return container.lookup_users
+
+# Service credentials for the internal routes
+_service_keys = tuple(key.strip().encode() for key in settings.INTERNAL_SERVICE_KEYS.split(",") if key.strip())
+
+async def require_service_key(request: Request) -> None:
+    key = request.headers.get("x-service-key", "").encode()
+    # Compare against every key in constant time so timing does not reveal which one nearly matched
+    matched = False
+    for candidate in _service_keys:
+        matched |= hmac.compare_digest(key, candidate)
+    if not key or not matched:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid service credentials"
+        )
+
+# Authentication dependencies
+def _token_phone_number(token) -> str:
     try:
         payload = AuthService.verify_token(token.credentials)
-        phone_number = payload.get("sub")
-        if not phone_number:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
-        
-        user = await user_repo.get_by_phone_number(phone_number)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User account is deactivated"
-            )
-        
-        return user
     except ValueError:
+        payload = {}
+    phone_number = payload.get("sub")
+    if not phone_number:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
-        )
\ No newline at end of file
+        )
+    return phone_number
+
+def _require_active(user):
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User account is deactivated"
+        )
+    
+    return user
+
+async def get_current_principal(token: str = Depends(security)) -> AuthPrincipal:
+    """Caller identity and roles from a narrow query - for endpoints that only need who is calling"""
+    phone_number = _token_phone_number(token)
+    return _require_active(await container.user_repository.get_auth_principal(phone_number))
+
+async def get_current_user(token: str = Depends(security)) -> User:
+    """The caller's full user record - for endpoints that modify it"""
+    phone_number = _token_phone_number(token)
+    return _require_active(await container.user_repository.get_by_phone_number(phone_number))
+
+# Unit of work - per request, on the request's session, so the shared repositories see its staged
+# changes. With shards it runs on the current user's shard.
+async def get_unit_of_work(current_user: User = Depends(get_current_user)) -> UnitOfWork:
+    scope = current_scope()
+    if scope.shards:
+        shard = container.user_repository.shard_of_user(current_user.id)
+        return ShardedUnitOfWork(scope.db, scope.shards, shard)
+    return SQLUnitOfWork(scope.db)
\ No newline at end of file
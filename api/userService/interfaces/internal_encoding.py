@@ -0,0 +1,55 @@
+"""
+Request and response bodies for the internal service-to-service routes.
+
+Callers may send and accept MessagePack (``application/msgpack``) when the
+optional msgpack package is installed; everything else is compact JSON.
+Bodies are decoded and encoded directly, without Pydantic models, since
+these routes are called at gateway rates.
+"""
+import json
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+
+try:
+    import msgpack
+except ImportError:  # Optional: without it the internal routes speak JSON only
+    msgpack = None
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+JSON_TYPE = "application/json"
+
+
+def _media_type(header: str) -> str:
+    return header.split(";", 1)[0].strip().lower()
+
+
+async def decode_body(request: Request) -> Any:
+    body = await request.body()
+    is_msgpack = _media_type(request.headers.get("content-type", "")) in MSGPACK_TYPES
+    if is_msgpack and msgpack is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="MessagePack is not available on this server; send JSON"
+        )
+    try:
+        return msgpack.unpackb(body, raw=False) if is_msgpack else json.loads(body)
+    except ValueError:
+        # Also covers the msgpack unpacking errors
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed request body")
+
+
+def wants_msgpack(request: Request) -> bool:
+    """MessagePack when asked for in Accept, or by default when the request was sent as MessagePack"""
+    if msgpack is None:
+        return False
+    accept = request.headers.get("accept", "")
+    if accept and accept != "*/*":
+        return any(media_type in accept for media_type in MSGPACK_TYPES)
+    return _media_type(request.headers.get("content-type", "")) in MSGPACK_TYPES
+
+
+def encode_response(request: Request, payload: Any) -> Response:
+    if wants_msgpack(request):
+        return Response(msgpack.packb(payload, use_bin_type=True), media_type=MSGPACK_TYPES[0])
+    return Response(json.dumps(payload, separators=(",", ":")).encode(), media_type=JSON_TYPE)
\ No newline at end of file
@@ -0,0 +1,10 @@
+# Interfaces middleware package
+from .concurrency_limiter import AdaptiveConcurrencyMiddleware, AdaptiveConcurrencyLimiter
+from .idempotency import IdempotencyMiddleware, IdempotencyStore
+
+__all__ = [
+    'AdaptiveConcurrencyMiddleware',
+    'AdaptiveConcurrencyLimiter',
+    'IdempotencyMiddleware',
+    'IdempotencyStore'
+]
\ No newline at end of file
@@ -0,0 +1,173 @@
+import json
+import time
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from core.config import settings
+
+# Requests whose first path segment is not listed here share the "default" class
+ROUTE_CLASSES = ("auth", "users", "mfa", "admin", "internal", "sync")
+DEFAULT_ROUTE_CLASS = "default"
+# Latency baselines kept per class; requests for routes past this share the unmatched baseline
+MAX_ROUTE_BASELINES = 256
+# Statuses the app answers with when it is out of capacity rather than broken
+OVERLOAD_STATUS_CODES = frozenset({503, 504})
+
+
+class RouteClassLimit:
+    """AIMD concurrency limit for one route class, driven by observed latency"""
+
+    def __init__(self, initial_limit: int, min_limit: int, max_limit: int,
+                 latency_tolerance: float, backoff_ratio: float):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.in_flight = 0
+        self.rejected = 0
+        # Route template -> slowly drifting floor of its latency seen without queueing. Per route, as
+        # a class mixes fast and slow routes (OTP requests and bcrypt logins under /auth).
+        self.baseline_latency: Dict[Optional[str], float] = {}
+        # Short-window averages of latency, and of latency relative to its route's baseline
+        self.recent_latency: Optional[float] = None
+        self.recent_ratio: Optional[float] = None
+        self._last_decrease = 0.0
+
+    def try_acquire(self) -> bool:
+        """Reserve a slot, or return False when the class is over capacity"""
+        if self.in_flight >= int(self.limit):
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, overloaded: bool = False, route: Optional[str] = None) -> None:
+        """Free a slot and adapt the limit from the request outcome; ``route`` is the matched template"""
+        utilized = self.in_flight >= int(self.limit) // 2
+        self.in_flight -= 1
+
+        if route not in self.baseline_latency and len(self.baseline_latency) >= MAX_ROUTE_BASELINES:
+            route = None
+        baseline = self.baseline_latency.get(route)
+        if baseline is None or latency < baseline:
+            baseline = latency
+        else:
+            baseline += (latency - baseline) * 0.01
+        self.baseline_latency[route] = baseline
+        ratio = latency / baseline if baseline > 0 else 1.0
+        if self.recent_latency is None:
+            self.recent_latency, self.recent_ratio = latency, ratio
+        else:
+            self.recent_latency += (latency - self.recent_latency) * 0.2
+            self.recent_ratio += (ratio - self.recent_ratio) * 0.2
+
+        if overloaded or self.recent_ratio > self.latency_tolerance:
+            # Multiplicative decrease, at most once per observed round trip
+            now = time.monotonic()
+            if now - self._last_decrease >= self.recent_latency:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+                self._last_decrease = now
+        elif utilized:
+            # Additive increase of roughly one slot per window of requests
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "routes": len(self.baseline_latency),
+            "recent_latency_ms": round((self.recent_latency or 0.0) * 1000, 3),
+            "recent_latency_ratio": round(self.recent_ratio or 0.0, 3)
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """Keeps one adaptive limit per route class"""
+
+    def __init__(self, initial_limit: int, min_limit: int, max_limit: int,
+                 latency_tolerance: float, backoff_ratio: float,
+                 route_classes: Iterable[str] = ROUTE_CLASSES):
+        self._limits: Dict[str, RouteClassLimit] = {
+            name: RouteClassLimit(initial_limit, min_limit, max_limit, latency_tolerance, backoff_ratio)
+            for name in (*route_classes, DEFAULT_ROUTE_CLASS)
+        }
+
+    def for_path(self, path: str) -> RouteClassLimit:
+        segment = path.split("/", 2)[1]
+        return self._limits.get(segment) or self._limits[DEFAULT_ROUTE_CLASS]
+
+    def items(self):
+        return self._limits.items()
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {name: limit.snapshot() for name, limit in self._limits.items()}
+
+
+class AdaptiveConcurrencyMiddleware:
+    """ASGI middleware that sheds load with a fast 503 once a route class is over capacity"""
+
+    def __init__(self, app, limiter: AdaptiveConcurrencyLimiter,
+                 exempt_paths: Iterable[str] = (), retry_after: int = 1):
+        self.app = app
+        self.limiter = limiter
+        self.exempt_paths = frozenset(exempt_paths)
+        self._rejection_body = json.dumps({"detail": "Service overloaded, please retry later"}).encode()
+        self._rejection_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self._rejection_body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limiter.for_path(scope["path"])
+        if not limit.try_acquire():
+            await self._reject(send)
+            return
+
+        status_code = 500
+        overloaded = False
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+            overloaded = status_code in OVERLOAD_STATUS_CODES
+        except (TimeoutError, PoolTimeoutError):
+            # Timed out waiting, or no pooled connection freed up in time; other errors are bugs, not load
+            overloaded = True
+            raise
+        finally:
+            route = scope.get("route")
+            limit.release(
+                time.perf_counter() - start, overloaded=overloaded, route=route.path if route is not None else None
+            )
+
+    async def _reject(self, send):
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": self._rejection_headers,
+        })
+        await send({"type": "http.response.body", "body": self._rejection_body})
+
+
+# Shared limiter so health and metrics code can read its state
+limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=settings.CONCURRENCY_INITIAL_LIMIT,
+    min_limit=settings.CONCURRENCY_MIN_LIMIT,
+    max_limit=settings.CONCURRENCY_MAX_LIMIT,
+    latency_tolerance=settings.CONCURRENCY_LATENCY_TOLERANCE,
+    backoff_ratio=settings.CONCURRENCY_BACKOFF_RATIO
+)
\ No newline at end of file
@@ -0,0 +1,191 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from core.config import settings
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+
+class StoredResponse:
+    """A completed response, kept so retries can be answered without re-running the endpoint"""
+
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class IdempotencyEntry:
+    __slots__ = ("fingerprint", "expires_at", "done", "response")
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        # Set once the original request finishes; duplicates wait on it
+        self.done = asyncio.Event()
+        self.response: Optional[StoredResponse] = None
+
+
+class IdempotencyStore:
+    """In-process TTL store of request fingerprints and their responses, bounded in size (LRU)"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, IdempotencyEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[IdempotencyEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def begin(self, key: str, fingerprint: str) -> IdempotencyEntry:
+        entry = IdempotencyEntry(fingerprint, time.monotonic() + self.ttl_seconds)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            # Never strand duplicates that are waiting on an evicted in-flight entry
+            evicted.done.set()
+        return entry
+
+    def complete(self, key: str, entry: IdempotencyEntry, response: Optional[StoredResponse]) -> None:
+        """Record the outcome; without a response the key is released so a retry runs again"""
+        entry.response = response
+        if response is None and self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.done.set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware honouring the Idempotency-Key header on selected POST endpoints.
+
+    The first request with a key runs normally and its response is stored. A retry
+    with the same key and body gets the stored response replayed; a concurrent
+    duplicate waits for the original to finish. Reusing a key with a different body
+    is rejected with 422. 5xx responses are not stored so the client can retry.
+    """
+
+    def __init__(self, app, store: IdempotencyStore, paths: Iterable[str]):
+        self.app = app
+        self.store = store
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        raw_key = dict(scope["headers"]).get(IDEMPOTENCY_HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await self._send_json(send, 400, {"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"})
+            return
+
+        body = await self._read_body(receive)
+        fingerprint = hashlib.sha256(
+            scope["method"].encode() + b" " + scope["path"].encode() + b"\n" + body
+        ).hexdigest()
+        key = f"{scope['path']}:{raw_key.decode('latin-1')}"
+
+        while True:
+            entry = self.store.get(key)
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                await self._send_json(send, 422, {"detail": "Idempotency-Key was already used with a different request"})
+                return
+            await entry.done.wait()
+            if entry.response is not None:
+                await self._replay(send, entry.response)
+                return
+            # The original failed without a storable response; try to become the new original
+
+        entry = self.store.begin(key, fingerprint)
+        stored = None
+        try:
+            stored = await self._run_and_capture(scope, body, receive, send)
+        finally:
+            self.store.complete(key, entry, stored)
+
+    async def _run_and_capture(self, scope, body: bytes, receive, send) -> Optional[StoredResponse]:
+        status = 500
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Body already consumed; pass disconnect notifications through
+            return await receive()
+
+        async def send_wrapper(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, replay_receive, send_wrapper)
+        if status >= 500:
+            return None
+        return StoredResponse(status, headers, b"".join(chunks))
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _replay(send, response: StoredResponse):
+        await send({
+            "type": "http.response.start",
+            "status": response.status,
+            "headers": response.headers + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": response.body})
+
+    @staticmethod
+    async def _send_json(send, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+store = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES
+)
\ No newline at end of file
@@ -0,0 +1,21 @@
+from infrastructure.monitoring.loop_watchdog import LoopWatchdog
+
+
+class LoopWatchdogMiddleware:
+    """ASGI middleware naming the route of each request task for event-loop stall reports"""
+
+    def __init__(self, app, watchdog: LoopWatchdog):
+        self.app = app
+        self.watchdog = watchdog
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # The scope is read at stall time, by when routing has filled in the route template
+        task = self.watchdog.track(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.watchdog.untrack(task)
\ No newline at end of file
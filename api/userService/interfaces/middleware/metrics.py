@@ -0,0 +1,68 @@
+import time
+
+from infrastructure.monitoring.metrics import registry
+from infrastructure.monitoring.service_metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+from .concurrency_limiter import limiter
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template and status"""
+
+    def __init__(self, app):
+        self.app = app
+        # (method, route template, status) -> pre-bound histogram child
+        self._children = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            key = (scope["method"], route.path if route is not None else UNMATCHED_ROUTE, status_code)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = HTTP_REQUEST_DURATION.labels(key[0], key[1], str(status_code))
+            child.observe(time.perf_counter() - start)
+
+
+def _limiter_samples(field):
+    def samples():
+        return [((name,), limit.snapshot()[field]) for name, limit in limiter.items()]
+    return samples
+
+
+registry.callback_gauge(
+    "concurrency_limit",
+    "Current adaptive concurrency limit per route class",
+    _limiter_samples("limit"),
+    ("route_class",)
+)
+registry.callback_gauge(
+    "concurrency_in_flight",
+    "Requests admitted by the concurrency limiter per route class",
+    _limiter_samples("in_flight"),
+    ("route_class",)
+)
+registry.callback_counter(
+    "concurrency_rejected_total",
+    "Requests shed by the concurrency limiter per route class",
+    _limiter_samples("rejected"),
+    ("route_class",)
+)
@@ -0,0 +1,77 @@
+import asyncio
+import hmac
+import logging
+import random
+import re
+import time
+import uuid
+
+from infrastructure.monitoring.profiler import StackSampler, write_collapsed
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile-token"
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles individual requests on demand.
+
+    A request is profiled when it carries the admin-only X-Profile-Token
+    header matching the configured token, or when it is picked by the sample
+    rate. Only one request is profiled at a time; others pass straight
+    through, so the middleware costs a header scan when idle.
+    """
+
+    def __init__(self, app, token: str = "", sample_rate: float = 0.0,
+                 interval_ms: float = 1.0, output_dir: str = "./profiles"):
+        self.app = app
+        self.token = token.encode()
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000.0
+        self.output_dir = output_dir
+        self._busy = False
+
+    def _should_profile(self, scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._busy or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        filename = "{}_{}_{}_{}.collapsed".format(
+            time.strftime("%Y%m%dT%H%M%S"),
+            scope["method"],
+            _UNSAFE_FILENAME_CHARS.sub("_", scope["path"].strip("/")) or "root",
+            uuid.uuid4().hex[:8]
+        )
+        profile_header = (b"x-profile-file", filename.encode())
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [profile_header]
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            self._busy = False
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            try:
+                path = await asyncio.to_thread(
+                    write_collapsed, sampler.collapsed(), self.output_dir, filename
+                )
+                logger.info("Profiled %s %s in %.1f ms -> %s", scope["method"], scope["path"], elapsed_ms, path)
+            except OSError as e:
+                logger.error(f"Failed to write profile for {scope['path']}: {str(e)}")
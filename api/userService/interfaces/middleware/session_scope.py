@@ -0,0 +1,17 @@
+from core.session_context import session_scope
+
+
+class SessionScopeMiddleware:
+    """ASGI middleware giving each HTTP request its own lazily opened database sessions"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Closed once the response has been sent; nothing is opened for requests that never query
+        with session_scope():
+            await self.app(scope, receive, send)
\ No newline at end of file
@@ -0,0 +1,25 @@
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(after_id: Optional[int]) -> Optional[str]:
+    """Opaque cursor for keyset pagination; None when there is no next page"""
+    if after_id is None:
+        return None
+    payload = json.dumps({"after": after_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Id to continue after; raises ValueError for a cursor this service did not issue"""
+    if not cursor:
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after_id = json.loads(payload)["after"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(after_id, int) or isinstance(after_id, bool) or after_id < 0:
+        raise ValueError("Invalid pagination cursor")
+    return after_id
\ No newline at end of file
@@ -1,8 +1,10 @@
 from pydantic import BaseModel, field_validator, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 import phonenumbers
 
+from domain.models.webhook import EVENT_TYPES
+
 # Role and Service response schemas
 class UserRoleResponse(BaseModel):
     id: int
@@ -30,6 +32,14 @@ class UserServiceRoleResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class UserServiceRoleAssignmentResponse(UserServiceRoleResponse):
+    user_id: int
+
+class UserServiceRolePage(BaseModel):
+    items: List[UserServiceRoleAssignmentResponse]
+    limit: int
+    next_cursor: Optional[str] = None
+
 # Request schemas for admin operations
 class ServiceCreateRequest(BaseModel):
     name: str
@@ -143,7 +153,136 @@ class OTPResponse(BaseModel):
 class MessageResponse(BaseModel):
     message: str
 
+class UserSearchResult(BaseModel):
+    id: int
+    phone_number: str
+    full_name: str
+    email: Optional[str]
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class UserSearchPage(BaseModel):
+    items: List[UserSearchResult]
+    limit: int
+    offset: int
+    has_more: bool
+
+class AssignmentCountResponse(BaseModel):
+    service_id: int
+    role_id: int
+    active: int
+    inactive: int
+
+    class Config:
+        from_attributes = True
+
+class SignupCountResponse(BaseModel):
+    day: date
+    count: int
+
+    class Config:
+        from_attributes = True
+
+class StatsSummaryResponse(BaseModel):
+    total_users: int
+    active_users: int
+    deactivated_users: int
+    verified_users: int
+    mfa_enabled_users: int
+    mfa_share: float
+    assignments: List[AssignmentCountResponse]
+    signups: List[SignupCountResponse]
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class AuditEventResponse(BaseModel):
+    id: int
+    action: str
+    outcome: str
+    actor_user_id: Optional[int]
+    subject_user_id: Optional[int]
+    details: dict
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class AuditEventPage(BaseModel):
+    items: List[AuditEventResponse]
+    limit: int
+    next_cursor: Optional[str] = None
+
+def _validate_event_types(v):
+    unknown = sorted(set(v or ()) - set(EVENT_TYPES))
+    if unknown:
+        raise ValueError(f"Unknown event types: {', '.join(unknown)}")
+    return v
+
+class WebhookEndpointCreateRequest(BaseModel):
+    url: str = Field(..., pattern="^https?://")
+    event_types: List[str] = []  # empty = every event type
+    secret: Optional[str] = Field(None, min_length=16)  # generated when omitted
+    max_concurrency: int = Field(1, ge=1, le=16)
+    
+    _check_event_types = field_validator('event_types')(_validate_event_types)
+
+class WebhookEndpointUpdateRequest(BaseModel):
+    url: Optional[str] = Field(None, pattern="^https?://")
+    event_types: Optional[List[str]] = None
+    secret: Optional[str] = Field(None, min_length=16)
+    max_concurrency: Optional[int] = Field(None, ge=1, le=16)
+    is_active: Optional[bool] = None
+    
+    _check_event_types = field_validator('event_types')(_validate_event_types)
+
+class WebhookEndpointResponse(BaseModel):
+    id: int
+    url: str
+    event_types: List[str]
+    is_active: bool
+    max_concurrency: int
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    secret: Optional[str] = None  # only when created or rotated
+
+    class Config:
+        from_attributes = True
+
+class WebhookDeliveryResponse(BaseModel):
+    id: int
+    event_id: str
+    event_type: str
+    status: str
+    attempts: int
+    next_attempt_at: Optional[datetime]
+    last_error: Optional[str]
+    occurred_at: Optional[datetime]
+    delivered_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class WebhookDeliveryPage(BaseModel):
+    items: List[WebhookDeliveryResponse]
+    limit: int
+    next_cursor: Optional[str] = None
+
 class HealthResponse(BaseModel):
     status: str
     service: str
-    version: str
\ No newline at end of file
+    version: str
+
+class ReadinessResponse(BaseModel):
+    status: str
+    service: str
+    version: str
+    reasons: List[str]
+    warmed_up: bool
+    database: dict
+    pool: dict
+    queues: dict
\ No newline at end of file
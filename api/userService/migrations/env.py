@@ -32,6 +32,7 @@ from infrastructure.db.models import (
     ServiceModel,
     UserServiceRoleModel
 )
+from infrastructure.db.user_search import SQLITE_FTS_TABLE
 
 # Set the target_metadata for autogenerate support
 target_metadata = Base.metadata
@@ -40,6 +41,17 @@ target_metadata = Base.metadata
 config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep search objects created in raw SQL out of autogenerate"""
+    if type_ == "table" and (name == SQLITE_FTS_TABLE or name.startswith(f"{SQLITE_FTS_TABLE}_")):
+        # The FTS5 table and its shadow tables (users_search_data, _idx, _content, ...)
+        return False
+    if type_ == "index" and reflected and compare_to is None and name.endswith("_trgm"):
+        # pg_trgm expression indexes
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -56,6 +68,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -79,7 +92,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
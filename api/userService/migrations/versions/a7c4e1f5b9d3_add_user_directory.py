@@ -0,0 +1,47 @@
+"""Add user_directory and assignment_directory tables
+
+Revision ID: a7c4e1f5b9d3
+Revises: f6b3d0e4a8c2
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e1f5b9d3'
+down_revision: Union[str, Sequence[str], None] = 'f6b3d0e4a8c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_directory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('phone_number', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('shard', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_directory_phone_number', 'user_directory', ['phone_number'], unique=True)
+    op.create_index('ix_user_directory_email', 'user_directory', ['email'], unique=True)
+    op.create_table(
+        'assignment_directory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('shard', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_assignment_directory_user_id', 'assignment_directory', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('assignment_directory')
+    op.drop_table('user_directory')
@@ -0,0 +1,66 @@
+"""Add user search index (FTS5 trigram on SQLite, pg_trgm on PostgreSQL)
+
+Revision ID: c3e9a7f5d210
+Revises: b7d2e41c9a03
+Create Date: 2026-10-19 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e9a7f5d210'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e41c9a03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE users_search USING fts5(
+                full_name, email, phone_number, content='users', content_rowid='id', tokenize='trigram'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER users_search_ai AFTER INSERT ON users BEGIN
+                INSERT INTO users_search(rowid, full_name, email, phone_number)
+                VALUES (new.id, new.full_name, new.email, new.phone_number);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER users_search_ad AFTER DELETE ON users BEGIN
+                INSERT INTO users_search(users_search, rowid, full_name, email, phone_number)
+                VALUES ('delete', old.id, old.full_name, old.email, old.phone_number);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER users_search_au AFTER UPDATE OF full_name, email, phone_number ON users BEGIN
+                INSERT INTO users_search(users_search, rowid, full_name, email, phone_number)
+                VALUES ('delete', old.id, old.full_name, old.email, old.phone_number);
+                INSERT INTO users_search(rowid, full_name, email, phone_number)
+                VALUES (new.id, new.full_name, new.email, new.phone_number);
+            END
+        """)
+        op.execute("INSERT INTO users_search(users_search) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_users_full_name_trgm ON users USING gin (lower(full_name) gin_trgm_ops)")
+        op.execute("CREATE INDEX ix_users_email_trgm ON users USING gin (lower(email) gin_trgm_ops)")
+        op.execute("CREATE INDEX ix_users_phone_number_trgm ON users USING gin (phone_number gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('users_search_ai', 'users_search_ad', 'users_search_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS users_search")
+    elif dialect == 'postgresql':
+        for index in ('ix_users_full_name_trgm', 'ix_users_email_trgm', 'ix_users_phone_number_trgm'):
+            op.execute(f"DROP INDEX IF EXISTS {index}")
@@ -0,0 +1,54 @@
+"""Add change_seq columns, change_sequence and change_tombstones for the change feed
+
+Revision ID: c9e6a3b7d1f5
+Revises: b8d5f2a6c0e4
+Create Date: 2026-10-19 19:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e6a3b7d1f5'
+down_revision: Union[str, Sequence[str], None] = 'b8d5f2a6c0e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'user_service_roles')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are numbered and the counter seeded on the next application start
+    for table in TABLES:
+        op.add_column(table, sa.Column('change_seq', sa.BigInteger(), nullable=False, server_default='0'))
+        op.create_index(f'ix_{table}_change_seq', table, ['change_seq'], unique=False)
+    op.create_table(
+        'change_sequence',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('value', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+    op.create_table(
+        'change_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('change_seq', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('change_seq')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('change_tombstones')
+    op.drop_table('change_sequence')
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_change_seq', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('change_seq')
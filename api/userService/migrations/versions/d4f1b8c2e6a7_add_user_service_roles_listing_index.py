@@ -0,0 +1,32 @@
+"""Add user_service_roles listing index
+
+Revision ID: d4f1b8c2e6a7
+Revises: c3e9a7f5d210
+Create Date: 2026-10-19 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1b8c2e6a7'
+down_revision: Union[str, Sequence[str], None] = 'c3e9a7f5d210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_user_service_roles_service_role_active',
+        'user_service_roles',
+        ['service_id', 'role_id', 'is_active', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_service_roles_service_role_active', table_name='user_service_roles')
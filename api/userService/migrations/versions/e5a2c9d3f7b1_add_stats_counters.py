@@ -0,0 +1,35 @@
+"""Add stats_counters summary table
+
+Revision ID: e5a2c9d3f7b1
+Revises: d4f1b8c2e6a7
+Create Date: 2026-10-19 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c9d3f7b1'
+down_revision: Union[str, Sequence[str], None] = 'd4f1b8c2e6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled from users and user_service_roles on the next application start
+    op.create_table(
+        'stats_counters',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('value', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stats_counters')
@@ -0,0 +1,43 @@
+"""Add audit_events table
+
+Revision ID: f6b3d0e4a8c2
+Revises: e5a2c9d3f7b1
+Create Date: 2026-10-19 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b3d0e4a8c2'
+down_revision: Union[str, Sequence[str], None] = 'e5a2c9d3f7b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'audit_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('outcome', sa.String(), nullable=False),
+        sa.Column('actor_user_id', sa.Integer(), nullable=True),
+        sa.Column('subject_user_id', sa.Integer(), nullable=True),
+        sa.Column('details', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_events_id', 'audit_events', ['id'], unique=False)
+    op.create_index('ix_audit_events_action_id', 'audit_events', ['action', 'id'], unique=False)
+    op.create_index('ix_audit_events_actor_id', 'audit_events', ['actor_user_id', 'id'], unique=False)
+    op.create_index('ix_audit_events_subject_id', 'audit_events', ['subject_user_id', 'id'], unique=False)
+    op.create_index('ix_audit_events_created_at', 'audit_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('audit_events')
@@ -0,0 +1,124 @@
+"""
+Shared test setup: a primary database and two user shards in SQLite files.
+
+Settings, engines and the shard router are built at import, so the environment
+is configured here, before anything from the service is imported. Every test
+shares these databases; tests register their own users with fresh phone numbers
+and assert on those rather than on table totals.
+"""
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="userservice-tests-")
+SHARD_COUNT = 2
+SERVICE_KEY = "test-service-key"
+PASSWORD = "secret123"
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_DB_DIR, 'primary.db')}",
+    "SHARD_DATABASE_URLS": ",".join(
+        f"sqlite:///{os.path.join(_DB_DIR, f'shard{shard}.db')}" for shard in range(SHARD_COUNT)
+    ),
+    "INTERNAL_SERVICE_KEYS": SERVICE_KEY,
+    "MFA_BYPASS": "True",
+    "BCRYPT_ROUNDS": "4",
+    "INVALIDATION_BACKEND": "memory",
+    # Webhook tests switch the outbox on and build their own dispatcher against an in-process receiver
+    "WEBHOOKS_ENABLED": "False",
+    "CONCURRENCY_LIMIT_ENABLED": "False",
+    "LOOP_WATCHDOG_ENABLED": "False",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app  # noqa: E402
+from core.database import SessionLocal  # noqa: E402
+from core.sharding import shard_router  # noqa: E402
+from infrastructure.db.models import (  # noqa: E402
+    ServiceModel, UserRoleModel, UserDirectoryModel, UserServiceRoleModel
+)
+from infrastructure.db.sharded_repositories import sync_catalog  # noqa: E402
+
+ADMIN_ROLE_ID = 1
+USER_ROLE_ID = 2
+
+_phone_numbers = itertools.count(2000)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shard_router.dispose()
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def catalog():
+    db = SessionLocal()
+    try:
+        if db.get(ServiceModel, 1) is None:
+            db.add_all([
+                ServiceModel(id=1, name="userService"),
+                ServiceModel(id=2, name="tradeService"),
+                UserRoleModel(id=ADMIN_ROLE_ID, name="admin"),
+                UserRoleModel(id=USER_ROLE_ID, name="user"),
+            ])
+            db.commit()
+    finally:
+        db.close()
+    sync_catalog(shard_router)
+
+
+@pytest.fixture
+def new_phone():
+    """Returns a phone number no other test has used"""
+    return lambda: f"+1415555{next(_phone_numbers):04d}"
+
+
+@asynccontextmanager
+async def api_client():
+    """Client for the app with its lifespan (background workers) running"""
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+
+
+async def register(client: httpx.AsyncClient, phone_number: str, email: str = None) -> dict:
+    response = await client.post("/auth/register", json={
+        "phone_number": phone_number,
+        "full_name": f"User {phone_number[-4:]}",
+        "email": email,
+        "password": PASSWORD,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def login(client: httpx.AsyncClient, phone_number: str) -> dict:
+    response = await client.post("/auth/login", json={"phone_number": phone_number, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def shard_of(user_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(UserDirectoryModel.shard).filter(UserDirectoryModel.id == user_id).scalar()
+    finally:
+        db.close()
+
+
+def make_admin(user_id: int) -> None:
+    """Give a user the admin role in userService, on the user's shard; call before logging in"""
+    db = shard_router.session(shard_of(user_id))
+    try:
+        db.query(UserServiceRoleModel).filter(
+            UserServiceRoleModel.user_id == user_id, UserServiceRoleModel.service_id == 1
+        ).one().role_id = ADMIN_ROLE_ID
+        db.commit()
+    finally:
+        db.close()
\ No newline at end of file
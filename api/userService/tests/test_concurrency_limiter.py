@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from interfaces.middleware.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter, AdaptiveConcurrencyMiddleware, RouteClassLimit
+)
+
+
+def new_limit(initial_limit: int = 20) -> RouteClassLimit:
+    return RouteClassLimit(initial_limit, min_limit=2, max_limit=200, latency_tolerance=2.0, backoff_ratio=0.5)
+
+
+def serve(limit: RouteClassLimit, batches: int, latency: float, route: str, overloaded: bool = False) -> None:
+    """Run batches of up to a dozen concurrent requests, as a busy worker would, ignoring the decrease rate limit"""
+    for _ in range(batches):
+        admitted = sum(limit.try_acquire() for _ in range(12))
+        for _ in range(admitted):
+            limit._last_decrease = 0.0
+            limit.release(latency, overloaded=overloaded, route=route)
+
+
+def test_fast_and_slow_routes_in_one_class_keep_the_limit():
+    limit = new_limit()
+    for _ in range(200):
+        serve(limit, 1, 0.005, "/auth/request-otp")
+        serve(limit, 1, 0.25, "/auth/login")
+    assert limit.limit >= 20
+
+
+def test_latency_growth_on_a_route_shrinks_the_limit():
+    limit = new_limit()
+    serve(limit, 20, 0.25, "/auth/login")
+    before = limit.limit
+    serve(limit, 5, 1.0, "/auth/login")
+    assert limit.limit < before
+
+
+def test_over_capacity_requests_are_shed():
+    limit = new_limit(initial_limit=2)
+    assert limit.try_acquire() and limit.try_acquire()
+    assert not limit.try_acquire()
+    assert limit.rejected == 1
+
+
+def limited_app(initial_limit: int):
+    app = FastAPI()
+    gate = asyncio.Event()
+
+    @app.get("/auth/slow")
+    async def slow():
+        await gate.wait()
+        return {}
+
+    @app.get("/auth/broken")
+    async def broken():
+        raise ValueError("bug")
+
+    @app.get("/auth/pool-exhausted")
+    async def pool_exhausted():
+        raise PoolTimeoutError("QueuePool limit reached")
+
+    @app.get("/users/fast")
+    async def fast():
+        return {}
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit, min_limit=1, max_limit=200, latency_tolerance=2.0, backoff_ratio=0.5)
+    app.add_middleware(AdaptiveConcurrencyMiddleware, limiter=limiter, retry_after=3)
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://test"
+    )
+    return client, limiter, gate
+
+
+def test_full_route_class_gets_503_with_retry_after():
+    async def scenario():
+        client, limiter, gate = limited_app(initial_limit=1)
+        async with client:
+            held = asyncio.create_task(client.get("/auth/slow"))
+            while limiter.for_path("/auth/slow").in_flight == 0:
+                await asyncio.sleep(0.01)
+
+            shed = await client.get("/auth/slow")
+            assert shed.status_code == 503
+            assert shed.headers["retry-after"] == "3"
+            # Other route classes have their own limit
+            assert (await client.get("/users/fast")).status_code == 200
+
+            gate.set()
+            assert (await held).status_code == 200
+
+    asyncio.run(scenario())
+
+
+def test_only_timeouts_count_as_overload():
+    async def scenario():
+        client, limiter, _ = limited_app(initial_limit=20)
+        auth = limiter.for_path("/auth/broken")
+        async with client:
+            assert (await client.get("/auth/broken")).status_code == 500
+            assert auth.limit == 20
+
+            assert (await client.get("/auth/pool-exhausted")).status_code == 500
+            assert auth.limit == 10
+
+    asyncio.run(scenario())
\ No newline at end of file
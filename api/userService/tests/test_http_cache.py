@@ -0,0 +1,57 @@
+import asyncio
+
+from conftest import api_client, login, make_admin, register
+
+
+def test_profile_is_revalidated_with_its_etag(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            user = await register(client, new_phone())
+            headers = await login(client, user["phone_number"])
+
+            first = await client.get("/users/me", headers=headers)
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+            assert first.headers["cache-control"] == "private, no-cache"
+
+            for candidates in (etag, f'"other", {etag}', etag.removeprefix("W/"), "*"):
+                cached = await client.get("/users/me", headers={**headers, "If-None-Match": candidates})
+                assert cached.status_code == 304
+                assert cached.headers["etag"] == etag
+                assert cached.content == b""
+
+            renamed = await client.put("/users/me", json={"full_name": "Renamed"}, headers=headers)
+            assert renamed.status_code == 200
+            fresh = await client.get("/users/me", headers={**headers, "If-None-Match": etag})
+            assert fresh.status_code == 200
+            assert fresh.headers["etag"] != etag
+            assert fresh.json()["full_name"] == "Renamed"
+
+    asyncio.run(scenario())
+
+
+def test_service_roles_etag_follows_catalog_changes(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            admin = await register(client, new_phone())
+            make_admin(admin["id"])
+            headers = await login(client, admin["phone_number"])
+            params = {"user_id": admin["id"]}
+
+            first = await client.get("/admin/service-roles", params=params, headers=headers)
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+            cached = await client.get("/admin/service-roles", params=params, headers={**headers, "If-None-Match": etag})
+            assert cached.status_code == 304
+
+            description = f"Described by {admin['id']}"
+            updated = await client.put("/admin/services/1", json={"description": description}, headers=headers)
+            assert updated.status_code == 200
+
+            # Items embed the service, so its change must invalidate the page
+            fresh = await client.get("/admin/service-roles", params=params, headers={**headers, "If-None-Match": etag})
+            assert fresh.status_code == 200
+            assert fresh.headers["etag"] != etag
+            assert {item["service"]["description"] for item in fresh.json()["items"]} == {description}
+
+    asyncio.run(scenario())
\ No newline at end of file
@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import httpx
+
+from conftest import PASSWORD, api_client
+from interfaces.middleware.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+REPLAYED_HEADER = "idempotent-replayed"
+
+
+def registration(phone_number: str, full_name: str = "Idempotent") -> dict:
+    return {"phone_number": phone_number, "full_name": full_name, "password": PASSWORD}
+
+
+def test_retry_replays_the_original_registration(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            body, headers = registration(new_phone()), {"Idempotency-Key": f"register-{new_phone()}"}
+            first = await client.post("/auth/register", json=body, headers=headers)
+            assert first.status_code == 200
+            assert REPLAYED_HEADER not in first.headers
+
+            # Running the use case again would fail on the taken phone number
+            retry = await client.post("/auth/register", json=body, headers=headers)
+            assert retry.status_code == 200
+            assert retry.headers[REPLAYED_HEADER] == "true"
+            assert retry.json() == first.json()
+
+    asyncio.run(scenario())
+
+
+def test_key_reused_with_another_body_is_rejected(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            headers = {"Idempotency-Key": f"register-{new_phone()}"}
+            first = await client.post("/auth/register", json=registration(new_phone()), headers=headers)
+            assert first.status_code == 200
+
+            other = await client.post("/auth/register", json=registration(new_phone()), headers=headers)
+            assert other.status_code == 422
+
+    asyncio.run(scenario())
+
+
+class GatedApp:
+    """Endpoint stand-in that counts calls and holds each one until ``gate`` is set"""
+
+    def __init__(self, statuses=()):
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.statuses = list(statuses)
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        call = self.calls
+        body = (await receive())["body"]
+        self.started.set()
+        await self.gate.wait()
+        payload = json.dumps({"call": call, "body": body.decode()}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": self.statuses.pop(0) if self.statuses else 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+
+def middleware_client(endpoint: GatedApp, max_entries: int = 100) -> httpx.AsyncClient:
+    middleware = IdempotencyMiddleware(endpoint, IdempotencyStore(ttl_seconds=60, max_entries=max_entries), ["/orders"])
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+
+
+def test_concurrent_duplicate_gets_the_original_response():
+    async def scenario():
+        endpoint = GatedApp()
+        endpoint.gate.clear()
+        async with middleware_client(endpoint) as client:
+            original = asyncio.create_task(client.post("/orders", content=b"order", headers={"Idempotency-Key": "k"}))
+            await endpoint.started.wait()
+            duplicate = asyncio.create_task(client.post("/orders", content=b"order", headers={"Idempotency-Key": "k"}))
+            await asyncio.sleep(0.05)
+            assert not duplicate.done()
+
+            endpoint.gate.set()
+            first, second = await original, await duplicate
+        assert endpoint.calls == 1
+        assert second.json() == first.json() == {"call": 1, "body": "order"}
+        assert second.headers[REPLAYED_HEADER] == "true"
+
+    asyncio.run(scenario())
+
+
+def test_server_errors_release_the_key():
+    async def scenario():
+        endpoint = GatedApp(statuses=[503])
+        async with middleware_client(endpoint) as client:
+            failed = await client.post("/orders", content=b"order", headers={"Idempotency-Key": "k"})
+            retried = await client.post("/orders", content=b"order", headers={"Idempotency-Key": "k"})
+        assert failed.status_code == 503
+        assert retried.status_code == 200
+        assert REPLAYED_HEADER not in retried.headers
+        assert endpoint.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_evicted_entry_wakes_its_waiters():
+    async def scenario():
+        endpoint = GatedApp()
+        endpoint.gate.clear()
+        async with middleware_client(endpoint, max_entries=1) as client:
+            original = asyncio.create_task(client.post("/orders", content=b"order", headers={"Idempotency-Key": "k"}))
+            await endpoint.started.wait()
+            duplicate = asyncio.create_task(client.post("/orders", content=b"order", headers={"Idempotency-Key": "k"}))
+            await asyncio.sleep(0.05)
+
+            # A new key pushes the in-flight entry out; its waiter must run on its own instead of hanging
+            endpoint.started.clear()
+            other = asyncio.create_task(client.post("/orders", content=b"other", headers={"Idempotency-Key": "k2"}))
+            await endpoint.started.wait()
+            endpoint.gate.set()
+            responses = await asyncio.wait_for(asyncio.gather(original, duplicate, other), 5)
+        assert [response.status_code for response in responses] == [200, 200, 200]
+        assert endpoint.calls == 3
+
+    asyncio.run(scenario())
\ No newline at end of file
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from infrastructure.db.user_repository_impl import SQLUserRepository
+
+
+class PostgresError(Exception):
+    """Stands in for a psycopg error: a SQLSTATE and the violated constraint"""
+
+    def __init__(self, message: str, sqlstate: str, constraint_name: str):
+        super().__init__(message)
+        self.sqlstate = sqlstate
+        self.diag = SimpleNamespace(constraint_name=constraint_name)
+
+
+def message_for(driver_error: Exception) -> str:
+    return SQLUserRepository._integrity_error_message(IntegrityError("INSERT", {}, driver_error), 7)
+
+
+@pytest.mark.parametrize("driver_error, expected", [
+    (
+        PostgresError(
+            'insert or update on table "user_service_roles" violates foreign key constraint '
+            '"user_service_roles_service_id_fkey"', "23503", "user_service_roles_service_id_fkey"
+        ),
+        "Invalid service or role",
+    ),
+    (
+        PostgresError('duplicate key value violates unique constraint "uq_user_service"', "23505", "uq_user_service"),
+        "User already has a role assigned in service 7",
+    ),
+    (
+        PostgresError(
+            'duplicate key value violates unique constraint "ix_users_phone_number"', "23505", "ix_users_phone_number"
+        ),
+        "User with this phone number already exists",
+    ),
+    (
+        PostgresError('duplicate key value violates unique constraint "ix_users_email"', "23505", "ix_users_email"),
+        "User with this email already exists",
+    ),
+    (Exception("UNIQUE constraint failed: users.phone_number"), "User with this phone number already exists"),
+    (
+        Exception("UNIQUE constraint failed: user_service_roles.user_id, user_service_roles.service_id"),
+        "User already has a role assigned in service 7",
+    ),
+    (Exception("FOREIGN KEY constraint failed"), "Invalid service or role"),
+])
+def test_integrity_errors_are_classified_by_constraint(driver_error, expected):
+    assert message_for(driver_error) == expected
\ No newline at end of file
@@ -0,0 +1,87 @@
+import asyncio
+
+from sqlalchemy import text
+
+from conftest import SERVICE_KEY, SHARD_COUNT, api_client, login, make_admin, register, shard_of
+from core.sharding import shard_router
+from infrastructure.monitoring.query_stats import begin_request, end_request
+
+
+def test_register_login_and_lookup_across_shards(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            users = [await register(client, new_phone()) for _ in range(8)]
+            assert {shard_of(user["id"]) for user in users} == set(range(SHARD_COUNT))
+
+            for user in users:
+                headers = await login(client, user["phone_number"])
+                me = await client.get("/users/me", headers=headers)
+                assert me.status_code == 200
+                assert me.json()["id"] == user["id"]
+
+            ids = [user["id"] for user in users]
+            response = await client.post(
+                "/internal/users/lookup", json={"user_ids": ids + [10 ** 9]}, headers={"X-Service-Key": SERVICE_KEY}
+            )
+            assert response.status_code == 200
+            found = response.json()["users"]
+            assert [user["id"] for user in found[:-1]] == ids
+            assert [user["phone_number"] for user in found[:-1]] == [user["phone_number"] for user in users]
+            assert found[-1] is None
+
+    asyncio.run(scenario())
+
+
+def test_phone_and_email_stay_unique_across_shards(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            first = await register(client, new_phone(), email=f"unique-{new_phone()}@example.org")
+            # Different phone numbers land on either shard; the directory on the primary still sees the clash
+            for _ in range(4):
+                response = await client.post("/auth/register", json={
+                    "phone_number": new_phone(),
+                    "full_name": "Clash",
+                    "email": first["email"],
+                    "password": "secret123",
+                })
+                assert response.status_code == 400
+            response = await client.post("/auth/register", json={
+                "phone_number": first["phone_number"],
+                "full_name": "Clash",
+                "password": "secret123",
+            })
+            assert response.status_code == 400
+
+    asyncio.run(scenario())
+
+
+def test_admin_stats_sum_every_shard(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            admin = await register(client, new_phone())
+            make_admin(admin["id"])
+            headers = await login(client, admin["phone_number"])
+            before = (await client.get("/admin/stats", headers=headers)).json()
+
+            users = [await register(client, new_phone()) for _ in range(5)]
+            assert len({shard_of(user["id"]) for user in users}) > 1
+
+            after = (await client.get("/admin/stats", headers=headers)).json()
+            assert after["total_users"] == before["total_users"] + 5
+
+            rebuilt = await client.post("/admin/stats/rebuild", headers=headers)
+            assert rebuilt.status_code == 200
+            assert rebuilt.json()["total_users"] == after["total_users"]
+
+    asyncio.run(scenario())
+
+
+def test_shard_queries_count_towards_the_request():
+    stats, token = begin_request()
+    try:
+        for shard_engine in shard_router.engines:
+            with shard_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+    finally:
+        end_request(token)
+    assert stats.count == SHARD_COUNT
\ No newline at end of file
@@ -0,0 +1,76 @@
+import asyncio
+
+from conftest import SERVICE_KEY, SHARD_COUNT, api_client, register
+from core.session_context import session_scope
+from interfaces.container import container
+
+HEADERS = {"X-Service-Key": SERVICE_KEY}
+
+
+async def read_feed(client, since: str = "0", limit: int = 2):
+    """Follow next_since until has_more is false; returns the changes and the final cursor"""
+    changes = []
+    while True:
+        response = await client.get("/sync/changes", params={"since": since, "limit": limit}, headers=HEADERS)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["changes"]) <= limit
+        changes.extend(page["changes"])
+        since = page["next_since"]
+        if not page["has_more"]:
+            return changes, since
+
+
+def test_changes_page_through_every_shard(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            _, start = await read_feed(client, limit=500)
+            assert len(start.split(".")) == SHARD_COUNT
+
+            users = [await register(client, new_phone()) for _ in range(6)]
+            changes, cursor = await read_feed(client, start, limit=2)
+
+            upserts = {change["id"]: change for change in changes if change["kind"] == "user"}
+            assert set(upserts) == {user["id"] for user in users}
+            for user in users:
+                assert upserts[user["id"]]["op"] == "upsert"
+                assert upserts[user["id"]]["data"]["phone_number"] == user["phone_number"]
+            assert sorted(change["id"] for change in changes if change["kind"] == "assignment") == sorted(
+                role["id"] for user in users for role in user["roles"]
+            )
+            # Positions only move forward, shard by shard
+            assert all(int(new) >= int(old) for old, new in zip(start.split("."), cursor.split(".")))
+
+            # Nothing new: the cursor comes back unchanged
+            again, same = await read_feed(client, cursor)
+            assert again == [] and same == cursor
+
+    asyncio.run(scenario())
+
+
+def test_deactivated_user_comes_back_as_delete(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            user = await register(client, new_phone())
+            _, cursor = await read_feed(client, limit=500)
+
+            with session_scope():
+                stored = await container.user_repository.get_by_id(user["id"])
+                stored.is_active = False
+                await container.user_repository.update(stored)
+
+            changes, _ = await read_feed(client, cursor)
+            assert [(change["kind"], change["id"], change["op"]) for change in changes] == [("user", user["id"], "delete")]
+
+    asyncio.run(scenario())
+
+
+def test_invalid_cursor_is_rejected():
+    async def scenario():
+        async with api_client() as client:
+            for since in ("abc", "1.-2", "1.2.3"):
+                response = await client.get("/sync/changes", params={"since": since}, headers=HEADERS)
+                assert response.status_code == 400
+            assert (await client.get("/sync/changes")).status_code == 401
+
+    asyncio.run(scenario())
\ No newline at end of file
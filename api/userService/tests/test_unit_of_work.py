@@ -0,0 +1,135 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from conftest import api_client, register, shard_of
+from core.database import SessionLocal
+from core.session_context import current_scope, session_scope
+from domain.models.service import Service
+from domain.models.user_service_role import UserServiceRole
+from infrastructure.db.models import AssignmentDirectoryModel, UserDirectoryModel
+from infrastructure.db.service_repository_impl import ServiceRepositoryImpl
+from infrastructure.db.sharded_repositories import ShardedUnitOfWork, ShardedUserRepository
+from infrastructure.db.unit_of_work import SQLUnitOfWork
+
+
+def directory_entry(user_id: int):
+    db = SessionLocal()
+    try:
+        return db.query(UserDirectoryModel.phone_number, UserDirectoryModel.email).filter(
+            UserDirectoryModel.id == user_id
+        ).one()
+    finally:
+        db.close()
+
+
+def assignment_ids(user_id: int) -> set:
+    db = SessionLocal()
+    try:
+        return {row.id for row in db.query(AssignmentDirectoryModel.id).filter(AssignmentDirectoryModel.user_id == user_id)}
+    finally:
+        db.close()
+
+
+async def unit_of_work_for(user_id: int):
+    scope = current_scope()
+    return ShardedUnitOfWork(scope.db, scope.shards, shard_of(user_id)), await ShardedUserRepository().get_by_id(user_id)
+
+
+def test_rollback_undoes_directory_reservations(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            user = await register(client, new_phone(), email=f"before-{new_phone()}@example.org")
+            assignments = assignment_ids(user["id"])
+            new_phone_number, new_email = new_phone(), f"after-{new_phone()}@example.org"
+
+            with session_scope():
+                uow, stored = await unit_of_work_for(user["id"])
+                async with uow:
+                    await uow.users.update(replace(stored, phone_number=new_phone_number, email=new_email))
+                    await uow.user_service_roles.create(
+                        UserServiceRole(id=None, user_id=user["id"], service_id=2, role_id=2, is_active=True)
+                    )
+                    # Reserved on the primary while the unit of work runs
+                    assert tuple(directory_entry(user["id"])) == (new_phone_number, new_email)
+                    assert len(assignment_ids(user["id"])) == len(assignments) + 1
+                    # No commit: leaving the block rolls back
+
+            assert tuple(directory_entry(user["id"])) == (user["phone_number"], user["email"])
+            assert assignment_ids(user["id"]) == assignments
+            # The freed phone number and email can be registered again
+            await register(client, new_phone_number, email=new_email)
+
+    asyncio.run(scenario())
+
+
+def test_savepoint_rollback_keeps_the_outer_work(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            user = await register(client, new_phone())
+            assignments = assignment_ids(user["id"])
+            new_email = f"outer-{new_phone()}@example.org"
+
+            with session_scope():
+                uow, stored = await unit_of_work_for(user["id"])
+                async with uow:
+                    await uow.users.update(replace(stored, email=new_email))
+                    with pytest.raises(RuntimeError):
+                        async with uow.savepoint():
+                            await uow.user_service_roles.create(
+                                UserServiceRole(id=None, user_id=user["id"], service_id=2, role_id=2, is_active=True)
+                            )
+                            raise RuntimeError("abandon the assignment")
+                    assert assignment_ids(user["id"]) == assignments
+                    await uow.commit()
+
+            assert directory_entry(user["id"]).email == new_email
+            with session_scope():
+                assert (await ShardedUserRepository().get_by_id(user["id"])).email == new_email
+
+    asyncio.run(scenario())
+
+
+def test_deletes_release_the_directory_on_commit_only(new_phone):
+    async def scenario():
+        async with api_client() as client:
+            user = await register(client, new_phone())
+            assignments = assignment_ids(user["id"])
+            assignment_id = next(iter(assignments))
+
+            with session_scope():
+                uow, _ = await unit_of_work_for(user["id"])
+                async with uow:
+                    await uow.user_service_roles.delete(assignment_id)
+                    assert assignment_ids(user["id"]) == assignments
+                # Rolled back: the entry is still held
+                assert assignment_ids(user["id"]) == assignments
+
+                uow, _ = await unit_of_work_for(user["id"])
+                async with uow:
+                    await uow.user_service_roles.delete(assignment_id)
+                    await uow.commit()
+            assert assignment_ids(user["id"]) == assignments - {assignment_id}
+
+    asyncio.run(scenario())
+
+
+def test_catalog_reads_never_share_uncommitted_rows():
+    async def scenario():
+        db, other = SessionLocal(), SessionLocal()
+        try:
+            async with SQLUnitOfWork(db) as uow:
+                await uow.services.create(Service(id=None, name="staged-service", description=None))
+                # Reads inside the unit of work see its own flushed rows; a concurrent read elsewhere does not
+                inside, outside = await asyncio.gather(
+                    uow.services.get_all(), ServiceRepositoryImpl(other).get_all()
+                )
+                assert "staged-service" in {service.name for service in inside}
+                assert "staged-service" not in {service.name for service in outside}
+            assert "staged-service" not in {service.name for service in await ServiceRepositoryImpl(other).get_all()}
+        finally:
+            db.close()
+            other.close()
+
+    asyncio.run(scenario())
\ No newline at end of file
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from benchmarks.webhook_receiver import WebhookReceiver
+from conftest import api_client, register
+from core.config import settings
+from core.database import SessionLocal
+from domain.models.webhook import WebhookEndpoint, USER_CREATED, ROLE_ASSIGNED
+from infrastructure.db.webhook_repository_impl import SQLWebhookRepository
+from infrastructure.services.webhook_dispatcher import WebhookDispatcher
+
+SECRET = "webhook-test-secret"
+
+
+@pytest.fixture
+def outbox_enabled(monkeypatch):
+    """Record outbox events; the app's own dispatcher stays off, as it was built with webhooks disabled"""
+    monkeypatch.setattr(settings, "WEBHOOKS_ENABLED", True)
+
+
+async def wait_for(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+async def with_endpoint(receiver: WebhookReceiver, scenario, **dispatcher_options) -> None:
+    """Run ``scenario(client, dispatcher)`` with an endpoint and a dispatcher delivering to ``receiver``"""
+    repo = SQLWebhookRepository(SessionLocal())
+    endpoint = await repo.create_endpoint(WebhookEndpoint(
+        id=None, url="http://receiver/hooks", secret=SECRET, event_types=[USER_CREATED, ROLE_ASSIGNED]
+    ))
+    dispatcher = WebhookDispatcher(
+        poll_interval=0.05, retry_base=0.01, transport=httpx.ASGITransport(app=receiver), **dispatcher_options
+    )
+    try:
+        async with api_client() as client:
+            dispatcher.start()
+            try:
+                await scenario(client, dispatcher)
+            finally:
+                await dispatcher.stop()
+    finally:
+        # Endpoints are shared by every dispatcher; leave none behind for the next test
+        await repo.delete_endpoint(endpoint.id)
+        repo.db.close()
+
+
+def test_outbox_events_are_delivered_signed(new_phone, outbox_enabled):
+    receiver = WebhookReceiver(secret=SECRET)
+
+    async def scenario(client, dispatcher):
+        users = [await register(client, new_phone()) for _ in range(3)]
+        await wait_for(lambda: receiver.stats()["unique_events"] >= 6)
+
+        events = [event for batch in receiver.batches for event in batch]
+        created = {event["data"]["id"]: event for event in events if event["type"] == USER_CREATED}
+        assert set(created) == {user["id"] for user in users}
+        assert {event["data"]["user_id"] for event in events if event["type"] == ROLE_ASSIGNED} == set(created)
+        assert receiver.rejected == 0
+
+    asyncio.run(with_endpoint(receiver, scenario))
+
+
+def test_failed_batches_are_retried(new_phone, outbox_enabled):
+    receiver = WebhookReceiver(secret=SECRET, fail_rate=1.0)
+
+    async def scenario(client, dispatcher):
+        user = await register(client, new_phone())
+        await wait_for(lambda: receiver.failed >= 2)
+        assert receiver.batches == []
+
+        receiver.fail_rate = 0.0
+        await wait_for(lambda: receiver.stats()["unique_events"] >= 2)
+        events = [event for batch in receiver.batches for event in batch]
+        assert [event["data"]["id"] for event in events if event["type"] == USER_CREATED] == [user["id"]]
+        assert [event["data"]["user_id"] for event in events if event["type"] == ROLE_ASSIGNED] == [user["id"]]
+
+    asyncio.run(with_endpoint(receiver, scenario))
\ No newline at end of file